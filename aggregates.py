@@ -0,0 +1,80 @@
+"""
+Agrégats de performance par équipe et par rôle (domicile/extérieur).
+
+Structure persistée dans brain['team_stats']:
+    {team_id: {'name': str, 'home': {...}, 'away': {...}}}
+avec pour chaque rôle: bets, wins, staked, profit, ev_sum.
+Chaque pari réglé met à jour deux compteurs en O(1).
+"""
+
+from history_index import normalize_team, split_match
+
+ROLES = ('home', 'away')
+
+
+def _empty():
+    return {'bets': 0, 'wins': 0, 'staked': 0.0, 'profit': 0.0, 'ev_sum': 0.0}
+
+
+def entry_profit(entry):
+    """Gain net d'une entrée d'historique, arrondi au centime (0 sans mise)."""
+    stake = entry.get('stake', 0.0)
+    if entry.get('result') == 'win':
+        return round(stake * (entry.get('odds', 1.0) - 1), 2)
+    return -stake
+
+
+def update_team_stats(team_stats, entry):
+    """Ajoute une entrée d'historique réglée aux agrégats des deux équipes."""
+    names = split_match(entry.get('match', ''))
+    ids = (entry.get('home_id') or normalize_team(names[0]),
+           entry.get('away_id') or normalize_team(names[1]))
+    win = entry.get('result') == 'win'
+    stake, profit, ev = entry.get('stake', 0.0), entry_profit(entry), entry.get('ev', 0.0)
+    for role, team_id, name in zip(ROLES, ids, names):
+        if not team_id: continue
+        team = team_stats.setdefault(team_id, {'name': name, 'home': _empty(), 'away': _empty()})
+        team['name'] = name or team['name']
+        agg = team[role]
+        agg['bets'] += 1
+        agg['wins'] += 1 if win else 0
+        agg['staked'] += stake
+        agg['profit'] += profit
+        agg['ev_sum'] += ev
+
+
+def rebuild_team_stats(history):
+    """Recalcule entièrement les agrégats depuis l'historique (migration, réparation)."""
+    team_stats = {}
+    for entry in history:
+        update_team_stats(team_stats, entry)
+    return team_stats
+
+
+def metrics(agg):
+    """Précision, ROI (%) et EV moyen d'un agrégat."""
+    bets = agg['bets']
+    return {
+        'bets': bets,
+        'accuracy': agg['wins'] / bets if bets else 0.0,
+        'roi': agg['profit'] / agg['staked'] * 100 if agg['staked'] else 0.0,
+        'avg_ev': agg['ev_sum'] / bets if bets else 0.0,
+        'profit': agg['profit']
+    }
+
+
+def combined(team, role=None):
+    """Agrégat d'une équipe pour un rôle, ou les deux rôles réunis si role est None."""
+    if role: return team[role]
+    return {k: team['home'][k] + team['away'][k] for k in team['home']}
+
+
+def leaderboard(team_stats, sort_key='roi', role=None, min_bets=1):
+    """Classement [(team_id, nom, métriques)] trié par `sort_key` décroissant."""
+    rows = []
+    for team_id, team in team_stats.items():
+        m = metrics(combined(team, role))
+        if m['bets'] >= min_bets:
+            rows.append((team_id, team['name'], m))
+    rows.sort(key=lambda r: r[2][sort_key], reverse=True)
+    return rows
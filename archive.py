@@ -0,0 +1,170 @@
+"""
+Archives compressées de l'historique et des transactions.
+
+Seule une fenêtre récente (WINDOW entrées au moins) reste en mémoire dans
+brain['history'] / bankroll['transactions']; les entrées plus anciennes sont
+déplacées par blocs de SEGMENT_SIZE dans des segments immuables:
+    <dossier>/<kind>-<première ligne>.json.gz
+    <dossier>/<kind>.index.json    résumé par segment
+Le résumé (lignes, bornes de dates, sommes, équipes) permet d'écarter un
+segment sans le décompresser. Le store garde le nombre de lignes archivées
+(`<kind>_offset`): les numéros de ligne restent globaux et stables.
+
+Un segment est identifié par sa première ligne: le réécrire (rejeu du
+journal depuis un snapshot plus ancien) produit le même contenu.
+"""
+
+import bisect
+import gzip
+import itertools
+import json
+import os
+from collections import OrderedDict
+
+from history_index import normalize_team, period_range, team_ids
+
+WINDOW = 1000
+SEGMENT_SIZE = 1000
+_CACHE_SEGMENTS = 4
+
+
+def summarize(kind, entries):
+    """Résumé d'un bloc d'entrées (bornes de dates et sommes)."""
+    stamps = [e.get('timestamp', '') for e in entries]
+    meta = {'count': len(entries), 'ts_min': min(stamps), 'ts_max': max(stamps)}
+    if kind == 'history':
+        from aggregates import entry_profit
+        meta['wins'] = sum(1 for e in entries if e.get('result') == 'win')
+        meta['stake'] = round(sum(max(e.get('stake', 0.0), 0.0) for e in entries), 2)
+        meta['profit'] = round(sum(entry_profit(e) for e in entries), 2)
+        meta['teams'] = sorted({t for e in entries for t in team_ids(e) if t})
+    else:
+        types = {}
+        for e in entries: types[e.get('type')] = types.get(e.get('type'), 0) + 1
+        meta['types'] = types
+        meta['amount'] = round(sum(e.get('amount', 0.0) for e in entries), 2)
+    return meta
+
+
+class Archive:
+    """Segments compressés d'une liste append-only (`kind`: 'history' ou 'transactions')."""
+
+    def __init__(self, directory, kind):
+        self.dir, self.kind = directory, kind
+        self.index_file = os.path.join(directory, f'{kind}.index.json')
+        os.makedirs(directory, exist_ok=True)
+        self.index, self._stamp = [], None
+        self._cache = OrderedDict()
+
+    def _sync_index(self):
+        """Relit l'index s'il a changé sur disque (segments écrits par un autre processus)."""
+        from persistence import file_stamp
+        stamp = file_stamp(self.index_file)
+        if stamp == self._stamp: return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = []
+        self._stamp = stamp
+
+    def write(self, first, entries):
+        """Écrit le segment commençant à la ligne globale `first` (remplace l'existant)."""
+        from persistence import atomic_write, file_stamp
+        self._sync_index()
+        name = f'{self.kind}-{first:010d}.json.gz'
+        data = json.dumps(entries, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        atomic_write(os.path.join(self.dir, name), gzip.compress(data, compresslevel=6))
+        meta = dict(summarize(self.kind, entries), first=first, file=name)
+        self.index = [m for m in self.index if m['first'] != first] + [meta]
+        self.index.sort(key=lambda m: m['first'])
+        atomic_write(self.index_file, json.dumps(self.index, ensure_ascii=False))
+        self._stamp = file_stamp(self.index_file)
+        self._cache.pop(first, None)
+        return meta
+
+    def segments(self, limit):
+        """Segments entièrement sous la ligne `limit` (nombre de lignes archivées du store)."""
+        self._sync_index()
+        return [m for m in self.index if m['first'] + m['count'] <= limit]
+
+    def read(self, meta):
+        """Entrées d'un segment (petit cache LRU de segments décompressés)."""
+        first = meta['first']
+        entries = self._cache.get(first)
+        if entries is not None:
+            try: self._cache.move_to_end(first)
+            except KeyError: pass  # évincé entre-temps par un autre thread (export)
+            return entries
+        with open(os.path.join(self.dir, meta['file']), 'rb') as f:
+            entries = json.loads(gzip.decompress(f.read()).decode('utf-8'))
+        self._cache[first] = entries
+        if len(self._cache) > _CACHE_SEGMENTS:
+            self._cache.popitem(last=False)
+        return entries
+
+    def teams(self, limit):
+        """Identifiants d'équipe présents dans les segments sous `limit`."""
+        return {t for meta in self.segments(limit) for t in meta['teams']}
+
+    def search(self, limit, team=None, period=None, result=None, exact=False):
+        """Lignes archivées filtrées (même sémantique que HistoryIndex.search), récentes d'abord.
+
+        Les segments hors période ou sans l'équipe sont écartés sur leur résumé.
+        """
+        lo, hi = period_range(period) if period else ('', '\uffff')
+        key = normalize_team(team) if team else None
+        wanted = (lambda t: t == key) if exact else (lambda t: t.startswith(key))
+        rows = []
+        for meta in reversed(self.segments(limit)):
+            if meta['ts_max'] < lo or meta['ts_min'] >= hi: continue
+            if key and not any(map(wanted, meta['teams'])): continue
+            found = []
+            for row, entry in enumerate(self.read(meta), meta['first']):
+                ts = entry.get('timestamp', '')
+                if not lo <= ts < hi: continue
+                if result and entry.get('result') != result: continue
+                if key and not any(map(wanted, team_ids(entry))): continue
+                found.append((ts, row))
+            rows += [row for _, row in sorted(found, reverse=True)]
+        return rows
+
+
+class LogView:
+    """Liste complète (archives + fenêtre résidente) indexée par ligne globale.
+
+    La fenêtre est copiée à la construction: la vue reste cohérente si le
+    store est archivé ensuite (export depuis un thread de fond). Une tranche
+    renvoie un itérateur paresseux: un seul segment est décompressé à la fois.
+    """
+
+    def __init__(self, archive, resident, offset):
+        self.archive, self.offset, self.resident = archive, offset, list(resident)
+        self.metas = archive.segments(offset) if archive is not None else []
+        self._firsts = [m['first'] for m in self.metas]
+
+    def __len__(self):
+        return self.offset + len(self.resident)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            return itertools.islice(self.iter(start, stop), 0, None, step)
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError(i)
+        if i >= self.offset: return self.resident[i - self.offset]
+        meta = self.metas[bisect.bisect_right(self._firsts, i) - 1]
+        return self.archive.read(meta)[i - meta['first']]
+
+    def __iter__(self):
+        return self.iter()
+
+    def iter(self, start=0, stop=None):
+        """Entrées [start, stop) en flux, segment par segment."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for meta in self.metas:
+            lo, hi = meta['first'], meta['first'] + meta['count']
+            if hi <= start: continue
+            if lo >= stop: return
+            yield from self.archive.read(meta)[max(start, lo) - lo:min(stop, hi) - lo]
+        yield from self.resident[max(start - self.offset, 0):max(stop - self.offset, 0)]
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmarks des moteurs de données (sans Kivy).
+
+Usage: python bench.py [nom ...]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+TEAMS = ['Marseille', 'Lyon', 'Paris Saint-Germain', 'Lens', 'Monaco', 'Lille', 'Nice', 'Rennes',
+         'Nantes', 'Brest', 'Reims', 'Toulouse', 'Montpellier', 'Strasbourg', 'Le Havre', 'Metz',
+         'Lorient', 'Clermont', 'Saint-Étienne', 'Auxerre']
+
+
+def fake_history(n, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    history = []
+    for i in range(n):
+        home, away = rng.sample(TEAMS, 2)
+        ts = start + timedelta(minutes=30 * i)
+        history.append({'match': f'{home} vs {away}', 'result': rng.choice(['win', 'loss']),
+                        'timestamp': ts.isoformat(), 'stake': round(rng.uniform(1, 50), 2),
+                        'odds': round(rng.uniform(1.3, 4.0), 2)})
+    return history
+
+
+def timed(label, func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f'  {label:<42} {best * 1000:9.2f} ms')
+    return result
+
+
+def bench_history_search(n=100_000):
+    from history_index import HistoryIndex
+    print(f'history_search ({n} entrées)')
+    history = fake_history(n)
+    index = HistoryIndex()
+    timed('construction index', lambda: (index.__init__(), index.sync(history)), repeat=1)
+    rows = timed('équipe + mois (Marseille, 2022-03)', lambda: index.search('Marseille', '2022-03'))
+    timed('équipe seule (Lyon)', lambda: index.search('Lyon'))
+    timed('mois seul (2021-07)', lambda: index.search(None, '2021-07'))
+    timed('scan linéaire équivalent', lambda: [
+        i for i, h in enumerate(history)
+        if 'Marseille' in h['match'].split(' vs ') and h['timestamp'].startswith('2022-03')], repeat=1)
+    print(f'  -> {len(rows)} lignes')
+
+
+def bench_ledger(n=200_000):
+    from ledger import Ledger
+    print(f'ledger ({n} paris)')
+    rng = random.Random(7)
+    ledger, t0 = Ledger(), 1_600_000_000
+    bankroll = {'current_balance': 0.0, 'total_won': 0.0, 'total_lost': 0.0, 'total_wagered': 0.0}
+    ledger.deposit(1000, ts=t0)
+    bankroll['current_balance'] = 1000.0
+    for i in range(n):
+        stake = round(rng.uniform(1, 20), 2)
+        win = rng.random() < 0.5
+        gain = round(stake * (rng.uniform(1.3, 4.0) - 1), 2)
+        ledger.wager(stake, ts=t0 + i * 60)
+        ledger.settle(stake, gain, win, ts=t0 + i * 60)
+        bankroll['total_wagered'] += stake
+        if win:
+            bankroll['current_balance'] += gain
+            bankroll['total_won'] += gain
+        else:
+            bankroll['current_balance'] -= stake
+            bankroll['total_lost'] += stake
+    issues = timed('réconciliation', lambda: ledger.reconcile(bankroll))
+    timed('solde à une date (1000 requêtes)',
+          lambda: [ledger.balance_at(t0 + rng.randrange(n) * 60) for _ in range(1000)])
+    data = timed('sérialisation', ledger.to_bytes)
+    timed('désérialisation', lambda: Ledger.from_bytes(data))
+    print(f'  -> {len(ledger)} écritures, {len(data) // 1024} Kio, écarts: {issues or "aucun"}')
+
+
+def bench_bulk_import(n=50_000):
+    import bulk_import
+    print(f'bulk_import ({n} lignes)')
+    rng = random.Random(3)
+    rows = []
+    for i, entry in enumerate(fake_history(n)):
+        day = datetime.fromisoformat(entry['timestamp'])
+        rows.append({'date': day.strftime('%d/%m/%Y %H:%M') if i % 2 else entry['timestamp'],
+                     'match': entry['match'], 'odds': str(entry['odds']).replace('.', ','),
+                     'stake': str(entry['stake']), 'result': rng.choice(['W', 'L', 'gagné', 'perdu'])})
+    for i in range(0, n, 1000):
+        rows[i]['odds'] = 'n/a'
+    bets, rejected = timed('validation + tri chronologique', lambda: (
+        bulk_import._iso_date.cache_clear(), bulk_import.validate(rows))[1], repeat=3)
+    print(f'  -> {len(bets)} valides, {len(rejected)} rejetées')
+
+
+def bench_store(n=2000):
+    from persistence import CODECS, encode_store, decode_store
+    print(f'store ({n} entrées résidentes)')
+    rng = random.Random(5)
+    factors = ['Forme', 'H2H', 'Attaque', 'Défense', 'Domicile', 'xG']
+    history = fake_history(n)
+    for entry in history:
+        home, away = entry['match'].split(' vs ')
+        entry.update({'home_id': home.lower(), 'away_id': away.lower(), 'settled_at': entry['timestamp'],
+                      'ev': round(rng.uniform(-0.1, 0.3), 4),
+                      'factors': {f: rng.uniform(0, 0.3) for f in factors},
+                      'weights': {f: round(rng.uniform(0.05, 0.3), 4) for f in factors}})
+    brain = {'weights': history[-1]['weights'], 'history': history, 'total_cycles': n, 'accuracy': 0.5}
+    baseline = None
+    for codec in CODECS:
+        data = timed(f'encodage {codec}', lambda: (lambda p: p() if callable(p) else p.encode('utf-8'))(
+            encode_store(brain, codec)), repeat=3)
+        timed(f'décodage {codec}', lambda: decode_store(data), repeat=3)
+        baseline = baseline or len(data)
+        print(f'  -> {len(data) // 1024} Kio par sauvegarde ({baseline / len(data):.1f}x)')
+
+
+BENCHMARKS = {
+    'history_search': bench_history_search,
+    'ledger': bench_ledger,
+    'bulk_import': bench_bulk_import,
+    'store': bench_store,
+}
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -0,0 +1,86 @@
+"""
+Carnet des paris ouverts.
+
+Les paris en attente sont persistés dans bankroll['open_bets']; la mise est
+débitée de la bankroll dès le placement. Le règlement se fait par lot: les
+résultats connus sont appariés aux paris ouverts et retirés du carnet en une
+seule passe; l'appelant applique ensuite les mises à jour et sauvegarde une
+fois pour tout le lot.
+"""
+
+from datetime import datetime
+
+from history_index import normalize_team
+
+# Champs d'un pronostic conservés dans le carnet (match_data est recalculable)
+_KEEP = ('home', 'away', 'odds', 'probability', 'ev', 'kelly', 'stake', 'factors', 'timestamp')
+
+
+def match_key(home, away):
+    """Clé d'appariement (domicile, extérieur) en identifiants normalisés."""
+    return normalize_team(home), normalize_team(away)
+
+
+class BetBook:
+    """Vue sur bankroll['open_bets'] (liste de paris, chacun avec un 'id' unique)."""
+
+    def __init__(self, bankroll):
+        self.bankroll = bankroll
+        self.bets = bankroll.setdefault('open_bets', [])
+        bankroll.setdefault('next_bet_id', 1)
+
+    def __len__(self):
+        return len(self.bets)
+
+    def __iter__(self):
+        return iter(self.bets)
+
+    def add(self, pred, placed_at=None):
+        """Ajoute un pronostic au carnet et renvoie le pari créé."""
+        bet = {k: pred[k] for k in _KEEP if k in pred}
+        bet['stake'] = round(max(bet.get('stake', 0.0), 0.0), 2)
+        bet['id'] = self.bankroll['next_bet_id']
+        bet['placed_at'] = placed_at or datetime.now().isoformat()
+        self.bankroll['next_bet_id'] += 1
+        self.bets.append(bet)
+        return bet
+
+    def exposure(self):
+        """Total des mises engagées non réglées."""
+        return sum(bet['stake'] for bet in self.bets)
+
+    def by_match(self):
+        """{(home_id, away_id): [paris]} pour apparier des résultats."""
+        index = {}
+        for bet in self.bets:
+            index.setdefault(match_key(bet['home'], bet['away']), []).append(bet)
+        return index
+
+    def match(self, results):
+        """Apparie des résultats [(domicile, extérieur, domicile_gagne)] aux paris ouverts.
+
+        Renvoie ({bet_id: succès}, [résultats sans pari correspondant]).
+        """
+        index, outcomes, unmatched = self.by_match(), {}, []
+        for home, away, home_won in results:
+            bets = index.get(match_key(home, away))
+            if not bets:
+                unmatched.append((home, away, home_won))
+                continue
+            for bet in bets:
+                outcomes[bet['id']] = bool(home_won)
+        return outcomes, unmatched
+
+    def take(self, outcomes):
+        """Retire du carnet les paris de `outcomes` ({bet_id: succès}).
+
+        Renvoie [(pari, succès)] dans l'ordre de placement.
+        """
+        taken, remaining = [], []
+        for bet in self.bets:
+            if bet['id'] in outcomes:
+                taken.append((bet, outcomes[bet['id']]))
+            else:
+                remaining.append(bet)
+        self.bets[:] = remaining
+        return taken
@@ -24,9 +24,21 @@ requirements = python3,kivy,numpy
 # Icône
 icon.filename = assets/icon.png
 
+# Icône adaptative (Android 8+), calques générés par create_assets.py
+icon.adaptive_foreground.filename = assets/res/mipmap-xxxhdpi/ic_launcher_foreground.png
+icon.adaptive_background.filename = assets/res/mipmap-xxxhdpi/ic_launcher_background.png
+
 # Splash screen
 presplash.filename = assets/splash.png
 
+# Ressources Android par densité (mipmap-*/drawable-*), générées par create_assets.py:
+# fusionnées dans res/ de l'APK (ic_launcher, ic_stat_notify)
+android.add_resources = assets/res
+
+# Les images sont reprises par les clés ci-dessus et add_resources: assets/ n'est
+# pas copié avec le code source (ni les tests)
+source.exclude_dirs = assets, bin, tests
+
 # Orientation
 orientation = portrait
 
@@ -0,0 +1,150 @@
+"""
+Import en masse de paris historiques (tableur CSV ou JSON).
+
+Les colonnes sont extraites puis validées par lots vectorisés (numpy):
+cotes et mises (virgule décimale acceptée), résultat, date. Les lignes
+valides sont renvoyées triées chronologiquement, prêtes à être réglées; les
+lignes rejetées sont renvoyées avec leur motif.
+
+Colonnes reconnues: date, home/away (ou match "A vs B"), odds/cote,
+stake/mise, result (win/loss, W/L, 1/0, gagné/perdu), ev et factor_<nom>
+(format de l'export « features »).
+"""
+
+import csv
+import functools
+import io
+import json
+import os
+from datetime import datetime
+
+from history_index import split_match
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_DATE = ('date', 'timestamp', 'datetime', 'settled_at')
+_HOME = ('home', 'home_team', 'domicile')
+_AWAY = ('away', 'away_team', 'exterieur', 'extérieur')
+_ODDS = ('odds', 'cote')
+_STAKE = ('stake', 'mise')
+_RESULT = ('result', 'resultat', 'résultat', 'outcome')
+_RESULTS = {'win': 1, 'w': 1, 'won': 1, 'gagné': 1, 'gagne': 1, '1': 1, 'true': 1,
+            'loss': 0, 'l': 0, 'lost': 0, 'perdu': 0, '0': 0, 'false': 0}
+_DATE_FORMATS = ('%d/%m/%Y %H:%M', '%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d')
+
+
+def load_rows(path):
+    """Lignes brutes (dicts, clés en minuscules) d'un fichier CSV ou JSON."""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        text = f.read()
+    if os.path.splitext(path)[1].lower() == '.json' or text.lstrip()[:1] in '[{':
+        data = json.loads(text)
+        raw = data.get('bets', data.get('history', [])) if isinstance(data, dict) else data
+    else:
+        try: dialect = csv.Sniffer().sniff(text[:2048], delimiters=',;\t')
+        except csv.Error: dialect = csv.excel
+        raw = csv.DictReader(io.StringIO(text), dialect=dialect)
+    return [{str(k).strip().lower(): v for k, v in row.items() if k is not None}
+            for row in raw if isinstance(row, dict)]
+
+
+def _column(rows, names):
+    name = next((n for n in names if any(n in row for row in rows[:50])), None)
+    return ['' if name is None or row.get(name) is None else str(row[name]).strip() for row in rows]
+
+
+@functools.lru_cache(maxsize=8192)
+def _iso_date(text):
+    """Date ISO 8601 (secondes) ou 'NaT' si illisible; les dates se répètent, d'où le cache."""
+    if not text: return 'NaT'
+    try:
+        return datetime.fromisoformat(text.replace('Z', '')).replace(tzinfo=None).isoformat(timespec='seconds')
+    except ValueError: pass
+    for fmt in _DATE_FORMATS:
+        try: return datetime.strptime(text, fmt).isoformat(timespec='seconds')
+        except ValueError: pass
+    return 'NaT'
+
+
+def _float(text):
+    try: return float(text.replace(',', '.')) if text else float('nan')
+    except ValueError: return float('nan')
+
+
+def _floats(values):
+    """Conversion vectorisée en float; une cellule illisible donne NaN (ligne rejetée par masque)."""
+    if np is None:
+        return [_float(v) for v in values]
+    arr = np.char.strip(np.char.replace(np.array(values, dtype=str), ',', '.'))
+    # Cellules décimales simples (un signe, des chiffres, un point): converties en bloc
+    body = np.char.lstrip(arr, '+-')
+    simple = ((np.char.str_len(arr) - np.char.str_len(body) <= 1)
+              & np.char.isdecimal(np.char.replace(body, '.', '', count=1)))
+    out = np.full(len(arr), np.nan)
+    out[simple] = arr[simple].astype(float)
+    # Reste (exposants, 'n/a'...): uniquement les cellules concernées, élément par élément
+    for i in np.flatnonzero(~simple & (arr != '')).tolist():
+        out[i] = _float(arr[i])
+    return out
+
+
+def validate(rows, existing=()):
+    """Valide et normalise `rows`; renvoie (paris triés par date, [(ligne, motif)]).
+
+    `existing` est un ensemble de clés (timestamp, match) déjà présentes dans
+    l'historique: ces lignes sont ignorées (import rejouable sans doublons).
+    """
+    if not rows: return [], []
+    n = len(rows)
+    homes, aways = _column(rows, _HOME), _column(rows, _AWAY)
+    for i, match in enumerate(_column(rows, ('match',))):
+        if match and not (homes[i] and aways[i]):
+            homes[i], aways[i] = split_match(match)
+    dates = [_iso_date(d) for d in _column(rows, _DATE)]
+    results = [_RESULTS.get(r.lower(), -1) for r in _column(rows, _RESULT)]
+    odds, stakes, evs = _floats(_column(rows, _ODDS)), _floats(_column(rows, _STAKE)), _floats(_column(rows, ('ev',)))
+    factor_names = sorted({k[7:] for k in rows[0] if k.startswith('factor_')})
+    factors = {f: _floats(_column(rows, (f'factor_{f}',))) for f in factor_names}
+
+    checks = [
+        ('équipes manquantes', [not (h and a) for h, a in zip(homes, aways)]),
+        ('date invalide', [d == 'NaT' for d in dates]),
+        ('résultat invalide', [r < 0 for r in results]),
+    ]
+    if np is not None:
+        checks += [('cote invalide', ~(odds > 1.0)), ('mise invalide', ~(stakes >= 0.0))]
+        bad = np.zeros(n, dtype=bool)
+        reasons = np.full(n, '', dtype=object)
+        for reason, mask in checks:
+            mask = np.asarray(mask, dtype=bool)
+            reasons[mask & ~bad] = reason
+            bad |= mask
+        stamps = np.array(dates, dtype='datetime64[s]')
+        valid = np.flatnonzero(~bad)
+        order = valid[np.argsort(stamps[valid], kind='stable')].tolist()
+        rejected = [(i, reasons[i]) for i in np.flatnonzero(bad).tolist()]
+    else:
+        checks += [('cote invalide', [not o > 1.0 for o in odds]), ('mise invalide', [not s >= 0.0 for s in stakes])]
+        rejected, valid = [], []
+        for i in range(n):
+            reason = next((r for r, mask in checks if mask[i]), None)
+            if reason: rejected.append((i, reason))
+            else: valid.append(i)
+        order = sorted(valid, key=lambda i: dates[i])
+
+    bets = []
+    for i in order:
+        match = f'{homes[i]} vs {aways[i]}'
+        if (dates[i], match) in existing:
+            rejected.append((i, 'doublon'))
+            continue
+        ev = float(evs[i])
+        bets.append({
+            'home': homes[i], 'away': aways[i], 'odds': float(odds[i]), 'stake': float(stakes[i]),
+            'timestamp': dates[i], 'success': results[i] == 1, 'ev': 0.0 if ev != ev else ev,
+            'factors': {f: float(v[i]) for f, v in factors.items() if v[i] == v[i]},
+        })
+    return bets, sorted(rejected)
@@ -0,0 +1,123 @@
+"""
+Sous-échantillonnage des séries pour les graphiques.
+
+Une série de N points est réduite à la largeur en pixels par bucketing
+min/max: chaque bucket garde son minimum et son maximum (dans l'ordre
+chronologique), ce qui préserve les pics et les drawdowns. La taille des
+buckets est une puissance de 2: quand la série grandit, les buckets
+existants sont fusionnés deux à deux au lieu d'être recalculés, et seuls les
+nouveaux points sont traités.
+"""
+
+
+class DownsampledSeries:
+    """Série append-only avec cache min/max invalidé incrémentalement."""
+
+    def __init__(self, width=300):
+        self.width = max(int(width), 2)
+        self.count = 0
+        self.bucket_size = 1
+        self.buckets = []   # [i_min, v_min, i_max, v_max] par bucket complet
+        self.partial = None  # bucket en cours de remplissage
+
+    def clear(self):
+        self.count, self.bucket_size, self.buckets, self.partial = 0, 1, [], None
+
+    def set_width(self, width):
+        """Change la résolution cible; refusionne les buckets si nécessaire."""
+        self.width = max(int(width), 2)
+        self._fit()
+
+    def extend(self, values):
+        size = self.bucket_size
+        bucket = self.partial
+        for v in values:
+            i = self.count
+            if bucket is None:
+                bucket = [i, v, i, v]
+            else:
+                if v < bucket[1]: bucket[0], bucket[1] = i, v
+                if v > bucket[3]: bucket[2], bucket[3] = i, v
+            self.count += 1
+            if self.count % size == 0:
+                self.buckets.append(bucket)
+                bucket = None
+                if len(self.buckets) > self.width:
+                    self.partial = None
+                    self._merge()
+                    size, bucket = self.bucket_size, self.partial
+        self.partial = bucket
+        self._fit()
+
+    def append(self, value):
+        self.extend((value,))
+
+    def _fit(self):
+        while len(self.buckets) > self.width:
+            self._merge()
+
+    def _merge(self):
+        """Double la taille des buckets en fusionnant les paires adjacentes."""
+        old, merged = self.buckets, []
+        for k in range(0, len(old) - 1, 2):
+            a, b = old[k], old[k + 1]
+            lo = a if a[1] <= b[1] else b
+            hi = a if a[3] >= b[3] else b
+            merged.append([lo[0], lo[1], hi[2], hi[3]])
+        if len(old) % 2:
+            # Bucket orphelin: redevient le bucket partiel
+            tail = old[-1]
+            if self.partial is not None:
+                p = self.partial
+                lo = tail if tail[1] <= p[1] else p
+                hi = tail if tail[3] >= p[3] else p
+                tail = [lo[0], lo[1], hi[2], hi[3]]
+            self.partial = tail
+        self.buckets = merged
+        self.bucket_size *= 2
+
+    def points(self):
+        """Points (index, valeur) sous-échantillonnés, dans l'ordre chronologique."""
+        out = []
+        buckets = self.buckets + ([self.partial] if self.partial else [])
+        for i_min, v_min, i_max, v_max in buckets:
+            if i_min == i_max:
+                out.append((i_min, v_min))
+            elif i_min < i_max:
+                out += [(i_min, v_min), (i_max, v_max)]
+            else:
+                out += [(i_max, v_max), (i_min, v_min)]
+        return out
+
+    def bounds(self):
+        buckets = self.buckets + ([self.partial] if self.partial else [])
+        if not buckets: return 0.0, 1.0
+        return min(b[1] for b in buckets), max(b[3] for b in buckets)
+
+
+def equity_values(transactions, start=0, won=None):
+    """Solde après chaque transaction à partir de la ligne `start`.
+
+    Les lignes récentes portent leur solde ('balance'). Les anciennes n'ont
+    que leur montant: dépôt, retrait et perte (-mise) sont exacts, mais un
+    gain porte le retour brut (mise + gain net), sa mise n'ayant pas de ligne.
+    Comme les écritures d'ouverture du grand livre, on repart des totaux:
+    `won` (gains nets de ces lignes, soit l'ouverture 'winnings' du livre)
+    donne la somme des mises gagnantes, répartie entre les gains. Sans `won`,
+    le retour brut est compté.
+    """
+    if start > 0 and 'balance' in transactions[start - 1]:
+        # Chemin incrémental: les lignes sans solde ne précèdent jamais une ligne avec solde
+        balance, rows, skip, share = transactions[start - 1]['balance'], transactions[start:], 0, 0.0
+    else:
+        balance, rows, skip, share = 0.0, transactions, start, 0.0
+        gross = [tx.get('amount', 0) for tx in transactions if 'balance' not in tx and tx.get('type') == 'win']
+        if gross and won is not None:
+            share = (sum(gross) - won) / len(gross)
+    for i, tx in enumerate(rows):
+        if 'balance' in tx:
+            balance = tx['balance']
+        else:
+            balance += tx.get('amount', 0) - (share if tx.get('type') == 'win' else 0)
+        if i >= skip:
+            yield balance
@@ -1,115 +1,323 @@
 #!/usr/bin/env python3
 """
 Script pour générer les assets de l'application.
-Crée l'icône et le splash screen si PIL est installé.
+
+Chaque visuel est décrit une seule fois en coordonnées relatives (0..1),
+puis rendu pour toutes les densités Android et calques d'icône adaptative:
+    assets/icon.png, assets/splash.png, assets/notification.png
+    assets/res/mipmap-<densité>/ic_launcher.png                 48 dp
+    assets/res/mipmap-<densité>/ic_launcher_foreground.png      108 dp
+    assets/res/mipmap-<densité>/ic_launcher_background.png      108 dp
+    assets/res/drawable-<densité>/ic_stat_notify.png            24 dp
+
+- rendu en parallèle (un processus par image)
+- incrémental: assets/.manifest.json garde l'empreinte (paramètres, code du
+  script, polices) de chaque sortie; une sortie inchangée n'est pas refaite
+- PNG quantifiés (palette 256 couleurs) et optimisés: l'APK est plus léger
+  et le splash se décode plus vite
+- sans Pillow, un rendu de secours en bibliothèque standard produit de vrais
+  PNG (formes pleines, police bitmap) au lieu de fichiers vides
+
+Usage: python create_assets.py [--force] [--jobs N]
 """
 
+import hashlib
+import io
+import json
+import math
 import os
+import struct
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+OUT_DIR = 'assets'
+MANIFEST = os.path.join(OUT_DIR, '.manifest.json')
+DENSITIES = {'mdpi': 1.0, 'hdpi': 1.5, 'xhdpi': 2.0, 'xxhdpi': 3.0, 'xxxhdpi': 4.0}
+FONTS = {True: '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+         False: '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'}
+
+PRIMARY = (26, 95, 122, 255)
+GREEN = (45, 106, 79, 255)
+DARK = (14, 17, 23, 255)
+WHITE = (255, 255, 255, 255)
+AMBER = (255, 193, 7, 255)
+CLEAR = (0, 0, 0, 0)
+
+# =============================================================================
+# VISUELS (primitives en coordonnées relatives)
+# =============================================================================
+def _mark(scale=1.0):
+    """Logo (cercle, bouclier, « EN ») dessiné sur la maquette 512 px, réduit autour du centre."""
+    def p(x, y):
+        return (0.5 + (x / 512 - 0.5) * scale, 0.5 + (y / 512 - 0.5) * scale)
+    shield = [(256, 136), (176, 196), (176, 296), (256, 356), (336, 296), (336, 196)]
+    return [
+        ('ellipse', p(20, 20) + p(492, 492), GREEN),
+        ('polygon', [p(x, y) for x, y in shield], PRIMARY),
+        ('text', p(211, 206), 'EN', 120 / 512 * scale, WHITE, True),
+    ]
+
+
+def icon_scene():
+    return [('rect', (0, 0, 1, 1), PRIMARY)] + _mark()
+
+
+def foreground_scene():
+    # Calque avant: le logo tient dans la zone sûre de 66 dp sur 108 dp
+    return _mark(66 / 108)
+
+
+def background_scene():
+    return [('rect', (0, 0, 1, 1), PRIMARY)]
 
-def create_assets():
-    """Crée les assets de l'application."""
+
+def notification_scene():
+    # Android ne lit que le canal alpha des icônes de barre d'état: silhouette
+    # blanche (anneau + « EN ») sur fond transparent
+    return [('ellipse', (10 / 96, 10 / 96, 86 / 96, 86 / 96), WHITE),
+            ('ellipse', (17 / 96, 17 / 96, 79 / 96, 79 / 96), CLEAR),
+            ('text', (22 / 96, 28 / 96), 'EN', 36 / 96, WHITE, True)]
+
+
+def splash_scene():
+    w, h = 1080, 1920
+    return [
+        ('rect', (0, 0, 1, 1), DARK),
+        ('rrect', (340 / w, 700 / h, 740 / w, 1100 / h), 20 / w, PRIMARY),
+        ('text', (380 / w, 800 / h), 'ELITE', 72 / h, WHITE, True),
+        ('text', (350 / w, 900 / h), 'NEURAL', 72 / h, AMBER, True),
+        ('text', (340 / w, 1000 / h), 'EVOLVE v8.0', 36 / h, (200, 200, 200, 255), False),
+        ('text', (350 / w, 1700 / h), 'Chargement...', 36 / h, (150, 150, 150, 255), False),
+    ]
+
+
+SCENES = {'icon': icon_scene, 'foreground': foreground_scene, 'background': background_scene,
+          'notification': notification_scene, 'splash': splash_scene}
+
+
+def jobs():
+    """Liste des sorties: (chemin, visuel, largeur, hauteur)."""
+    out = [(os.path.join(OUT_DIR, 'icon.png'), 'icon', 512, 512),
+           (os.path.join(OUT_DIR, 'splash.png'), 'splash', 1080, 1920),
+           (os.path.join(OUT_DIR, 'notification.png'), 'notification', 96, 96)]
+    for name, factor in DENSITIES.items():
+        mipmap = os.path.join(OUT_DIR, 'res', f'mipmap-{name}')
+        drawable = os.path.join(OUT_DIR, 'res', f'drawable-{name}')
+        for filename, scene, dp in [('ic_launcher.png', 'icon', 48),
+                                    ('ic_launcher_foreground.png', 'foreground', 108),
+                                    ('ic_launcher_background.png', 'background', 108)]:
+            size = round(dp * factor)
+            out.append((os.path.join(mipmap, filename), scene, size, size))
+        size = round(24 * factor)
+        out.append((os.path.join(drawable, 'ic_stat_notify.png'), 'notification', size, size))
+    return out
+
+# =============================================================================
+# RENDU PILLOW (suréchantillonné puis quantifié)
+# =============================================================================
+def _font(ImageFont, size, bold):
     try:
-        from PIL import Image, ImageDraw, ImageFont
-        
-        # Créer le dossier assets
-        os.makedirs('assets', exist_ok=True)
-        
-        # === ICÔNE (512x512) ===
-        print("Création de l'icône...")
-        icon_size = 512
-        icon = Image.new('RGBA', (icon_size, icon_size), (26, 95, 122, 255))
-        draw = ImageDraw.Draw(icon)
-        
-        # Fond circulaire
-        margin = 20
-        draw.ellipse(
-            [margin, margin, icon_size - margin, icon_size - margin],
-            fill=(45, 106, 79, 255)
-        )
-        
-        # Bouclier
-        center = icon_size // 2
-        shield_points = [
-            (center, center - 120),
-            (center - 80, center - 60),
-            (center - 80, center + 40),
-            (center, center + 100),
-            (center + 80, center + 40),
-            (center + 80, center - 60),
-        ]
-        draw.polygon(shield_points, fill=(26, 95, 122, 255))
-        
-        # Texte
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 120)
-        except:
-            font = ImageFont.load_default()
-        
-        draw.text((center - 45, center - 50), "EN", fill=(255, 255, 255, 255), font=font)
-        
-        icon.save('assets/icon.png')
-        print("✓ Icône créée: assets/icon.png")
-        
-        # === SPLASH SCREEN (1080x1920) ===
-        print("Création du splash screen...")
-        splash_size = (1080, 1920)
-        splash = Image.new('RGBA', splash_size, (14, 17, 23, 255))
-        draw = ImageDraw.Draw(splash)
-        
-        # Logo central
-        logo_y = 700
-        draw.rounded_rectangle(
-            [340, logo_y, 740, logo_y + 400],
-            radius=20,
-            fill=(26, 95, 122, 255)
-        )
-        
-        # Texte du logo
-        try:
-            font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 72)
-            font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 36)
-        except:
-            font_large = ImageFont.load_default()
-            font_small = ImageFont.load_default()
-        
-        draw.text((380, logo_y + 100), "ELITE", fill=(255, 255, 255, 255), font=font_large)
-        draw.text((350, logo_y + 200), "NEURAL", fill=(255, 193, 7, 255), font=font_large)
-        draw.text((340, logo_y + 300), "EVOLVE v8.0", fill=(200, 200, 200, 255), font=font_small)
-        
-        # Bas de page
-        draw.text((350, 1700), "Chargement...", fill=(150, 150, 150, 255), font=font_small)
-        
-        splash.save('assets/splash.png')
-        print("✓ Splash screen créé: assets/splash.png")
-        
-        # === NOTIFICATION ICON ===
-        print("Création de l'icône de notification...")
-        notif_size = 96
-        notif = Image.new('RGBA', (notif_size, notif_size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(notif)
-        
-        draw.ellipse([10, 10, notif_size - 10, notif_size - 10], fill=(26, 95, 122, 255))
-        draw.text((30, 30), "EN", fill=(255, 255, 255, 255))
-        
-        notif.save('assets/notification.png')
-        print("✓ Icône notification créée: assets/notification.png")
-        
-        print("\n✅ Tous les assets ont été créés avec succès!")
-        
+        return ImageFont.truetype(FONTS[bold], size)
+    except OSError:
+        try: return ImageFont.load_default(size)
+        except TypeError: return ImageFont.load_default()
+
+
+def render_pil(scene, width, height):
+    from PIL import Image, ImageDraw, ImageFont
+    ss = 4 if width * height <= 512 * 512 else 2  # anticrénelage: dessin en grand puis réduction
+    W, H = width * ss, height * ss
+    img = Image.new('RGBA', (W, H), CLEAR)
+    draw = ImageDraw.Draw(img)
+    for kind, *args in SCENES[scene]():
+        if kind == 'rect':
+            (x0, y0, x1, y1), color = args
+            draw.rectangle([x0 * W, y0 * H, x1 * W - 1, y1 * H - 1], fill=color)
+        elif kind == 'rrect':
+            (x0, y0, x1, y1), radius, color = args
+            draw.rounded_rectangle([x0 * W, y0 * H, x1 * W, y1 * H], radius=radius * W, fill=color)
+        elif kind == 'ellipse':
+            (x0, y0, x1, y1), color = args
+            draw.ellipse([x0 * W, y0 * H, x1 * W, y1 * H], fill=color)
+        elif kind == 'polygon':
+            points, color = args
+            draw.polygon([(x * W, y * H) for x, y in points], fill=color)
+        elif kind == 'text':
+            (x, y), text, size, color, bold = args
+            draw.text((x * W, y * H), text, fill=color, font=_font(ImageFont, round(size * H), bold))
+    img = img.resize((width, height), Image.LANCZOS)
+    if img.getextrema()[3][0] == 255:
+        img = img.convert('RGB')  # opaque: pas de canal alpha dans la palette
+    # Aplats et dégradés d'anticrénelage: 256 couleurs suffisent, sans tramage (mieux compressé)
+    img = img.quantize(256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+    buf = io.BytesIO()
+    img.save(buf, 'PNG', optimize=True)
+    return buf.getvalue()
+
+# =============================================================================
+# RENDU DE SECOURS (bibliothèque standard, PNG à palette)
+# =============================================================================
+# Police bitmap 5x7 (majuscules): les visuels n'utilisent que ces caractères
+_GLYPHS = {
+    'A': '01110 10001 10001 11111 10001 10001 10001', 'C': '01110 10001 10000 10000 10000 10001 01110',
+    'E': '11111 10000 10000 11110 10000 10000 11111', 'G': '01110 10001 10000 10111 10001 10001 01111',
+    'H': '10001 10001 10001 11111 10001 10001 10001', 'I': '11111 00100 00100 00100 00100 00100 11111',
+    'L': '10000 10000 10000 10000 10000 10000 11111', 'M': '10001 11011 10101 10101 10001 10001 10001',
+    'N': '10001 11001 10101 10011 10001 10001 10001', 'O': '01110 10001 10001 10001 10001 10001 01110',
+    'R': '11110 10001 10001 11110 10100 10010 10001', 'T': '11111 00100 00100 00100 00100 00100 00100',
+    'U': '10001 10001 10001 10001 10001 10001 01110', 'V': '10001 10001 10001 10001 10001 01010 00100',
+    '0': '01110 10001 10011 10101 11001 10001 01110', '8': '01110 10001 10001 01110 10001 10001 01110',
+    '.': '00000 00000 00000 00000 00000 01100 01100',
+}
+
+
+class _Canvas:
+    """Image à palette remplie par segments horizontaux (un octet par pixel)."""
+
+    def __init__(self, width, height):
+        self.w, self.h = width, height
+        self.palette = [CLEAR]
+        self.pixels = bytearray(width * height)
+
+    def span(self, y, x0, x1, color):
+        x0, x1 = max(int(round(x0)), 0), min(int(round(x1)), self.w)
+        if not 0 <= y < self.h or x1 <= x0: return
+        if color not in self.palette: self.palette.append(color)
+        start = y * self.w
+        self.pixels[start + x0:start + x1] = bytes([self.palette.index(color)]) * (x1 - x0)
+
+    def rows(self, y0, y1):
+        return range(max(int(round(y0)), 0), min(int(round(y1)), self.h))
+
+    def rect(self, x0, y0, x1, y1, color):
+        for y in self.rows(y0, y1): self.span(y, x0, x1, color)
+
+    def rrect(self, x0, y0, x1, y1, r, color):
+        for y in self.rows(y0, y1):
+            d = max(y0 + r - (y + 0.5), (y + 0.5) - (y1 - r), 0)  # distance verticale dans un coin
+            inset = r - math.sqrt(max(r * r - d * d, 0))
+            self.span(y, x0 + inset, x1 - inset, color)
+
+    def ellipse(self, x0, y0, x1, y1, color):
+        cx, cy, rx, ry = (x0 + x1) / 2, (y0 + y1) / 2, (x1 - x0) / 2, (y1 - y0) / 2
+        for y in self.rows(y0, y1):
+            dy = (y + 0.5 - cy) / ry
+            half = rx * math.sqrt(max(1 - dy * dy, 0))
+            self.span(y, cx - half, cx + half, color)
+
+    def polygon(self, points, color):
+        edges = list(zip(points, points[1:] + points[:1]))
+        for y in self.rows(min(p[1] for p in points), max(p[1] for p in points)):
+            yc = y + 0.5
+            xs = sorted(ax + (yc - ay) * (bx - ax) / (by - ay)
+                        for (ax, ay), (bx, by) in edges if (ay <= yc < by) or (by <= yc < ay))
+            for a, b in zip(xs[::2], xs[1::2]): self.span(y, a, b, color)
+
+    def text(self, x, y, text, size, color):
+        cell = max(size * 0.72 / 7, 1)  # hauteur de capitale ≈ 72 % du corps
+        y += size * 0.2
+        for char in text.upper():
+            rows = _GLYPHS.get(char)
+            for j, row in enumerate(rows.split() if rows else []):
+                for i, bit in enumerate(row):
+                    if bit == '1':
+                        self.rect(x + i * cell, y + j * cell, x + (i + 1) * cell, y + (j + 1) * cell, color)
+            x += 6 * cell
+
+    def png(self):
+        def chunk(kind, data):
+            return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+        raw = b''.join(b'\x00' + self.pixels[y * self.w:(y + 1) * self.w] for y in range(self.h))
+        alpha = bytes(c[3] for c in self.palette).rstrip(b'\xff')
+        return (b'\x89PNG\r\n\x1a\n'
+                + chunk(b'IHDR', struct.pack('>IIBBBBB', self.w, self.h, 8, 3, 0, 0, 0))
+                + chunk(b'PLTE', b''.join(bytes(c[:3]) for c in self.palette))
+                + (chunk(b'tRNS', alpha) if alpha else b'')
+                + chunk(b'IDAT', zlib.compress(raw, 9))
+                + chunk(b'IEND', b''))
+
+
+def render_basic(scene, width, height):
+    canvas = _Canvas(width, height)
+    for kind, *args in SCENES[scene]():
+        if kind in ('rect', 'ellipse'):
+            (x0, y0, x1, y1), color = args
+            getattr(canvas, kind)(x0 * width, y0 * height, x1 * width, y1 * height, color)
+        elif kind == 'rrect':
+            (x0, y0, x1, y1), radius, color = args
+            canvas.rrect(x0 * width, y0 * height, x1 * width, y1 * height, radius * width, color)
+        elif kind == 'polygon':
+            points, color = args
+            canvas.polygon([(x * width, y * height) for x, y in points], color)
+        elif kind == 'text':
+            (x, y), text, size, color, _ = args
+            canvas.text(x * width, y * height, text, size * height, color)
+    return canvas.png()
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+def backend():
+    try:
+        import PIL  # noqa: F401
+        return 'pil'
     except ImportError:
-        print("❌ PIL (Pillow) n'est pas installé.")
-        print("Installez avec: pip install pillow")
-        
-        # Créer des fichiers placeholder
-        os.makedirs('assets', exist_ok=True)
-        
-        # Créer des fichiers vides comme placeholders
-        open('assets/icon.png', 'w').close()
-        open('assets/splash.png', 'w').close()
-        
-        print("⚠️  Des fichiers placeholder ont été créés.")
-        print("   Remplacez-les par de vraies images PNG.")
+        return 'basic'
+
+
+def fingerprint(job, engine):
+    """Empreinte des entrées d'une sortie: paramètres, code de ce script, polices utilisées."""
+    h = hashlib.sha256(json.dumps([job[1:], engine]).encode('utf-8'))
+    with open(os.path.abspath(__file__), 'rb') as f:
+        h.update(f.read())
+    if engine == 'pil':
+        for path in sorted(set(FONTS.values())):
+            if os.path.exists(path):
+                with open(path, 'rb') as f: h.update(f.read())
+    return h.hexdigest()
+
+
+def render(job, engine):
+    path, scene, width, height = job
+    data = (render_pil if engine == 'pil' else render_basic)(scene, width, height)
+    return path, data
+
+
+def create_assets(force=False, workers=None):
+    """Génère les sorties dont l'empreinte a changé; renvoie (refaites, inchangées)."""
+    from persistence import atomic_write
+    engine = backend()
+    if engine == 'basic':
+        print("⚠️  Pillow absent: rendu de secours (formes pleines, police bitmap).")
+        print("   Installez avec: pip install pillow")
+    try:
+        with open(MANIFEST, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    todo, kept = [], 0
+    for job in jobs():
+        digest = fingerprint(job, engine)
+        if not force and manifest.get(job[0]) == digest and os.path.exists(job[0]):
+            kept += 1
+        else:
+            todo.append((job, digest))
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render, job, engine) for job, _ in todo]
+            for (job, digest), future in zip(todo, futures):
+                path, data = future.result()
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                atomic_write(path, data)
+                manifest[path] = digest
+                print(f"✓ {path} ({job[2]}x{job[3]}, {len(data) / 1024:.1f} Ko)")
+        atomic_write(MANIFEST, json.dumps(manifest, indent=2, sort_keys=True))
+    print(f"\n✅ Assets: {len(todo)} générés, {kept} inchangés")
+    return len(todo), kept
 
 
 if __name__ == '__main__':
-    create_assets()
+    args = sys.argv[1:]
+    jobs_arg = args[args.index('--jobs') + 1] if '--jobs' in args else None
+    create_assets(force='--force' in args, workers=int(jobs_arg) if jobs_arg else None)
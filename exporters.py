@@ -0,0 +1,160 @@
+"""
+Export en flux de l'historique, des transactions et des lignes de facteurs.
+
+- CSV toujours disponible; Parquet si pyarrow (ou pandas + fastparquet)
+  est installé.
+- Écriture par blocs de CHUNK_SIZE lignes: la mémoire reste bornée quelle
+  que soit la taille de l'historique.
+- Export incrémental: un curseur (export_cursor.json) retient le nombre de
+  lignes déjà exportées par source et format, et l'époque des données (un
+  changement d'époque, c.-à-d. une réinitialisation, force un export complet). Le CSV est complété en fin de
+  fichier; le Parquet reçoit un nouveau fichier part-NNNNN par export (le
+  dossier se lit comme un dataset).
+- pyarrow / pandas ne sont importés qu'au premier export Parquet (plusieurs
+  centaines de ms): ouvrir l'écran d'export ne les charge pas.
+"""
+
+import csv
+import importlib.util
+import json
+import os
+
+pa = pq = pd = None
+
+CHUNK_SIZE = 5000
+
+HISTORY_COLUMNS = ['row', 'match', 'home_id', 'away_id', 'result', 'timestamp', 'settled_at',
+                   'stake', 'odds', 'ev', 'profit']
+TRANSACTION_COLUMNS = ['row', 'type', 'amount', 'timestamp', 'balance']
+_FLOAT_COLUMNS = {'stake', 'odds', 'ev', 'profit', 'amount', 'balance'}
+
+
+def _arrow_type(column):
+    """Type Parquet fixe par colonne (un bloc entièrement vide ne doit pas changer le schéma)."""
+    if column == 'row': return pa.int64()
+    if column in _FLOAT_COLUMNS or column.startswith(('factor_', 'weight_')): return pa.float64()
+    return pa.string()
+
+
+def parquet_available():
+    """Moteur Parquet installé (recherche du module, sans l'importer)."""
+    found = lambda name: importlib.util.find_spec(name) is not None
+    return found('pyarrow') or (found('pandas') and found('fastparquet'))
+
+
+def _load_parquet():
+    global pa, pq, pd
+    if pq is not None or pd is not None: return
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        import pandas as pd
+        import fastparquet  # noqa: F401 (moteur parquet de pandas sans pyarrow)
+
+
+def history_row(i, entry):
+    from aggregates import entry_profit
+    row = {k: entry.get(k) for k in HISTORY_COLUMNS}
+    row['row'], row['profit'] = i, entry_profit(entry)
+    return row
+
+
+def transaction_row(i, tx):
+    row = {k: tx.get(k) for k in TRANSACTION_COLUMNS}
+    row['row'] = i
+    return row
+
+
+def feature_columns(factors):
+    return (['row', 'timestamp', 'result'] + [f'factor_{f}' for f in factors]
+            + [f'weight_{f}' for f in factors])
+
+
+def feature_row_builder(factors):
+    """Ligne à plat des facteurs du pronostic et des poids après apprentissage."""
+    def build(i, entry):
+        row = {'row': i, 'timestamp': entry.get('timestamp'), 'result': entry.get('result')}
+        stored, weights = entry.get('factors') or {}, entry.get('weights') or {}
+        for f in factors:
+            row[f'factor_{f}'] = stored.get(f)
+            row[f'weight_{f}'] = weights.get(f)
+        return row
+    return build
+
+
+class Exporter:
+    """Exports incrémentaux vers `out_dir`, un curseur par (source, format)."""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.cursor_file = os.path.join(out_dir, 'export_cursor.json')
+        os.makedirs(out_dir, exist_ok=True)
+        try:
+            with open(self.cursor_file, 'r', encoding='utf-8') as f:
+                self.cursor = json.load(f)
+        except (OSError, ValueError):
+            self.cursor = {}
+
+    def _save_cursor(self):
+        from persistence import atomic_write
+        atomic_write(self.cursor_file, json.dumps(self.cursor, indent=2))
+
+    def export(self, source, rows, build_row, columns, fmt='csv', full=False, epoch=0):
+        """Exporte rows[début:] (début = curseur; 0 si `full`, si `epoch` a changé ou si la liste a rétréci).
+
+        Renvoie (lignes écrites, chemin).
+        """
+        key = f'{source}.{fmt}'
+        end = len(rows)
+        cursor = self.cursor.get(key, 0)
+        if not isinstance(cursor, dict): cursor = {'rows': cursor, 'epoch': 0}  # ancien format
+        start = 0 if full or cursor['epoch'] != epoch else cursor['rows']
+        if start > end: start = 0  # données réinitialisées: export complet
+        if fmt == 'csv':
+            path = os.path.join(self.out_dir, f'{source}.csv')
+            written = self._write_csv(path, rows, start, end, build_row, columns, append=start > 0)
+        elif fmt == 'parquet':
+            path = os.path.join(self.out_dir, source)
+            written = self._write_parquet(path, rows, start, end, build_row, columns, reset=start == 0)
+        else:
+            raise ValueError(f'format inconnu: {fmt}')
+        self.cursor[key] = {'rows': end, 'epoch': epoch}
+        self._save_cursor()
+        return written, path
+
+    @staticmethod
+    def _chunks(rows, start, end, build_row):
+        for lo in range(start, end, CHUNK_SIZE):
+            yield [build_row(i, rows[i]) for i in range(lo, min(lo + CHUNK_SIZE, end))]
+
+    def _write_csv(self, path, rows, start, end, build_row, columns, append):
+        append = append and os.path.exists(path)
+        with open(path, 'a' if append else 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            if not append: writer.writeheader()
+            for chunk in self._chunks(rows, start, end, build_row):
+                writer.writerows(chunk)
+        return end - start
+
+    def _write_parquet(self, path, rows, start, end, build_row, columns, reset):
+        if not parquet_available():
+            raise RuntimeError('Parquet indisponible (pyarrow ou pandas + fastparquet requis)')
+        _load_parquet()
+        os.makedirs(path, exist_ok=True)
+        parts = sorted(p for p in os.listdir(path) if p.startswith('part-'))
+        if reset:
+            for p in parts: os.remove(os.path.join(path, p))
+            parts = []
+        if start >= end: return 0
+        part = os.path.join(path, f'part-{len(parts):05d}.parquet')
+        if pq is not None:
+            schema = pa.schema([(c, _arrow_type(c)) for c in columns])
+            with pq.ParquetWriter(part, schema) as writer:
+                for chunk in self._chunks(rows, start, end, build_row):
+                    writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+        else:
+            for i, chunk in enumerate(self._chunks(rows, start, end, build_row)):
+                pd.DataFrame(chunk, columns=columns).to_parquet(
+                    part, engine='fastparquet', index=False, append=i > 0)
+        return end - start
@@ -0,0 +1,116 @@
+"""
+Moniteur de frames (jank) pour les écrans Kivy.
+
+Opt-in: une callback Clock appelée à chaque frame mesure l'intervalle entre
+deux frames. Les frames trop longues sont attribuées à l'écran actif et aux
+callbacks suivies (décorateur `track`) qui ont tourné pendant la frame.
+"""
+
+import functools
+import json
+import time
+from collections import deque
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.metrics import dp
+from kivy.uix.label import Label
+
+
+class FrameMonitor:
+    """Mesure des durées de frame et journal des frames perdues par écran."""
+
+    def __init__(self, target_fps=60, slow_factor=1.5, capacity=2048):
+        self.enabled = False
+        self.budget_ms = 1000.0 / target_fps
+        self.slow_ms = self.budget_ms * slow_factor
+        self.frames = deque(maxlen=capacity)
+        self.dropped = deque(maxlen=capacity)
+        self.per_screen = {}
+        self.screen_getter = lambda: ''
+        self.overlay = None
+        self._callbacks = []
+        self._events = []
+
+    def start(self, screen_getter, overlay=True):
+        if self.enabled: return
+        self.enabled = True
+        self.screen_getter = screen_getter
+        self._callbacks = []
+        self._events = [Clock.schedule_interval(self._tick, 0)]
+        if overlay:
+            self.overlay = Label(text='', font_size=dp(10), size_hint=(None, None),
+                                 size=(dp(220), dp(30)), halign='right',
+                                 color=(1, 0.76, 0.03, 1))
+            Window.add_widget(self.overlay)
+            self._events.append(Clock.schedule_interval(self._refresh_overlay, 0.5))
+
+    def stop(self):
+        if not self.enabled: return
+        self.enabled = False
+        for event in self._events: event.cancel()
+        self._events = []
+        if self.overlay is not None:
+            Window.remove_widget(self.overlay)
+            self.overlay = None
+
+    def mark(self, label, duration_ms=0.0):
+        """Note qu'une callback a tourné pendant la frame courante."""
+        if self.enabled:
+            self._callbacks.append((label, duration_ms))
+
+    def track(self, label):
+        """Décorateur: attribue la durée de la fonction à la frame courante."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._callbacks.append((label, (time.perf_counter() - start) * 1000))
+            return wrapper
+        return decorator
+
+    def _tick(self, dt):
+        frame_ms = dt * 1000
+        screen = self.screen_getter() or '?'
+        stats = self.per_screen.setdefault(screen, {'frames': 0, 'dropped': 0, 'worst_ms': 0.0})
+        stats['frames'] += 1
+        stats['worst_ms'] = max(stats['worst_ms'], frame_ms)
+        self.frames.append((time.time(), frame_ms, screen))
+
+        if frame_ms > self.slow_ms:
+            lost = max(1, int(frame_ms // self.budget_ms) - 1)
+            stats['dropped'] += lost
+            callbacks = sorted(self._callbacks, key=lambda c: c[1], reverse=True)
+            self.dropped.append({
+                'timestamp': time.time(), 'screen': screen, 'frame_ms': round(frame_ms, 2),
+                'dropped': lost, 'callbacks': [[label, round(ms, 2)] for label, ms in callbacks]
+            })
+        self._callbacks = []
+
+    def fps(self):
+        recent = list(self.frames)[-60:]
+        total = sum(f[1] for f in recent)
+        return len(recent) * 1000 / total if total > 0 else 0.0
+
+    def _refresh_overlay(self, dt):
+        if self.overlay is None: return
+        drops = ' '.join(f"{name}:{s['dropped']}" for name, s in self.per_screen.items() if s['dropped'])
+        self.overlay.text = f"{self.fps():.0f} FPS  {drops}"
+        self.overlay.pos = (Window.width - self.overlay.width - dp(5),
+                            Window.height - self.overlay.height - dp(5))
+
+    def export_log(self, filepath):
+        """Écrit le résumé par écran et la liste des frames perdues en JSON."""
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({'budget_ms': self.budget_ms, 'screens': self.per_screen,
+                       'dropped_frames': list(self.dropped)}, f, ensure_ascii=False, indent=1)
+        return len(self.dropped)
+
+
+# Instance globale
+frame_monitor = FrameMonitor()
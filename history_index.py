@@ -0,0 +1,120 @@
+"""
+Index de recherche sur l'historique des pronostics.
+
+- identifiants d'équipe normalisés ("Paris Saint-Germain" -> "paris-saint-germain")
+- index inversé équipe -> lignes, trié par date
+- index global trié par date
+
+Les timestamps ISO 8601 se comparent comme des chaînes: une période
+("2025-03", "2025-03-14") se résout par deux bisections sans parsing.
+"""
+
+import bisect
+import functools
+import heapq
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_team(name):
+    """Identifiant stable d'équipe: sans accents, minuscules, séparateurs '-'."""
+    text = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii')
+    return _NON_ALNUM.sub('-', text.lower()).strip('-')
+
+
+def split_match(match):
+    """'Home vs Away' -> (home, away)."""
+    home, _, away = (match or '').partition(' vs ')
+    return home.strip(), away.strip()
+
+
+def team_ids(entry):
+    """Identifiants (domicile, extérieur) d'une entrée d'historique."""
+    if 'home_id' in entry:
+        return entry['home_id'], entry['away_id']
+    home, away = split_match(entry.get('match', ''))
+    return normalize_team(home), normalize_team(away)
+
+
+def period_range(period):
+    """Bornes [début, fin) d'une période préfixe ISO ('2025', '2025-03', '2025-03-14')."""
+    return period, period + '\uffff'
+
+
+def _insert(stamps, rows, ts, row):
+    """Insertion triée; cas courant (entrée la plus récente) en O(1)."""
+    if not stamps or ts >= stamps[-1]:
+        stamps.append(ts)
+        rows.append(row)
+    else:
+        pos = bisect.bisect_right(stamps, ts)
+        stamps.insert(pos, ts)
+        rows.insert(pos, row)
+
+
+class HistoryIndex:
+    """Index incrémental équipe/date sur une liste d'entrées append-only."""
+
+    def __init__(self, base=0):
+        self.base = base     # ligne globale de la première entrée indexée
+        self.count = 0
+        self.by_team = {}    # team_id -> ([timestamps triés], [lignes])
+        self.dates = []      # timestamps triés
+        self.date_rows = []  # lignes correspondantes
+
+    def sync(self, history, base=0):
+        """Indexe les entrées ajoutées depuis le dernier appel.
+
+        `base` est la ligne globale de history[0] (entrées plus anciennes
+        archivées); l'index est reconstruit si la base change ou si la liste
+        a rétréci.
+        """
+        if base != self.base or len(history) < self.count:
+            self.__init__(base)
+        for i in range(self.count, len(history)):
+            self.add(base + i, history[i])
+
+    def add(self, row, entry):
+        ts = entry.get('timestamp', '')
+        _insert(self.dates, self.date_rows, ts, row)
+        for team in set(team_ids(entry)):
+            if not team: continue
+            stamps, rows = self.by_team.setdefault(team, ([], []))
+            _insert(stamps, rows, ts, row)
+        self.count = max(self.count, row - self.base + 1)
+
+    def teams(self, prefix=''):
+        """Équipes connues dont l'identifiant commence par `prefix` (normalisé)."""
+        key = normalize_team(prefix)
+        return sorted(t for t in self.by_team if t.startswith(key))
+
+    def search(self, team=None, period=None, exact=None):
+        """Lignes correspondant à l'équipe et/ou la période, de la plus récente à la plus ancienne.
+
+        Une équipe partielle ('marseil') est étendue à toutes les équipes qui
+        commencent par ce préfixe; `exact` force le choix (équipe connue
+        ailleurs, p. ex. dans les archives).
+        """
+        lo, hi = period_range(period) if period else ('', '\uffff')
+        if not team:
+            start, end = bisect.bisect_left(self.dates, lo), bisect.bisect_left(self.dates, hi)
+            return self.date_rows[start:end][::-1]
+        key = normalize_team(team)
+        if exact is None: exact = key in self.by_team
+        matches = [t for t in ([key] if exact else self.teams(key)) if t in self.by_team]
+        postings = []
+        for t in matches:
+            stamps, team_rows = self.by_team[t]
+            start, end = bisect.bisect_left(stamps, lo), bisect.bisect_left(stamps, hi)
+            postings.append(zip(stamps[start:end], team_rows[start:end]))
+        if len(postings) == 1:
+            return [row for _, row in postings[0]][::-1]
+        # Fusion par date (listes déjà triées); un match entre deux équipes du préfixe n'apparaît qu'une fois
+        rows, last = [], None
+        for posting in heapq.merge(*postings):
+            if posting != last: rows.append(posting[1])
+            last = posting
+        return rows[::-1]
@@ -0,0 +1,197 @@
+"""
+Journal d'événements append-only et points de contrôle (snapshots).
+
+Chaque mutation de l'état (dépôt, retrait, pari placé, règlement, import,
+réinitialisation) est d'abord écrite ici, une ligne JSON par événement:
+    {"seq": 42, "ts": "2025-03-14T20:15:00", "type": "deposit", "data": {...}}
+puis appliquée à l'état en mémoire par le même réducteur qu'au rejeu.
+
+Disposition sur disque (dans `directory`):
+    events-<seq>.jsonl    segments, chacun commence après un snapshot
+    snapshots/<seq>/      brain.json, bankroll.json, ledger.bin à l'état `seq`
+
+Au démarrage seul le segment postérieur au dernier état sauvegardé est relu.
+Le premier snapshot (genèse) est conservé avec les KEEP_SNAPSHOTS plus
+récents: tout état passé se reconstruit depuis le snapshot le plus proche
+en rejouant les événements suivants.
+
+Écriture en group commit: append() écrit la ligne et la pousse au système
+(visible des autres processus, conservée si l'application est tuée); le
+fsync est fait par un thread dédié qui regroupe tous les événements arrivés
+pendant le fsync précédent. Un appui ne bloque jamais sur la carte SD;
+sync() attend la durabilité (fermeture, changement de profil).
+
+Si un autre processus écrit dans le même journal (sous le verrou du dossier
+de données), refresh() détecte la modification par un stat du dernier
+segment et relit la position courante.
+"""
+
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+CHECKPOINT_EVERY = 200
+KEEP_SNAPSHOTS = 3
+SNAPSHOT_FILES = ('brain.json', 'bankroll.json', 'ledger.bin')
+
+
+class Journal:
+    def __init__(self, directory):
+        self.dir = directory
+        self.snap_dir = os.path.join(directory, 'snapshots')
+        os.makedirs(self.snap_dir, exist_ok=True)
+        self._file = None
+        # Group commit: segments à synchroniser, traités par un thread dédié
+        self._cond = threading.Condition()
+        self._dirty, self._syncing, self._syncer = set(), False, None
+        self._load()
+
+    def _load(self):
+        """Position courante (dernier snapshot, dernière séquence, segment ouvert)."""
+        snaps = self.snapshots()
+        self.last_checkpoint = snaps[-1] if snaps else None
+        self.seq = self.last_checkpoint or 0
+        for event in self._read(self._segments()[-1:]):
+            self.seq = max(self.seq, event['seq'])
+        # Segment courant: le dernier existant (il commence après le dernier snapshot)
+        segments = self._segments()
+        self._segment = segments[-1] if segments else None
+        self._stamp = self._disk_stamp()
+
+    # --- écriture ------------------------------------------------------------
+    def append(self, kind, data, ts=None, origin=None):
+        """Ajoute un événement (écrit et synchronisé sur disque) et le renvoie.
+
+        `ts` et `origin` (appareil, n) conservent l'identité d'un événement
+        reçu d'un autre appareil (sync).
+        """
+        event = {'seq': self.seq + 1, 'ts': ts or datetime.now().isoformat(), 'type': kind, 'data': data}
+        if origin is not None: event['dev'], event['n'] = origin
+        if self._file is None:
+            if self._segment is None:
+                self._segment = os.path.join(self.dir, f'events-{event["seq"]:010d}.jsonl')
+            self._file = open(self._segment, 'a', encoding='utf-8')
+            if self._file.tell() and not self._ends_with_newline(self._segment):
+                self._file.write('\n')  # isole une ligne tronquée par un arrêt brutal
+        self._file.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._file.flush()
+        self._sync_later(self._segment)
+        self.seq = event['seq']
+        self._stamp = (self._segment, self._file.tell())
+        return event
+
+    def refresh(self):
+        """Relit la position du journal si un autre processus y a écrit; renvoie True dans ce cas."""
+        if self._disk_stamp() == self._stamp: return False
+        if self._file is not None:
+            self._file.close()  # sans sync(): les segments en attente restent au thread de fsync
+            self._file = None
+        self._load()
+        return True
+
+    def checkpoint_due(self):
+        return self.last_checkpoint is None or self.seq - self.last_checkpoint >= CHECKPOINT_EVERY
+
+    def snapshot_dir(self, seq):
+        return os.path.join(self.snap_dir, f'{seq:010d}')
+
+    def begin_checkpoint(self, seq):
+        """Prépare snapshots/<seq>/ et ouvre un nouveau segment pour les événements suivants.
+
+        Les fichiers du snapshot sont écrits par l'appelant (committer); un
+        snapshot incomplet est ignoré à la lecture (numéros de séquence
+        incohérents).
+        """
+        path = self.snapshot_dir(seq)
+        os.makedirs(path, exist_ok=True)
+        self.last_checkpoint = seq
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._segment = None
+        snaps = self.snapshots()
+        for old in snaps[1:-KEEP_SNAPSHOTS]:
+            shutil.rmtree(self.snapshot_dir(old), ignore_errors=True)
+        return path
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.sync()
+
+    # --- durabilité (group commit) ------------------------------------------
+    def _sync_later(self, path):
+        with self._cond:
+            self._dirty.add(path)
+            if self._syncer is None:
+                self._syncer = threading.Thread(target=self._run_sync, name='journal-sync', daemon=True)
+                self._syncer.start()
+            self._cond.notify_all()
+
+    def _run_sync(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty)
+                paths, self._dirty, self._syncing = self._dirty, set(), True
+            for path in paths:
+                try:
+                    fd = os.open(path, os.O_RDONLY)  # fsync par un autre descripteur: la fermeture du segment reste libre
+                    try: os.fsync(fd)
+                    finally: os.close(fd)
+                except OSError:
+                    pass
+            with self._cond:
+                self._syncing = False
+                self._cond.notify_all()
+
+    def sync(self, timeout=None):
+        """Attend que les événements écrits soient sur disque; renvoie False si `timeout` expire."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._dirty and not self._syncing, timeout)
+
+    # --- lecture -------------------------------------------------------------
+    def snapshots(self):
+        return sorted(int(name) for name in os.listdir(self.snap_dir) if name.isdigit())
+
+    def _segments(self):
+        return sorted(os.path.join(self.dir, name) for name in os.listdir(self.dir)
+                      if name.startswith('events-') and name.endswith('.jsonl'))
+
+    def _disk_stamp(self):
+        segments = self._segments()
+        return (segments[-1], os.path.getsize(segments[-1])) if segments else None
+
+    @staticmethod
+    def _ends_with_newline(path):
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    @staticmethod
+    def _read(segments):
+        for segment in segments:
+            with open(segment, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try: yield json.loads(line)
+                    except ValueError: pass  # ligne tronquée (arrêt brutal pendant l'écriture)
+
+    def events(self, after=0, until=None):
+        """Événements de séquence dans ]after, until], en ne lisant que les segments utiles."""
+        segments = self._segments()
+        firsts = [int(os.path.basename(s)[7:17]) for s in segments]
+        start = max([i for i, first in enumerate(firsts) if first <= after + 1] or [0])
+        for event in self._read(segments[start:]):
+            if event['seq'] <= after: continue
+            if until is not None and event['seq'] > until: return
+            yield event
+
+    def seq_at(self, when):
+        """Séquence du dernier événement daté au plus tard `when` (ISO 8601)."""
+        seq = 0
+        for event in self.events():
+            if event['ts'] > when: break
+            seq = event['seq']
+        return seq
@@ -0,0 +1,220 @@
+"""
+Grand livre en partie double, montants en centimes entiers.
+
+Chaque écriture débite un compte et en crédite un autre du même montant;
+la somme des soldes de tous les comptes est toujours nulle. Les écritures
+sont stockées en colonnes (array) avec une colonne de solde courant de la
+bankroll: le solde à une date donnée est une bisection. Une écriture
+antidatée (import de paris historiques) garde sa vraie date: les colonnes
+sont retriées et le solde courant recalculé une fois, à la lecture suivante.
+
+Comptes:
+    bankroll   argent disponible du joueur
+    external   contrepartie des dépôts / retraits
+    wagers     mises engagées non réglées
+    winnings   gains nets versés (solde créditeur)
+    losses     mises perdues
+
+Schéma d'un pari: mise (wagers <- bankroll), puis au règlement soit
+restitution + gain net (bankroll <- wagers, bankroll <- winnings), soit
+perte (losses <- wagers).
+"""
+
+import bisect
+import itertools
+import json
+import time
+from array import array
+
+np = False  # numpy importé au premier calcul vectorisé (~80 ms évités au démarrage)
+NUMPY_MIN = 50_000  # en dessous, la boucle Python est plus rapide que l'import de numpy
+
+
+def _numpy():
+    global np
+    if np is False:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    return np
+
+ACCOUNTS = ('bankroll', 'external', 'wagers', 'winnings', 'losses')
+KINDS = ('opening', 'deposit', 'withdrawal', 'wager', 'win', 'loss')
+_ACC = {name: i for i, name in enumerate(ACCOUNTS)}
+_KIND = {name: i for i, name in enumerate(KINDS)}
+MAGIC = b'ENLEDGER1\n'
+
+
+def to_cents(amount):
+    return int(round(amount * 100))
+
+
+class Ledger:
+    """Écritures en colonnes: ts (ms), kind, débit, crédit, centimes, solde bankroll."""
+
+    def __init__(self):
+        self.ts = array('q')
+        self.kind = array('b')
+        self.debit = array('b')
+        self.credit = array('b')
+        self.cents = array('q')
+        self.running = array('q')
+        self.balances = [0] * len(ACCOUNTS)
+        self.opening_wagered = 0
+        self.wagered = 0
+        self.seq = 0  # dernier événement du journal appliqué
+        self._unsorted = False  # écritures antidatées en attente de tri
+
+    def __len__(self):
+        return len(self.cents)
+
+    def post(self, kind, debit, credit, cents, ts=None):
+        """Ajoute une écriture à sa date (une date antérieure à la dernière est triée plus tard)."""
+        if cents <= 0: return
+        ts = int((ts if ts is not None else time.time()) * 1000)
+        if self.ts and ts < self.ts[-1]: self._unsorted = True
+        d, c = _ACC[debit], _ACC[credit]
+        self.balances[d] += cents
+        self.balances[c] -= cents
+        if kind == 'wager': self.wagered += cents
+        self.ts.append(ts)
+        self.kind.append(_KIND[kind])
+        self.debit.append(d)
+        self.credit.append(c)
+        self.cents.append(cents)
+        self.running.append(self.balances[0])
+
+    def _sort(self):
+        """Tri stable des colonnes par date et recalcul du solde courant (après des écritures antidatées)."""
+        if not self._unsorted: return
+        order = sorted(range(len(self.ts)), key=self.ts.__getitem__)
+        for name in ('ts', 'kind', 'debit', 'credit', 'cents'):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [column[i] for i in order]))
+        deltas = ((c if d == 0 else 0) - (c if cr == 0 else 0)
+                  for c, d, cr in zip(self.cents, self.debit, self.credit))
+        self.running = array('q', itertools.accumulate(deltas))
+        self._unsorted = False
+
+    # --- opérations métier -------------------------------------------------
+    def deposit(self, amount, ts=None):
+        self.post('deposit', 'bankroll', 'external', to_cents(amount), ts)
+
+    def withdraw(self, amount, ts=None):
+        self.post('withdrawal', 'external', 'bankroll', to_cents(amount), ts)
+
+    def wager(self, stake, ts=None):
+        self.post('wager', 'wagers', 'bankroll', to_cents(stake), ts)
+
+    def settle(self, stake, net_gain, success, ts=None):
+        """Règle une mise déjà engagée: gain net si gagné, perte de la mise sinon."""
+        if success:
+            self.post('win', 'bankroll', 'wagers', to_cents(stake), ts)
+            self.post('win', 'bankroll', 'winnings', to_cents(net_gain), ts)
+        else:
+            self.post('loss', 'losses', 'wagers', to_cents(stake), ts)
+
+    def open_from(self, bankroll, ts=None):
+        """Écritures d'ouverture reprenant les totaux d'une bankroll existante."""
+        self.post('opening', 'external', 'winnings', to_cents(bankroll.get('total_won', 0)), ts)
+        self.post('opening', 'losses', 'external', to_cents(bankroll.get('total_lost', 0)), ts)
+        self.opening_wagered = to_cents(bankroll.get('total_wagered', 0))
+        self.wagered += self.opening_wagered
+        delta = to_cents(bankroll.get('current_balance', 0)) - self.balances[0]
+        if delta > 0: self.post('opening', 'bankroll', 'external', delta, ts)
+        elif delta < 0: self.post('opening', 'external', 'bankroll', -delta, ts)
+
+    # --- lectures ---------------------------------------------------------
+    def balance(self, account='bankroll'):
+        """Solde en centimes (débits - crédits)."""
+        return self.balances[_ACC[account]]
+
+    def opening_balance(self, account='bankroll'):
+        """Solde (centimes) des seules écritures d'ouverture (totaux repris par open_from)."""
+        a, k = _ACC[account], _KIND['opening']
+        return sum((c if d == a else 0) - (c if cr == a else 0)
+                   for c, d, cr, kind in zip(self.cents, self.debit, self.credit, self.kind) if kind == k)
+
+    def balance_at(self, when):
+        """Solde de la bankroll (centimes) juste après la dernière écriture <= `when` (epoch s)."""
+        self._sort()
+        i = bisect.bisect_right(self.ts, int(when * 1000))
+        return self.running[i - 1] if i else 0
+
+    def reconcile(self, bankroll):
+        """Vérifie en une passe les soldes du livre et les totaux de `bankroll`.
+
+        Renvoie {champ: (attendu, livre)} pour chaque écart (vide si tout concorde).
+        """
+        self._sort()
+        sums, wagered, running_ok = self._column_sums()
+        issues = {}
+        if sums != self.balances or wagered != self.wagered:
+            issues['counters'] = ((self.balances, self.wagered), (sums, wagered))
+        if sum(sums) != 0:
+            issues['double_entry'] = (0, sum(sums))
+        if not running_ok:
+            issues['running_balance'] = (True, False)
+        checks = {
+            'current_balance': sums[_ACC['bankroll']],
+            'total_won': -sums[_ACC['winnings']],
+            'total_lost': sums[_ACC['losses']],
+            'total_wagered': wagered,
+        }
+        for field, cents in checks.items():
+            expected = to_cents(bankroll.get(field, 0))
+            if abs(expected - cents) > 1:
+                issues[field] = (expected / 100, cents / 100)
+        return issues
+
+    def _column_sums(self):
+        """(soldes par compte, total misé, cohérence de la colonne de solde courant)."""
+        n, k = len(ACCOUNTS), len(self.cents)
+        if k >= NUMPY_MIN and _numpy() is not None:
+            cents = np.frombuffer(self.cents, dtype=np.int64)
+            debit = np.frombuffer(self.debit, dtype=np.int8).astype(np.intp)
+            credit = np.frombuffer(self.credit, dtype=np.int8).astype(np.intp)
+            kind = np.frombuffer(self.kind, dtype=np.int8)
+            sums = np.zeros(n, dtype=np.int64)
+            np.add.at(sums, debit, cents)
+            np.subtract.at(sums, credit, cents)
+            delta = np.where(debit == 0, cents, 0) - np.where(credit == 0, cents, 0)
+            running_ok = bool(np.array_equal(np.cumsum(delta), np.frombuffer(self.running, dtype=np.int64)))
+            wagered = int(cents[kind == _KIND['wager']].sum())
+            return sums.tolist(), self.opening_wagered + wagered, running_ok
+        sums, bal, running_ok, wagered = [0] * n, 0, True, 0
+        for i in range(k):
+            c, d, cr = self.cents[i], self.debit[i], self.credit[i]
+            sums[d] += c
+            sums[cr] -= c
+            bal += (c if d == 0 else 0) - (c if cr == 0 else 0)
+            running_ok = running_ok and bal == self.running[i]
+            if self.kind[i] == _KIND['wager']: wagered += c
+        return sums, self.opening_wagered + wagered, running_ok
+
+    # --- persistance -----------------------------------------------------
+    def to_bytes(self):
+        self._sort()
+        header = json.dumps({'count': len(self), 'opening_wagered': self.opening_wagered,
+                             'seq': self.seq}).encode()
+        return b''.join([MAGIC, header, b'\n', self.ts.tobytes(), self.kind.tobytes(),
+                         self.debit.tobytes(), self.credit.tobytes(), self.cents.tobytes(),
+                         self.running.tobytes()])
+
+    @classmethod
+    def from_bytes(cls, data):
+        if not data.startswith(MAGIC):
+            raise ValueError('format de grand livre inconnu')
+        end = data.index(b'\n', len(MAGIC))
+        header = json.loads(data[len(MAGIC):end])
+        ledger, pos, count = cls(), end + 1, header['count']
+        for name in ('ts', 'kind', 'debit', 'credit', 'cents', 'running'):
+            column = getattr(ledger, name)
+            size = count * column.itemsize
+            column.frombytes(data[pos:pos + size])
+            pos += size
+        ledger.opening_wagered = header['opening_wagered']
+        ledger.seq = header.get('seq', 0)
+        ledger.balances, ledger.wagered, _ = ledger._column_sums()
+        return ledger
@@ -11,32 +11,65 @@ Auteur: Elite AI Team
 Version: 8.0.0
 """
 
+import time
+_STARTUP_T0 = time.perf_counter()
+
+# Arbre des temps d'import du démarrage (rapport startup_report.json)
+from profiler import profiler, import_timer
+import_timer.install()
+
+# Écrans secondaires, exports, import en masse et sync: modules importés à
+# la première utilisation (démarrage à froid plus court)
 import kivy
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen, FadeTransition
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
-from kivy.uix.scrollview import ScrollView
+from kivy.uix.widget import Widget
 from kivy.uix.label import Label
 from kivy.uix.button import Button
-from kivy.uix.textinput import TextInput
-from kivy.uix.popup import Popup
-from kivy.uix.progressbar import ProgressBar
-from kivy.uix.slider import Slider
-from kivy.graphics import Color, RoundedRectangle
+from kivy.graphics import Color, RoundedRectangle, Line
 from kivy.clock import Clock
+from kivy.event import EventDispatcher
+from kivy.properties import NumericProperty, DictProperty, ObjectProperty
+from kivy.logger import Logger
 from kivy.metrics import dp
 from kivy.core.window import Window
 from kivy.utils import get_color_from_hex
 
-import json
 import os
 import random
+import threading
+from collections import deque
 from datetime import datetime
+from types import SimpleNamespace
+
+from frame_monitor import frame_monitor
+from charts import DownsampledSeries, equity_values
+from persistence import (BackgroundCommitter, FileLock, atomic_write, file_stamp, encode_store, read_store,
+                         detect_codec, CODECS)
+from history_index import HistoryIndex, normalize_team
+from aggregates import update_team_stats, rebuild_team_stats, leaderboard, entry_profit
+import rollups
+import risk
+from ledger import Ledger
+from betbook import BetBook
+from journal import Journal, SNAPSHOT_FILES
+from profiles import Profiles
+from provider_cache import ProviderCache
+from archive import Archive, LogView, WINDOW, SEGMENT_SIZE
 
 # Configuration Kivy
 kivy.require('2.2.0')
 
+# Jalons du démarrage (ms depuis le lancement de l'interpréteur sur ce module)
+STARTUP_TIMINGS = {}
+
+def mark_startup(stage):
+    STARTUP_TIMINGS[stage] = round((time.perf_counter() - _STARTUP_T0) * 1000, 1)
+
+mark_startup('imports')
+
 # =============================================================================
 # COULEURS DU THÈME
 # =============================================================================
@@ -57,18 +90,51 @@ COLORS = {
 # GESTIONNAIRE DE DONNÉES
 # =============================================================================
 class DataManager:
-    """Gestionnaire centralisé des données."""
+    """Gestionnaire centralisé des données du profil actif."""
+    
+    def __init__(self, data_dir=None):
+        self.root = self._get_data_dir()
+        self.profiles = Profiles(self.root)
+        self.committer = BackgroundCommitter(
+            dispatch=lambda callback: Clock.schedule_once(lambda dt: callback()),
+            on_written=self._remember)
+        self._open(data_dir or self.profiles.directory(self.profiles.active))
     
-    def __init__(self):
-        self.data_dir = self._get_data_dir()
+    def _open(self, data_dir):
+        """Charge les stores de `data_dir` (dossier d'un profil)."""
+        self.data_dir = data_dir
         self.brain_file = os.path.join(self.data_dir, 'neural_memory.json')
         self.bankroll_file = os.path.join(self.data_dir, 'bankroll.json')
         self.settings_file = os.path.join(self.data_dir, 'settings.json')
-        
+        self.ledger_file = os.path.join(self.data_dir, 'ledger.bin')
+        self.sync_file = os.path.join(self.data_dir, 'sync.json')
+        
+        self._history_index = None
+        self._device = None
+        self._archives = {}
+        self._roll_lock = threading.Lock()
+        self._stamps = {}  # chemin -> (mtime_ns, taille) à la dernière lecture/écriture
+
         self._ensure_data_dir()
-        self.brain = self._load_brain()
-        self.bankroll = self._load_bankroll()
-        self.settings = self._load_settings()
+        # Dossier partageable avec un autre processus (CLI, service): accès sous verrou
+        self.lock = self.committer.lock = FileLock(os.path.join(self.data_dir, '.lock'))
+        with self.lock:
+            self.journal = Journal(os.path.join(self.data_dir, 'journal'))
+            self.brain = self._load_brain()
+            self.bankroll = self._load_bankroll()
+            self.settings = self._load_settings()
+            self.ledger = self._load_ledger()
+            self._recover()
+    
+    def switch_profile(self, slug):
+        """Bascule sur le profil `slug` sans redémarrer; les écritures en cours sont terminées avant."""
+        self.committer.flush()
+        self.journal.close()
+        self.lock.close()
+        self.profiles.activate(slug)
+        self._open(self.profiles.directory(slug))
+        if self.journal.last_checkpoint is None:
+            self.commit_state()  # snapshot de genèse du journal du profil
     
     def _get_data_dir(self):
         try:
@@ -81,8 +147,9 @@ class DataManager:
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
     
-    def _load_brain(self):
-        default = {
+    @staticmethod
+    def default_brain():
+        return {
             'weights': {'Forme': 0.25, 'H2H': 0.20, 'Attaque': 0.15,
                        'Défense': 0.15, 'Domicile': 0.10, 'xG': 0.15},
             'velocity': {},
@@ -90,44 +157,443 @@ class DataManager:
             'total_cycles': 0,
             'accuracy': 0.0
         }
-        return self._load_json(self.brain_file, default)
     
-    def _load_bankroll(self):
-        default = {
+    @staticmethod
+    def default_bankroll():
+        return {
             'initial_balance': 0.0, 'current_balance': 0.0,
             'total_wagered': 0.0, 'total_won': 0.0, 'total_lost': 0.0,
             'transactions': [], 'roi': 0.0, 'win_rate': 0.0, 'total_bets': 0
         }
-        return self._load_json(self.bankroll_file, default)
+    
+    def _load_brain(self):
+        return self._load_json(self.brain_file, self.default_brain())
+    
+    def _load_bankroll(self):
+        return self._load_json(self.bankroll_file, self.default_bankroll())
     
     def _load_settings(self):
         default = {
             'api_key': '', 'learning_rate': 0.05,
-            'kelly_fraction': 0.25, 'notifications': True, 'theme': 'dark'
+            'kelly_fraction': 0.25, 'notifications': True, 'theme': 'dark',
+            'profiling': False, 'frame_monitor': False, 'prewarm_screens': True,
+            'stop_loss_drawdown': 0.0, 'stop_loss_kelly_cap': 0.01,
+            'store_codec': 'json'
         }
         return self._load_json(self.settings_file, default)
     
+    def _load_ledger(self):
+        self._remember(self.ledger_file)
+        try:
+            if os.path.exists(self.ledger_file):
+                with open(self.ledger_file, 'rb') as f:
+                    return Ledger.from_bytes(f.read())
+        except (OSError, ValueError): pass
+        # Premier lancement ou livre illisible: ouverture depuis les totaux actuels
+        ledger = Ledger()
+        ledger.open_from(self.bankroll)
+        return ledger
+    
+    # --- journal d'événements ---------------------------------------------
+    def _recover(self):
+        """Aligne l'état chargé sur le journal.
+        
+        Les trois stores portent le numéro du dernier événement appliqué; s'ils
+        divergent (écriture interrompue, fichier corrompu), l'état repart du
+        dernier snapshot valide. Les événements postérieurs sont ensuite rejoués.
+        """
+        base = self.brain.get('journal_seq', 0)
+        if not self.bankroll.get('journal_seq', 0) == base == self.ledger.seq:
+            state = self._latest_snapshot()
+            if state is not None:
+                Logger.warning(f"Journal: stores incohérents, reprise au snapshot {state.seq}")
+                self.brain, self.bankroll, self.ledger, base = state.brain, state.bankroll, state.ledger, state.seq
+            else:
+                Logger.warning("Journal: stores incohérents et aucun snapshot valide")
+        with profiler.span('journal.replay'):
+            for event in self.journal.events(after=base):
+                apply_event(self, event)
+    
+    @staticmethod
+    def _read_state(brain_file, bankroll_file, ledger_file):
+        """État (brain, bankroll, ledger) lu sur disque, ou None s'il est incohérent ou illisible."""
+        try:
+            brain, bankroll = read_store(brain_file), read_store(bankroll_file)
+            with open(ledger_file, 'rb') as f: ledger = Ledger.from_bytes(f.read())
+        except (OSError, ValueError): return None
+        if not brain.get('journal_seq', 0) == bankroll.get('journal_seq', 0) == ledger.seq: return None
+        return SimpleNamespace(brain=brain, bankroll=bankroll, ledger=ledger, seq=ledger.seq)
+    
+    def _read_snapshot(self, seq):
+        """État du snapshot `seq`, ou None s'il est incomplet ou illisible."""
+        path = self.journal.snapshot_dir(seq)
+        state = self._read_state(*(os.path.join(path, name) for name in SNAPSHOT_FILES))
+        return state if state is not None and state.seq == seq else None
+    
+    def _latest_snapshot(self, until=None):
+        for seq in reversed(self.journal.snapshots()):
+            if until is not None and seq > until: continue
+            state = self._read_snapshot(seq)
+            if state is not None: return state
+        return None
+    
+    def dispatch(self, kind, **data):
+        """Journalise une mutation puis l'applique: seul chemin de modification de l'état."""
+        with self.lock, profiler.span(f'event.{kind}'):
+            self.refresh()
+            event = self.journal.append(kind, data)
+            apply_event(self, event)
+        return event
+    
+    # --- accès concurrents (autre processus sur le même dossier) ------------
+    def _remember(self, filepath):
+        self._stamps[filepath] = file_stamp(filepath)
+    
+    def _changed(self, filepath):
+        """Vrai si le fichier a changé depuis notre dernière lecture/écriture (stat seul)."""
+        stamp = file_stamp(filepath)
+        changed, self._stamps[filepath] = stamp != self._stamps.get(filepath), stamp
+        return changed
+    
+    def refresh(self):
+        """Reprend les écritures d'un autre processus; renvoie True si l'état a changé.
+        
+        Un fichier inchangé (mtime, taille) n'est pas relu. Les réglages sont
+        repris si leur génération est plus récente; l'état journalisé est
+        rechargé depuis les stores s'ils ont changé et sont en avance, puis
+        complété par les événements du journal qui manquent encore.
+        
+        Générations: brain, bankroll et ledger n'ont pas de compteur propre,
+        leur journal_seq en tient lieu (croissant, écrit avec chaque store,
+        comparé à la position du journal). Les fichiers hors journal
+        (export_cursor.json, cache du fournisseur, profiles.json) sont
+        réécrits en entier et de façon atomique: le dernier écrit l'emporte,
+        et une écriture perdue n'y coûte qu'un export complet ou une requête
+        refaite.
+        """
+        with self.lock:
+            changed = False
+            if self._changed(self.settings_file):
+                settings = self._load_json(self.settings_file, {})
+                if settings.get('generation', 0) > self.settings.get('generation', 0):
+                    self.settings, changed = settings, True
+            if not self.journal.refresh() or self.journal.seq <= self.ledger.seq:
+                return changed
+            files = (self.brain_file, self.bankroll_file, self.ledger_file)
+            if any([self._changed(path) for path in files]):
+                state = self._read_state(*files)
+                if state is not None and self.ledger.seq < state.seq <= self.journal.seq:
+                    self.brain, self.bankroll, self.ledger = state.brain, state.bankroll, state.ledger
+            for event in self.journal.events(after=self.ledger.seq):
+                apply_event(self, event)
+            self._history_index = None
+            return True
+    
+    def state_at(self, seq):
+        """Reconstruit l'état (brain, bankroll, ledger) juste après l'événement `seq` (débogage)."""
+        state = self._latest_snapshot(until=seq)
+        if state is None:
+            state = SimpleNamespace(brain=self.default_brain(), bankroll=self.default_bankroll(),
+                                    ledger=Ledger(), seq=0)
+        for event in self.journal.events(after=state.seq, until=seq):
+            apply_event(state, event)
+            state.seq = event['seq']
+        return state
+    
+    def reconcile(self):
+        """Écarts entre les totaux de la bankroll et le grand livre ({} si cohérent)."""
+        with profiler.span('ledger.reconcile'):
+            return self.ledger.reconcile(self.bankroll)
+    
     def _load_json(self, filepath, default):
+        self._remember(filepath)
         try:
             if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return read_store(filepath)
         except: pass
         return default
     
-    def _save_json(self, filepath, data):
+    def _save_json(self, filepath, data, codec='json'):
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with self.lock:
+                atomic_write(filepath, encode_store(data, codec))
+                self._remember(filepath)
             return True
         except: return False
     
-    def save_brain(self): return self._save_json(self.brain_file, self.brain)
-    def save_bankroll(self): return self._save_json(self.bankroll_file, self.bankroll)
-    def save_settings(self): return self._save_json(self.settings_file, self.settings)
-
-# Instance globale
-data_manager = DataManager()
+    @property
+    def codec(self):
+        """Format des stores brain/bankroll ('json', 'zlib' ou 'lzma'); settings reste en JSON."""
+        codec = self.settings.get('store_codec', 'json')
+        return codec if codec in CODECS else 'json'
+    
+    def needs_migration(self):
+        """Vrai si un store sur disque n'est pas encore dans le format configuré."""
+        for path in (self.brain_file, self.bankroll_file):
+            try:
+                with open(path, 'rb') as f:
+                    if detect_codec(f.read(6)) != self.codec: return True
+            except OSError: pass
+        return False
+    
+    def commit(self, names, on_done=None, checkpoint=False):
+        """Sauvegarde asynchrone des stores `names` ('brain', 'bankroll', 'settings').
+        
+        Le contenu est sérialisé immédiatement (instantané cohérent); l'écriture
+        disque se fait sur le thread du committer. `on_done(ok)` est appelé sur
+        le thread UI quand tous les fichiers sont écrits. `checkpoint` force un
+        snapshot du journal.
+        """
+        remaining, results, payloads = [len(names)], [], {}
+        def ack(ok):
+            results.append(ok)
+            remaining[0] -= 1
+            if remaining[0] == 0 and on_done: on_done(all(results))
+        # Un seul lot: un autre processus ne lit jamais des stores de commits différents
+        with self.committer.batch():
+            for name in names:
+                with profiler.span(f'commit.{name}'):
+                    payloads[name] = payload = self._serialize(name)
+                self.committer.submit(getattr(self, f'{name}_file'), payload, ack)
+            # Point de contrôle périodique: mêmes contenus, copiés dans snapshots/<seq>/
+            if set(self.STATE) <= set(payloads) and (checkpoint or self.journal.checkpoint_due()):
+                path = self.journal.begin_checkpoint(self.ledger.seq)
+                for name, filename in zip(self.STATE, SNAPSHOT_FILES):
+                    self.committer.submit(os.path.join(path, filename), payloads[name])
+    
+    STATE = ('brain', 'bankroll', 'ledger')
+    
+    def commit_state(self, on_done=None, checkpoint=False):
+        """Sauvegarde ensemble les trois stores journalisés (numéros de séquence cohérents)."""
+        with self.lock:
+            self.refresh()
+            self._roll_archives()
+            self.commit(list(self.STATE), on_done, checkpoint)
+    
+    # --- synchronisation entre appareils ------------------------------------
+    @property
+    def device(self):
+        """Identifiant de cet appareil (créé au premier appel, dans sync.json)."""
+        if self._device is None:
+            state = self._load_json(self.sync_file, {})
+            if 'device' not in state:
+                import uuid
+                state['device'] = uuid.uuid4().hex[:12]
+                self._save_json(self.sync_file, state)
+            self._device = state['device']
+        return self._device
+    
+    def exchange(self, transport):
+        """Envoie les événements locaux inconnus du transport et renvoie (envoyés, reçus).
+        
+        Entrées/sorties seulement (sûr depuis un thread de fond); les
+        événements reçus sont appliqués ensuite par merge_remote.
+        """
+        import sync
+        device = self.device
+        events = sync.outgoing(self.journal, device, transport.vector().get(device, 0))
+        transport.push(device, events)
+        return len(events), transport.pull(dict(self.brain.get('sync_vector', {})), device)
+    
+    def merge_remote(self, events):
+        """Ajoute au journal les événements d'autres appareils et les applique; renvoie leur nombre.
+        
+        Si certains précèdent des événements déjà journalisés dans l'ordre
+        canonique (horodatage, appareil, n), l'état est reconstruit depuis un
+        snapshot antérieur à la divergence (voir _merge_base) en rejouant
+        l'union triée. Un snapshot est écrit à la suite.
+        """
+        import sync
+        self.committer.flush()  # le snapshot de départ doit être complet sur disque
+        with self.lock:
+            self.refresh()
+            device, vector = self.device, self.brain.get('sync_vector', {})
+            key = lambda e: sync.canonical_key(e, device)
+            fresh = {(e['dev'], e['n']): e for e in events
+                     if e['dev'] != device and e['n'] > vector.get(e['dev'], 0)}
+            if not fresh: return 0
+            incoming = sorted(fresh.values(), key=key)
+            journaled = list(self.journal.events())
+            first = key(incoming[0])
+            later = [e['seq'] for e in journaled if key(e) > first]
+            base = None
+            if later:
+                base = self._merge_base(journaled, key, min(self.brain.get('merged_seq', 0), later[0] - 1))
+            with profiler.span('sync.merge'):
+                appended = [self.journal.append(e['type'], e['data'], ts=e['ts'], origin=(e['dev'], e['n']))
+                            for e in incoming]
+                if base is not None:
+                    state = self.state_at(base)
+                    replay = [e for e in journaled if e['seq'] > base] + appended
+                    for event in sorted(replay, key=key):
+                        apply_event(state, event)
+                    state.brain['journal_seq'] = state.bankroll['journal_seq'] = state.ledger.seq = self.journal.seq
+                    self.brain, self.bankroll, self.ledger = state.brain, state.bankroll, state.ledger
+                    self._history_index = None
+                else:
+                    for event in appended:
+                        apply_event(self, event)
+            self.commit_state(checkpoint=True)
+        return len(appended)
+    
+    def _merge_base(self, journaled, key, limit):
+        """Snapshot de départ d'une reconstruction: le plus récent <= `limit` dont tous les
+        événements précèdent (ordre canonique) ceux journalisés après lui; sinon la genèse (0).
+        
+        Un appareil en retard peut avoir fait journaliser, après un snapshot,
+        des événements qui le précèdent: ce snapshot ne peut pas servir de base.
+        """
+        keys = [key(e) for e in journaled]
+        after = [None] * (len(keys) + 1)  # plus petite clé des événements suivants
+        for i in range(len(keys) - 1, -1, -1):
+            after[i] = keys[i] if after[i + 1] is None else min(keys[i], after[i + 1])
+        seqs, before, i = [e['seq'] for e in journaled], None, 0
+        valid = {0}
+        for snap in self.journal.snapshots():
+            if snap > limit: break
+            while i < len(seqs) and seqs[i] <= snap:
+                before = keys[i] if before is None else max(before, keys[i])
+                i += 1
+            if before is None or after[i] is None or before < after[i]: valid.add(snap)
+        return max(valid)
+    
+    def sync_with(self, transport):
+        """Synchronisation complète (envoi, réception, fusion); renvoie (envoyés, reçus)."""
+        sent, events = self.exchange(transport)
+        return sent, self.merge_remote(events)
+    
+    # --- archives (historique borné en mémoire) ---------------------------
+    def archive(self, kind):
+        """Archive de `kind` pour l'époque courante (une nouvelle par réinitialisation)."""
+        key = (self.brain.get('epoch', 0), kind)
+        if key not in self._archives:
+            self._archives[key] = Archive(os.path.join(self.data_dir, 'archive', str(key[0])), kind)
+        return self._archives[key]
+    
+    def _store(self, kind):
+        return self.bankroll if kind == 'transactions' else self.brain
+    
+    def _roll_archives(self):
+        """Archive les entrées les plus anciennes au-delà de la fenêtre résidente.
+        
+        Appelé avant la sérialisation: chaque segment est écrit (synchrone)
+        avant le store qui ne contient plus ses entrées.
+        """
+        for kind in ('history', 'transactions'):
+            store = self._store(kind)
+            entries = store[kind]
+            if len(entries) < WINDOW + SEGMENT_SIZE: continue
+            # Agrégats à vie initialisés tant que tout l'historique est en mémoire
+            LearningEngine.ensure_aggregates(self.brain, self.bankroll)
+            with profiler.span(f'archive.{kind}'):
+                while len(entries) >= WINDOW + SEGMENT_SIZE:
+                    offset = store.get(f'{kind}_offset', 0)
+                    self.archive(kind).write(offset, entries[:SEGMENT_SIZE])
+                    with self._roll_lock:
+                        del entries[:SEGMENT_SIZE]
+                        store[f'{kind}_offset'] = offset + SEGMENT_SIZE
+    
+    def log(self, kind):
+        """Vue complète de `kind` (archives + fenêtre résidente), lignes globales."""
+        with self._roll_lock:
+            store = self._store(kind)
+            return LogView(self.archive(kind), store[kind], store.get(f'{kind}_offset', 0))
+    
+    def _serialize(self, name):
+        if name == 'ledger': return self.ledger.to_bytes()
+        if name == 'settings': self._bump_settings()
+        return encode_store(getattr(self, name), 'json' if name == 'settings' else self.codec)
+    
+    def history_count(self, kind, rows=None):
+        """Nombre d'entrées de `kind` ('transactions' ou 'history'), ou de `rows` si filtré."""
+        if rows is not None: return len(rows)
+        store = self._store(kind)
+        return store.get(f'{kind}_offset', 0) + len(store[kind])
+    
+    def history_page(self, kind, offset, limit, rows=None):
+        """Page d'entrées, de la plus récente (offset 0) à la plus ancienne.
+        
+        `rows` restreint la pagination à une liste de lignes (résultat de search_history).
+        """
+        entries = self.log(kind)
+        if rows is not None:
+            return [entries[r] for r in rows[offset:offset + limit]]
+        end = max(len(entries) - offset, 0)
+        return list(entries[max(end - limit, 0):end])[::-1]
+    
+    @property
+    def bets(self):
+        """Carnet des paris ouverts (vue sur bankroll['open_bets'])."""
+        return BetBook(self.bankroll)
+    
+    @property
+    def history_index(self):
+        """Index équipe/date de la fenêtre résidente de brain['history'], mis à jour à la demande."""
+        if self._history_index is None:
+            self._history_index = HistoryIndex()
+        self._history_index.sync(self.brain['history'], self.brain.get('history_offset', 0))
+        return self._history_index
+    
+    def search_history(self, team=None, period=None, result=None):
+        """Lignes (globales) de l'historique filtrées par équipe, période ISO et résultat.
+        
+        La fenêtre résidente passe par l'index; les archives sont parcourues
+        ensuite, segment par segment, après filtrage sur leur résumé.
+        """
+        with profiler.span('history.search'):
+            base, index, archive = self.brain.get('history_offset', 0), self.history_index, self.archive('history')
+            key = normalize_team(team) if team else ''
+            exact = bool(key) and (key in index.by_team or key in archive.teams(base))
+            rows = index.search(team, period, exact)
+            if result:
+                history = self.brain['history']
+                rows = [r for r in rows if history[r - base]['result'] == result]
+            rows += archive.search(base, team, period, result, exact)
+        return rows
+    
+    def export_data(self, fmt='csv', full=False):
+        """Exporte historique, transactions et facteurs dans data_dir/exports.
+        
+        Incrémental par défaut (curseur par source); sûr depuis un thread de
+        fond tant que les listes ne font que grandir.
+        """
+        import exporters
+        exporter = exporters.Exporter(os.path.join(self.data_dir, 'exports'))
+        factors, epoch = list(self.brain['weights']), self.brain.get('epoch', 0)
+        history = self.log('history')
+        jobs = [
+            ('history', history, exporters.history_row, exporters.HISTORY_COLUMNS),
+            ('transactions', self.log('transactions'), exporters.transaction_row,
+             exporters.TRANSACTION_COLUMNS),
+            ('features', history, exporters.feature_row_builder(factors),
+             exporters.feature_columns(factors)),
+        ]
+        results = {}
+        for source, rows, build_row, columns in jobs:
+            with profiler.span(f'export.{source}.{fmt}'):
+                results[source] = exporter.export(source, rows, build_row, columns, fmt, full, epoch)
+        return results
+    
+    @profiler.timed('save.brain')
+    def save_brain(self): return self._save_json(self.brain_file, self.brain, self.codec)
+    @profiler.timed('save.bankroll')
+    def save_bankroll(self): return self._save_json(self.bankroll_file, self.bankroll, self.codec)
+    @profiler.timed('save.settings')
+    def save_settings(self):
+        self._bump_settings()
+        return self._save_json(self.settings_file, self.settings)
+    
+    def _bump_settings(self):
+        """Génération des réglages: la copie la plus récente l'emporte entre processus."""
+        self.settings['generation'] = self.settings.get('generation', 0) + 1
+    @profiler.timed('save.ledger')
+    def save_ledger(self):
+        try:
+            with self.lock:
+                atomic_write(self.ledger_file, self.ledger.to_bytes())
+                self._remember(self.ledger_file)
+            return True
+        except OSError: return False
 
 # =============================================================================
 # MOTEUR DE PRÉDICTION
@@ -136,27 +602,29 @@ class PredictionEngine:
     """Moteur de calcul des prédictions."""
     
     @staticmethod
+    def _mock_team(role):
+        if role == 'home':
+            return {'form_score': random.uniform(0.4, 0.85), 'goals_scored': random.randint(20, 60),
+                    'goals_conceded': random.randint(15, 40), 'xg': random.uniform(1.2, 2.5)}
+        return {'form_score': random.uniform(0.3, 0.75), 'goals_scored': random.randint(15, 50),
+                'goals_conceded': random.randint(18, 45), 'xg': random.uniform(1.0, 2.0)}
+    
+    @staticmethod
+    @profiler.timed('data.fetch')
     def get_mock_data(home, away):
+        """Données du match; équipes et confrontations passent par le cache partagé."""
+        fetch = PredictionEngine._mock_team
         return {
-            'home': {
-                'name': home, 'form_score': random.uniform(0.4, 0.85),
-                'goals_scored': random.randint(20, 60),
-                'goals_conceded': random.randint(15, 40),
-                'xg': random.uniform(1.2, 2.5)
-            },
-            'away': {
-                'name': away, 'form_score': random.uniform(0.3, 0.75),
-                'goals_scored': random.randint(15, 50),
-                'goals_conceded': random.randint(18, 45),
-                'xg': random.uniform(1.0, 2.0)
-            },
-            'h2h': {
+            'home': dict(provider_cache.team(home, 'home', fetch), name=home),
+            'away': dict(provider_cache.team(away, 'away', fetch), name=away),
+            'h2h': provider_cache.h2h(home, away, lambda: {
                 'total': random.randint(5, 20),
                 'home_wins': random.randint(2, 10)
-            }
+            })
         }
     
     @staticmethod
+    @profiler.timed('engine.calculate_probability')
     def calculate_probability(match_data, weights):
         home = match_data['home']
         away = match_data['away']
@@ -189,10 +657,14 @@ class PredictionEngine:
 # =============================================================================
 # MOTEUR D'APPRENTISSAGE
 # =============================================================================
+def _epoch(iso):
+    return datetime.fromisoformat(iso).timestamp()
+
 class LearningEngine:
     @staticmethod
-    def update_weights(brain, success, factors):
-        lr = data_manager.settings.get('learning_rate', 0.05)
+    @profiler.timed('learning.update_weights')
+    def update_weights(brain, success, factors, lr=None):
+        lr = lr or data_manager.settings.get('learning_rate', 0.05)
         momentum = 0.9
         
         new_weights = brain['weights'].copy()
@@ -211,6 +683,215 @@ class LearningEngine:
             new_weights = {k: round(v / total, 4) for k, v in new_weights.items()}
         
         return new_weights, new_velocity
+    
+    @staticmethod
+    def place(bankroll, pred, ledger=None, placed_at=None):
+        """Ajoute un pronostic au carnet des paris ouverts et débite sa mise."""
+        bet = BetBook(bankroll).add(pred, placed_at)
+        if bet['stake'] > 0:
+            bankroll['current_balance'] -= bet['stake']
+            bankroll['total_wagered'] += bet['stake']
+            if ledger is not None: ledger.wager(bet['stake'], _epoch(bet['placed_at']))
+        return bet
+    
+    @staticmethod
+    def settle_batch(brain, bankroll, outcomes, ledger=None, lr=None, settled_at=None):
+        """Règle en mémoire tous les paris ouverts de `outcomes` ({bet_id: succès})."""
+        # Avant take(): l'equity initiale doit compter toutes les mises encore ouvertes
+        LearningEngine.ensure_aggregates(brain, bankroll)
+        taken = BetBook(bankroll).take(outcomes)
+        for bet, success in taken:
+            LearningEngine.settle(brain, bankroll, bet, success, ledger, lr=lr, settled_at=settled_at)
+        return taken
+    
+    @staticmethod
+    def import_bets(brain, bankroll, bets, ledger=None, learn=False, lr=None):
+        """Règle en mémoire des paris historiques validés (bulk_import.validate), dans l'ordre.
+        
+        Avec `learn`, chaque pari est rejoué dans update_weights chronologiquement.
+        """
+        for bet in bets:
+            LearningEngine.settle(brain, bankroll, bet, bet['success'], ledger,
+                                  learn=learn, lr=lr, settled_at=bet['timestamp'])
+        return len(bets)
+    
+    @staticmethod
+    def ensure_aggregates(brain, bankroll):
+        """Compteurs incrémentaux, initialisés une fois depuis l'historique existant."""
+        history, transactions = brain['history'], bankroll['transactions']
+        if 'team_stats' not in brain:
+            brain['team_stats'] = rebuild_team_stats(history)
+        if 'rollups' not in bankroll:
+            bankroll['rollups'] = rollups.rebuild(history)
+        if 'wins' not in brain:
+            brain['wins'] = sum(1 for h in history if h['result'] == 'win')
+        if 'wins' not in bankroll:
+            bankroll['wins'] = sum(1 for tx in transactions if tx['type'] == 'win')
+            bankroll['losses'] = sum(1 for tx in transactions if tx['type'] == 'loss')
+        if 'risk' not in bankroll:
+            # Equity = solde + mises ouvertes (carnet complet, avant tout retrait par un règlement)
+            bankroll['risk'] = risk.rebuild(history, bankroll['current_balance'] + BetBook(bankroll).exposure())
+    
+    @staticmethod
+    def settle(brain, bankroll, pred, success, ledger=None, learn=True, lr=None, settled_at=None):
+        """Applique en mémoire le résultat d'un pronostic (poids, historique, bankroll, livre).
+        
+        Un pari du carnet ('placed_at') a déjà sa mise débitée; sinon la mise
+        est engagée et réglée dans la foulée. `learn=False` laisse les poids
+        inchangés; `lr` et `settled_at` rendent le rejeu du journal déterministe.
+        """
+        if learn:
+            factors = pred['factors'] or brain['weights']
+            brain['weights'], brain['velocity'] = LearningEngine.update_weights(brain, success, factors.keys(), lr)
+        new_w = brain['weights']
+        brain['total_cycles'] += 1
+        now = settled_at or datetime.now().isoformat()
+        entry = {'match': f"{pred['home']} vs {pred['away']}",
+                 'home_id': normalize_team(pred['home']), 'away_id': normalize_team(pred['away']),
+                 'result': 'win' if success else 'loss', 'timestamp': pred['timestamp'],
+                 'settled_at': now, 'stake': round(pred['stake'], 2), 'odds': pred['odds'],
+                 'ev': pred.get('ev', 0.0), 'factors': pred['factors'], 'weights': new_w}
+        LearningEngine.ensure_aggregates(brain, bankroll)
+        brain['history'].append(entry)
+        update_team_stats(brain['team_stats'], entry)
+        rollups.record(bankroll['rollups'], now, max(entry['stake'], 0), entry_profit(entry), success)
+        brain['wins'] += 1 if success else 0
+        brain['accuracy'] = brain['wins'] / (brain.get('history_offset', 0) + len(brain['history']))
+        
+        stake, profit = entry['stake'], entry_profit(entry)
+        if stake <= 0: return
+        bankroll['total_bets'] += 1
+        if 'placed_at' not in pred:
+            bankroll['current_balance'] -= stake
+            bankroll['total_wagered'] += stake
+            if ledger is not None: ledger.wager(stake, _epoch(now))
+        if ledger is not None: ledger.settle(stake, profit, success, _epoch(now))
+        if success:
+            bankroll['current_balance'] += stake + profit
+            bankroll['total_won'] += profit
+            bankroll['wins'] += 1
+            bankroll['transactions'].append({'type': 'win', 'amount': stake + profit, 'timestamp': now,
+                                             'balance': bankroll['current_balance']})
+        else:
+            bankroll['total_lost'] += stake
+            bankroll['losses'] += 1
+            bankroll['transactions'].append({'type': 'loss', 'amount': -stake, 'timestamp': now,
+                                             'balance': bankroll['current_balance']})
+        
+        if bankroll['total_wagered'] > 0:
+            bankroll['roi'] = (bankroll['total_won'] - bankroll['total_lost']) / bankroll['total_wagered'] * 100
+        bankroll['win_rate'] = bankroll['wins'] / (bankroll['wins'] + bankroll['losses']) * 100
+        risk.record(bankroll['risk'], stake, profit, success)
+
+def apply_event(state, event):
+    """Réducteur unique des événements du journal, en direct comme au rejeu.
+    
+    `state` porte brain, bankroll et ledger (data_manager ou état reconstruit);
+    chaque store est ensuite marqué du numéro de séquence de l'événement.
+    """
+    kind, data, ts = event['type'], event['data'], event['ts']
+    brain, bankroll, ledger = state.brain, state.bankroll, state.ledger
+    if kind in ('deposit', 'withdrawal'):
+        amount = data['amount'] if kind == 'deposit' else -data['amount']
+        bankroll['current_balance'] += amount
+        if kind == 'deposit': ledger.deposit(amount, _epoch(ts))
+        else: ledger.withdraw(-amount, _epoch(ts))
+        if 'risk' in bankroll: risk.shift(bankroll['risk'], amount)
+        if kind == 'deposit' and bankroll['initial_balance'] == 0:
+            bankroll['initial_balance'] = amount
+        bankroll['transactions'].append({'type': kind, 'amount': amount, 'timestamp': ts,
+                                         'balance': bankroll['current_balance']})
+    elif kind == 'place':
+        LearningEngine.place(bankroll, data['pred'], ledger, placed_at=ts)
+    elif kind == 'settle':
+        # Paris désignés par leur date de placement quand elle est connue: les numéros
+        # diffèrent d'un appareil à l'autre après une synchronisation
+        refs = data.get('refs') or {}
+        ids = {bet['placed_at']: bet['id'] for bet in bankroll.get('open_bets', [])} if refs else {}
+        outcomes = {ids.get(refs.get(bet_id), int(bet_id)): success for bet_id, success in data['outcomes'].items()}
+        LearningEngine.settle_batch(brain, bankroll, outcomes, ledger, lr=data.get('lr'), settled_at=ts)
+    elif kind == 'import':
+        LearningEngine.import_bets(brain, bankroll, data['bets'], ledger, data.get('learn', False), data.get('lr'))
+    elif kind == 'reset':
+        # Nouvelle époque: les archives de l'ancienne restent intactes (state_at)
+        epoch = brain.get('epoch', 0) + 1
+        state.brain, state.bankroll, state.ledger = DataManager.default_brain(), DataManager.default_bankroll(), Ledger()
+        state.brain['epoch'] = state.bankroll['epoch'] = epoch
+        for key in ('sync_vector', 'merged_seq'):
+            if key in brain: state.brain[key] = brain[key]
+    if 'dev' in event:
+        # Événement reçu d'un autre appareil: vecteur de synchronisation (rejoué avec l'état)
+        vector = state.brain.setdefault('sync_vector', {})
+        vector[event['dev']] = max(vector.get(event['dev'], 0), event['n'])
+        state.brain['merged_seq'] = max(state.brain.get('merged_seq', 0), event['seq'])
+    state.brain['journal_seq'] = state.bankroll['journal_seq'] = state.ledger.seq = event['seq']
+
+# Instances globales (après le réducteur: le chargement peut rejouer le journal)
+data_manager = DataManager()
+# Cache du fournisseur partagé par tous les profils: changer de profil ne refait pas les requêtes
+provider_cache = ProviderCache(os.path.join(data_manager.root, 'shared', 'provider_cache.json'))
+if data_manager.settings.get('profiling'): profiler.enable()
+mark_startup('data_loaded')
+
+# =============================================================================
+# ÉTAT RÉACTIF
+# =============================================================================
+class AppState(EventDispatcher):
+    """Vue observable de data_manager.bankroll / brain.
+    
+    Les propriétés Kivy ne notifient que lorsque la valeur change: seuls les
+    widgets liés à une valeur modifiée sont mis à jour.
+    """
+    balance = NumericProperty(0.0)
+    profit = NumericProperty(0.0)
+    roi = NumericProperty(0.0)
+    win_rate = NumericProperty(0.0)
+    total_bets = NumericProperty(0)
+    total_wagered = NumericProperty(0.0)
+    total_won = NumericProperty(0.0)
+    accuracy = NumericProperty(0.0)
+    total_cycles = NumericProperty(0)
+    tx_count = NumericProperty(0)
+    open_bets = NumericProperty(0)
+    exposure = NumericProperty(0.0)
+    weights = DictProperty({})
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.refresh()
+    
+    def refresh(self):
+        """Resynchronise les propriétés après une mutation des données."""
+        bankroll, brain = data_manager.bankroll, data_manager.brain
+        self.balance = bankroll['current_balance']
+        self.profit = bankroll['current_balance'] - bankroll['initial_balance']
+        self.roi = bankroll['roi']
+        self.win_rate = bankroll['win_rate']
+        self.total_bets = bankroll['total_bets']
+        self.total_wagered = bankroll['total_wagered']
+        self.total_won = bankroll['total_won']
+        self.accuracy = brain['accuracy']
+        self.total_cycles = brain['total_cycles']
+        self.tx_count = bankroll.get('transactions_offset', 0) + len(bankroll['transactions'])
+        book = BetBook(bankroll)
+        self.open_bets = len(book)
+        self.exposure = book.exposure()
+        self.weights = dict(brain['weights'])
+    
+    def watch(self, owner, **handlers):
+        """bind() rattaché au widget `owner`: release() retire ces liaisons avec lui."""
+        uids = owner.__dict__.setdefault('_state_uids', [])
+        for name, handler in handlers.items():
+            uids.append((name, self.fbind(name, handler)))
+    
+    def release(self, widget):
+        """Retire les liaisons de `widget` et de ses descendants (écran retiré)."""
+        for child in widget.walk(restrict=True):
+            for name, uid in child.__dict__.pop('_state_uids', ()):
+                self.unbind_uid(name, uid)
+
+# Instance globale
+app_state = AppState()
 
 # =============================================================================
 # COMPOSANT UI: CARTE MÉTRIQUE
@@ -228,19 +909,119 @@ class MetricCard(BoxLayout):
             Color(*get_color_from_hex(COLORS['darker']))
             self.rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[dp(10)])
         
-        self.add_widget(Label(text=title, font_size=dp(12),
-                             color=get_color_from_hex(COLORS['gray']), size_hint_y=0.3))
-        self.add_widget(Label(text=str(value), font_size=dp(24), bold=True,
-                             color=get_color_from_hex(COLORS['light']), size_hint_y=0.5))
+        self.title_label = Label(text=title, font_size=dp(12),
+                                 color=get_color_from_hex(COLORS['gray']), size_hint_y=0.3)
+        self.add_widget(self.title_label)
+        self.value_label = Label(text=str(value), font_size=dp(24), bold=True,
+                                 color=get_color_from_hex(COLORS['light']), size_hint_y=0.5)
+        self.add_widget(self.value_label)
+        self.delta_label = None
         if delta:
-            delta_color = COLORS['success'] if '+' in delta or 'VALUE' in delta else COLORS['danger']
-            self.add_widget(Label(text=delta, font_size=dp(10),
-                                 color=get_color_from_hex(delta_color), size_hint_y=0.2))
+            self.delta_label = Label(text=delta, font_size=dp(10),
+                                     color=get_color_from_hex(self._delta_color(delta)), size_hint_y=0.2)
+            self.add_widget(self.delta_label)
+    
+    @staticmethod
+    def _delta_color(delta):
+        return COLORS['success'] if '+' in delta or 'VALUE' in delta else COLORS['danger']
+    
+    def set_value(self, value, delta=None):
+        self.value_label.text = str(value)
+        if delta is None: return
+        if self.delta_label is None:
+            self.delta_label = Label(font_size=dp(10), size_hint_y=0.2)
+            self.add_widget(self.delta_label)
+        self.delta_label.text = delta
+        self.delta_label.color = get_color_from_hex(self._delta_color(delta))
+    
+    def follow(self, prop, fmt, delta_fmt=None):
+        """Met à jour la carte à chaque changement de `app_state.<prop>`."""
+        def update(instance, value):
+            self.set_value(fmt(value), delta_fmt(instance) if delta_fmt else None)
+        app_state.watch(self, **{prop: update})
+        return self
     
     def on_size(self, *args):
         if hasattr(self, 'rect'):
             self.rect.pos, self.rect.size = self.pos, self.size
 
+# =============================================================================
+# COMPOSANT UI: GRAPHIQUE LINÉAIRE
+# =============================================================================
+class LineChart(Widget):
+    """Graphique multi-séries: une seule instruction Line par série."""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.series = {}
+        self.bind(pos=self.redraw, size=self.redraw)
+    
+    def add_series(self, name, color):
+        with self.canvas:
+            Color(*get_color_from_hex(color))
+            line = Line(points=[], width=dp(1.2))
+        # Résolution initiale large, réduite à la largeur réelle au premier redraw
+        data = DownsampledSeries(1024)
+        self.series[name] = (data, line)
+        return data
+    
+    def clear_series(self):
+        self.canvas.clear()
+        self.series = {}
+    
+    def redraw(self, *args):
+        if not self.series: return
+        width = max(int(self.width), 2)
+        for data, _ in self.series.values():
+            if data.width != width: data.set_width(width)
+        bounds = [data.bounds() for data, _ in self.series.values() if data.count]
+        if not bounds: return
+        lo, hi = min(b[0] for b in bounds), max(b[1] for b in bounds)
+        span = (hi - lo) or 1.0
+        n = max(max(data.count for data, _ in self.series.values()) - 1, 1)
+        x0, y0, w, h = self.x, self.y, self.width, self.height
+        for data, line in self.series.values():
+            points = []
+            for i, v in data.points():
+                points += [x0 + i / n * w, y0 + (v - lo) / span * h]
+            line.points = points
+
+# =============================================================================
+# COMPOSANTS UI: LIGNE DE FACTEUR ET POOL DE WIDGETS
+# =============================================================================
+class FactorRow(BoxLayout):
+    def __init__(self, **kwargs):
+        from kivy.uix.progressbar import ProgressBar
+        super().__init__(spacing=dp(5), **kwargs)
+        self.name_label = Label(font_size=dp(12), color=get_color_from_hex(COLORS['text']), size_hint_x=0.3)
+        self.bar = ProgressBar(max=100, size_hint_x=0.7)
+        self.add_widget(self.name_label)
+        self.add_widget(self.bar)
+    
+    def update(self, factor, value):
+        self.name_label.text = factor
+        self.bar.value = abs(value) * 100
+
+class WidgetPool:
+    """Réserve de widgets réutilisables: acquire() ne crée que si la réserve est vide."""
+    
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+        self.created = 0
+    
+    def acquire(self):
+        if self.free: return self.free.pop()
+        self.created += 1
+        return self.factory()
+    
+    def release(self, widget):
+        if widget.parent: widget.parent.remove_widget(widget)
+        self.free.append(widget)
+
+metric_card_pool = WidgetPool(MetricCard)
+factor_row_pool = WidgetPool(FactorRow)
+
 # =============================================================================
 # ÉCRAN ACCUEIL
 # =============================================================================
@@ -257,21 +1038,30 @@ class HomeScreen(Screen):
         header = BoxLayout(size_hint_y=0.15)
         header.add_widget(Label(text='🛡️ ELITE NEURAL', font_size=dp(28), bold=True,
                                color=get_color_from_hex(COLORS['primary'])))
+        self.profile_btn = Button(text=self._profile_text(), font_size=dp(14), size_hint_x=0.35,
+                                 background_normal='', background_color=get_color_from_hex(COLORS['darker']))
+        self.profile_btn.bind(on_press=self._choose_profile)
+        header.add_widget(self.profile_btn)
         layout.add_widget(header)
         
         # Stats
         stats = GridLayout(cols=2, spacing=dp(10), size_hint_y=0.25)
         bankroll, brain = data_manager.bankroll, data_manager.brain
-        stats.add_widget(MetricCard('💰 Bankroll', f"{bankroll['current_balance']:.2f}€"))
-        stats.add_widget(MetricCard('🎯 Précision', f"{brain['accuracy']*100:.1f}%"))
-        stats.add_widget(MetricCard('📈 ROI', f"{bankroll['roi']:.1f}%"))
-        stats.add_widget(MetricCard('🎰 Paris', str(bankroll['total_bets'])))
+        stats.add_widget(MetricCard('💰 Bankroll', f"{bankroll['current_balance']:.2f}€")
+                         .follow('balance', lambda v: f"{v:.2f}€"))
+        stats.add_widget(MetricCard('🎯 Précision', f"{brain['accuracy']*100:.1f}%")
+                         .follow('accuracy', lambda v: f"{v*100:.1f}%"))
+        stats.add_widget(MetricCard('📈 ROI', f"{bankroll['roi']:.1f}%")
+                         .follow('roi', lambda v: f"{v:.1f}%"))
+        stats.add_widget(MetricCard('🎰 Paris', str(bankroll['total_bets']))
+                         .follow('total_bets', str))
         layout.add_widget(stats)
         
         # Boutons
         buttons = BoxLayout(orientation='vertical', spacing=dp(15), size_hint_y=0.4)
         for text, screen, color in [
             ('🔍 Nouvelle Analyse', 'scanner', COLORS['primary']),
+            ('🎟️ Paris ouverts', 'learning', COLORS['accent']),
             ('💰 Gérer Bankroll', 'bankroll', COLORS['secondary']),
             ('📊 Statistiques', 'stats', COLORS['accent']),
             ('⚙️ Paramètres', 'settings', COLORS['gray'])
@@ -287,12 +1077,48 @@ class HomeScreen(Screen):
                                font_size=dp(12), color=get_color_from_hex(COLORS['gray']), size_hint_y=0.1))
         
         self.add_widget(layout)
+    
+    @staticmethod
+    def _profile_text():
+        profiles = data_manager.profiles
+        return f'👤 {profiles.label(profiles.active)}'
+    
+    def _choose_profile(self, instance):
+        from kivy.uix.textinput import TextInput
+        from kivy.uix.popup import Popup
+        box = BoxLayout(orientation='vertical', spacing=dp(8), padding=dp(8))
+        popup = Popup(title='👤 Profils', content=box, size_hint=(0.8, 0.6))
+        active = data_manager.profiles.active
+        for slug, label in data_manager.profiles.names():
+            btn = Button(text=('✓ ' if slug == active else '') + label, font_size=dp(14), background_normal='',
+                        background_color=get_color_from_hex(COLORS['primary' if slug == active else 'darker']))
+            btn.bind(on_press=lambda x, s=slug: (popup.dismiss(), self._switch_profile(s)))
+            box.add_widget(btn)
+        row = BoxLayout(spacing=dp(8), size_hint_y=None, height=dp(45))
+        name_input = TextInput(hint_text='Nouveau profil (ligue, stratégie...)', multiline=False, font_size=dp(14))
+        create = Button(text='➕ Créer', font_size=dp(14), size_hint_x=0.35, background_normal='',
+                       background_color=get_color_from_hex(COLORS['accent']))
+        create.bind(on_press=lambda x: name_input.text.strip() and (
+            popup.dismiss(), self._switch_profile(data_manager.profiles.create(name_input.text))))
+        row.add_widget(name_input)
+        row.add_widget(create)
+        box.add_widget(row)
+        popup.open()
+    
+    def _switch_profile(self, slug):
+        """Change de profil sans redémarrer: stores rechargés, autres écrans reconstruits à la demande."""
+        if slug == data_manager.profiles.active: return
+        data_manager.switch_profile(slug)
+        self.manager.reset_screens()  # avant refresh(): les écrans oubliés ne sont plus notifiés
+        app_state.refresh()
+        self.profile_btn.text = self._profile_text()
 
 # =============================================================================
 # ÉCRAN SCANNER
 # =============================================================================
 class ScannerScreen(Screen):
     def __init__(self, **kwargs):
+        from kivy.uix.textinput import TextInput
         super().__init__(**kwargs)
         self.current_prediction = None
         layout = BoxLayout(orientation='vertical', padding=dp(15), spacing=dp(10))
@@ -339,12 +1165,64 @@ class ScannerScreen(Screen):
         
         # Résultats
         self.results = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=0.5)
-        self.results.add_widget(Label(text='Lancez une analyse...', font_size=dp(14),
-                                     color=get_color_from_hex(COLORS['gray'])))
+        self.placeholder = Label(text='Lancez une analyse...', font_size=dp(14),
+                                 color=get_color_from_hex(COLORS['gray']))
+        self.results.add_widget(self.placeholder)
+        self.results_panel = None
         layout.add_widget(self.results)
         
         self.add_widget(layout)
     
+    def _build_results_panel(self):
+        """Panneau de résultats construit une seule fois puis mis à jour sur place."""
+        panel = BoxLayout(orientation='vertical', spacing=dp(10))
+        
+        # Métriques
+        metrics = GridLayout(cols=2, spacing=dp(8), size_hint_y=0.4)
+        self.metric_cards = [metric_card_pool.acquire() for _ in range(4)]
+        for card, title in zip(self.metric_cards, ['📊 Probabilité', '💰 EV', '🎯 Mise Kelly', '📈 Confiance']):
+            card.title_label.text = title
+            metrics.add_widget(card)
+        panel.add_widget(metrics)
+        
+        # Facteurs
+        panel.add_widget(Label(text='─── Facteurs ───', font_size=dp(14),
+                              color=get_color_from_hex(COLORS['gray']), size_hint_y=0.1))
+        self.factors_box = BoxLayout(orientation='vertical', spacing=dp(5), size_hint_y=0.35)
+        self.factor_rows = []
+        panel.add_widget(self.factors_box)
+        
+        # Signal
+        self.signal_label = Label(font_size=dp(16), bold=True, size_hint_y=0.15)
+        panel.add_widget(self.signal_label)
+        
+        # Placement du pari
+        self.place_btn = Button(text='📌 Placer le pari', font_size=dp(14),
+                               background_normal='', background_color=get_color_from_hex(COLORS['secondary']))
+        self.place_btn.bind(on_press=self.place_bet)
+        panel.add_widget(self.place_btn)
+        return panel
+    
+    def release_pooled(self):
+        """Rend aux pools les cartes et lignes empruntées (écran oublié par reset_screens)."""
+        if self.results_panel is None: return
+        for card in self.metric_cards: metric_card_pool.release(card)
+        for row in self.factor_rows: factor_row_pool.release(row)
+        self.metric_cards, self.factor_rows, self.results_panel = [], [], None
+    
+    @frame_monitor.track('scanner.place_bet')
+    def place_bet(self, instance):
+        """Ajoute le pronostic affiché au carnet; l'analyse suivante ne l'écrase plus."""
+        pred = self.current_prediction
+        if not pred: return
+        self.current_prediction = None
+        data_manager.dispatch('place', pred={k: v for k, v in pred.items() if k != 'match_data'})
+        data_manager.commit_state()
+        bet = data_manager.bets.bets[-1]
+        app_state.refresh()
+        self.place_btn.text, self.place_btn.disabled = f"✅ Pari #{bet['id']} placé", True
+    
+    @frame_monitor.track('scanner.analyze')
     def analyze(self, instance):
         home, away = self.home_input.text.strip(), self.away_input.text.strip()
         if len(home) < 2 or len(away) < 2: return
@@ -355,66 +1233,75 @@ class ScannerScreen(Screen):
         self.analyze_btn.text, self.analyze_btn.disabled = '⏳ Analyse...', True
         Clock.schedule_once(lambda dt: self._perform_analysis(home, away, odds), 1.5)
     
+    @frame_monitor.track('scanner.perform_analysis')
     def _perform_analysis(self, home, away, odds):
         match_data = PredictionEngine.get_mock_data(home, away)
+        if provider_cache.dirty:
+            data_manager.committer.submit(provider_cache.path, provider_cache.serialize())
         brain = data_manager.brain
         prob, factors = PredictionEngine.calculate_probability(match_data, brain['weights'])
         ev = PredictionEngine.calculate_ev(prob, odds)
-        kelly = PredictionEngine.calculate_kelly(prob, odds, data_manager.settings.get('kelly_fraction', 0.25))
+        settings = data_manager.settings
+        kelly = PredictionEngine.calculate_kelly(prob, odds, settings.get('kelly_fraction', 0.25))
+        kelly, capped = risk.cap_kelly(kelly, data_manager.bankroll.get('risk'),
+                                       settings.get('stop_loss_drawdown', 0.0),
+                                       settings.get('stop_loss_kelly_cap', 0.01))
         stake = kelly * data_manager.bankroll['current_balance']
         
         self.current_prediction = {
             'home': home, 'away': away, 'odds': odds, 'probability': prob,
-            'ev': ev, 'kelly': kelly, 'stake': stake, 'factors': factors, 'match_data': match_data,
+            'ev': ev, 'kelly': kelly, 'kelly_capped': capped, 'stake': stake,
+            'factors': factors, 'match_data': match_data,
             'timestamp': datetime.now().isoformat()
         }
         
         self._show_results()
         self.analyze_btn.text, self.analyze_btn.disabled = '🚀 LANCER L\'ANALYSE', False
     
+    @frame_monitor.track('scanner.show_results')
     def _show_results(self):
-        self.results.clear_widgets()
+        if self.results_panel is None:
+            self.results_panel = self._build_results_panel()
+            self.results.remove_widget(self.placeholder)
+            self.results.add_widget(self.results_panel)
         pred = self.current_prediction
+        self.place_btn.text, self.place_btn.disabled = '📌 Placer le pari', False
         
         # Métriques
-        metrics = GridLayout(cols=2, spacing=dp(8), size_hint_y=0.4)
-        metrics.add_widget(MetricCard('📊 Probabilité', f"{pred['probability']*100:.1f}%"))
-        metrics.add_widget(MetricCard('💰 EV', f"{pred['ev']*100:.1f}%", 'VALUE' if pred['ev'] > 0 else 'NO VALUE'))
-        metrics.add_widget(MetricCard('🎯 Mise Kelly', f"{pred['stake']:.2f}€"))
-        metrics.add_widget(MetricCard('📈 Confiance', f"{pred['probability']*pred['odds']:.2f}"))
-        self.results.add_widget(metrics)
-        
-        # Facteurs
-        self.results.add_widget(Label(text='─── Facteurs ───', font_size=dp(14),
-                                     color=get_color_from_hex(COLORS['gray']), size_hint_y=0.1))
-        
-        factors_box = BoxLayout(orientation='vertical', spacing=dp(5), size_hint_y=0.35)
-        for factor, value in pred['factors'].items():
-            row = BoxLayout(spacing=dp(5))
-            row.add_widget(Label(text=factor, font_size=dp(12),
-                                color=get_color_from_hex(COLORS['text']), size_hint_x=0.3))
-            row.add_widget(ProgressBar(value=abs(value)*100, max=100, size_hint_x=0.7))
-            factors_box.add_widget(row)
-        self.results.add_widget(factors_box)
+        prob_card, ev_card, stake_card, conf_card = self.metric_cards
+        prob_card.set_value(f"{pred['probability']*100:.1f}%")
+        ev_card.set_value(f"{pred['ev']*100:.1f}%", 'VALUE' if pred['ev'] > 0 else 'NO VALUE')
+        stake_card.set_value(f"{pred['stake']:.2f}€", '🛑 STOP-LOSS' if pred.get('kelly_capped') else '')
+        conf_card.set_value(f"{pred['probability']*pred['odds']:.2f}")
+        
+        # Facteurs: lignes recyclées via le pool
+        factors = list(pred['factors'].items())
+        while len(self.factor_rows) < len(factors):
+            row = factor_row_pool.acquire()
+            self.factor_rows.append(row)
+            self.factors_box.add_widget(row)
+        while len(self.factor_rows) > len(factors):
+            factor_row_pool.release(self.factor_rows.pop())
+        for row, (factor, value) in zip(self.factor_rows, factors):
+            row.update(factor, value)
         
         # Signal
-        signal = f"🎯 SIGNAL FORT: {pred['home']}" if pred['ev'] > 0.15 else \
+        self.signal_label.text = f"🎯 SIGNAL FORT: {pred['home']}" if pred['ev'] > 0.15 else \
                  (f"💡 Signal modéré: {pred['home']}" if pred['ev'] > 0 else "⚠️ Pas de value")
         signal_color = COLORS['success'] if pred['ev'] > 0.15 else (COLORS['accent'] if pred['ev'] > 0 else COLORS['danger'])
-        self.results.add_widget(Label(text=signal, font_size=dp(16), bold=True,
-                                     color=get_color_from_hex(signal_color), size_hint_y=0.15))
-        
-        # Bouton apprentissage
-        learn = Button(text='🧠 Aller à l\'apprentissage', font_size=dp(14),
-                      background_normal='', background_color=get_color_from_hex(COLORS['secondary']))
-        learn.bind(on_press=lambda x: setattr(self.manager, 'current', 'learning'))
-        self.results.add_widget(learn)
+        self.signal_label.color = get_color_from_hex(signal_color)
 
 # =============================================================================
 # ÉCRAN BANKROLL
 # =============================================================================
 class BankrollScreen(Screen):
+    TX_ICONS = {'deposit': '➕', 'withdrawal': '➖', 'win': '🏆', 'loss': '❌'}
+    TX_COLORS = {'deposit': COLORS['success'], 'withdrawal': COLORS['accent'],
+                 'win': COLORS['success'], 'loss': COLORS['danger']}
+    
     def __init__(self, **kwargs):
+        from kivy.uix.scrollview import ScrollView
+        from kivy.uix.textinput import TextInput
         super().__init__(**kwargs)
         layout = BoxLayout(orientation='vertical', padding=dp(15), spacing=dp(10))
         
@@ -435,14 +1322,35 @@ class BankrollScreen(Screen):
         # Stats
         bankroll = data_manager.bankroll
         stats = GridLayout(cols=2, spacing=dp(10), size_hint_y=0.25)
+        profit_fmt = lambda p: f"+{p:.2f}€" if p >= 0 else f"{p:.2f}€"
         profit = bankroll['current_balance'] - bankroll['initial_balance']
-        stats.add_widget(MetricCard('💵 Solde', f"{bankroll['current_balance']:.2f}€",
-                                   f"+{profit:.2f}€" if profit >= 0 else f"{profit:.2f}€"))
-        stats.add_widget(MetricCard('📊 ROI', f"{bankroll['roi']:.1f}%"))
-        stats.add_widget(MetricCard('🎯 Win Rate', f"{bankroll['win_rate']:.1f}%"))
-        stats.add_widget(MetricCard('🎰 Paris', str(bankroll['total_bets'])))
+        balance_card = MetricCard('💵 Solde', f"{bankroll['current_balance']:.2f}€", profit_fmt(profit))
+        balance_card.follow('balance', lambda v: f"{v:.2f}€", lambda s: profit_fmt(s.profit))
+        balance_card.follow('profit', lambda v: f"{app_state.balance:.2f}€", lambda s: profit_fmt(s.profit))
+        stats.add_widget(balance_card)
+        stats.add_widget(MetricCard('📊 ROI', f"{bankroll['roi']:.1f}%")
+                         .follow('roi', lambda v: f"{v:.1f}%"))
+        stats.add_widget(MetricCard('🎯 Win Rate', f"{bankroll['win_rate']:.1f}%")
+                         .follow('win_rate', lambda v: f"{v:.1f}%"))
+        stats.add_widget(MetricCard('🎰 Paris', str(bankroll['total_bets']))
+                         .follow('total_bets', str))
         layout.add_widget(stats)
         
+        # Performance sur une période glissante (lue dans les rollups)
+        self.period_index = 1
+        self.period_btn = Button(font_size=dp(13), size_hint_y=0.06, background_normal='',
+                                background_color=get_color_from_hex(COLORS['darker']))
+        self.period_btn.bind(on_press=self._cycle_period)
+        layout.add_widget(self.period_btn)
+        self._refresh_period()
+        app_state.watch(self, total_cycles=lambda i, v: self._refresh_period())
+        
+        # Indicateurs de risque (mis à jour en flux à chaque pari réglé)
+        self.risk_label = Label(font_size=dp(12), size_hint_y=0.05, color=get_color_from_hex(COLORS['text']))
+        layout.add_widget(self.risk_label)
+        self._refresh_risk()
+        app_state.watch(self, total_cycles=lambda i, v: self._refresh_risk())
+        
         # Actions
         actions = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=0.2)
         
@@ -468,61 +1376,327 @@ class BankrollScreen(Screen):
         layout.add_widget(actions)
         
         # Historique
-        layout.add_widget(Label(text='─── Transactions ───', font_size=dp(14),
-                               color=get_color_from_hex(COLORS['gray']), size_hint_y=0.05))
-        
-        scroll = ScrollView(size_hint_y=0.4)
+        tx_header = BoxLayout(spacing=dp(10), size_hint_y=0.06)
+        tx_header.add_widget(Label(text='─── Transactions ───', font_size=dp(14),
+                                  color=get_color_from_hex(COLORS['gray'])))
+        all_btn = Button(text='📜 Tout voir', font_size=dp(12), size_hint_x=0.35,
+                        background_normal='', background_color=get_color_from_hex(COLORS['darker']))
+        all_btn.bind(on_press=lambda x: self.manager.get_screen('history').open('transactions', back='bankroll'))
+        tx_header.add_widget(all_btn)
+        layout.add_widget(tx_header)
+        
+        scroll = ScrollView(size_hint_y=0.33)
         history = BoxLayout(orientation='vertical', spacing=dp(5), size_hint_y=None)
         history.bind(minimum_height=history.setter('height'))
         
-        icons = {'deposit': '➕', 'withdrawal': '➖', 'win': '🏆', 'loss': '❌'}
-        colors = {'deposit': COLORS['success'], 'withdrawal': COLORS['accent'],
-                 'win': COLORS['success'], 'loss': COLORS['danger']}
-        
-        for tx in bankroll['transactions'][-10:][::-1]:
-            t, amt = tx.get('type', ''), tx.get('amount', 0)
-            history.add_widget(Label(
-                text=f"{icons.get(t, '•')} {t.upper()}: {amt:+.2f}€",
-                font_size=dp(12), color=get_color_from_hex(colors.get(t, COLORS['text'])),
-                size_hint_y=None, height=dp(25)
-            ))
+        self.tx_labels = []
+        for _ in range(10):
+            label = Label(text='', font_size=dp(12), size_hint_y=None, height=dp(25))
+            self.tx_labels.append(label)
+            history.add_widget(label)
+        self._refresh_transactions()
+        app_state.watch(self, tx_count=lambda i, v: self._refresh_transactions())
         
         scroll.add_widget(history)
         layout.add_widget(scroll)
         self.add_widget(layout)
     
+    PERIODS = [7, 30, 90, 365]
+    
+    def _cycle_period(self, instance):
+        self.period_index = (self.period_index + 1) % len(self.PERIODS)
+        self._refresh_period()
+    
+    def _refresh_period(self):
+        days = self.PERIODS[self.period_index]
+        bankroll = data_manager.bankroll
+        if 'rollups' not in bankroll:
+            bankroll['rollups'] = rollups.rebuild(data_manager.brain['history'])
+        totals = rollups.last_days(bankroll['rollups'], days)
+        self.period_btn.text = (f"📅 {days} j: ROI {totals['roi']:+.1f}% • Précision "
+                                f"{totals['accuracy']*100:.0f}% • {totals['bets']} paris • "
+                                f"{totals['wagered']:.0f}€ misés")
+    
+    def _refresh_risk(self):
+        state = data_manager.bankroll.get('risk')
+        if not state:
+            self.risk_label.text = '📉 Risque: aucun pari réglé'
+            return
+        m = risk.metrics(state)
+        threshold = data_manager.settings.get('stop_loss_drawdown', 0.0)
+        guard = threshold > 0 and m['drawdown'] >= threshold
+        self.risk_label.text = (f"📉 DD {m['drawdown']*100:.1f}% (max {m['max_drawdown']*100:.1f}%) • "
+                                f"Sharpe {m['sharpe']:.2f} • σ {m['volatility']:.2f} • "
+                                f"Pertes {m['streak']} (max {m['longest_losing_streak']})"
+                                + (' • 🛑 STOP-LOSS' if guard else ''))
+        self.risk_label.color = get_color_from_hex(COLORS['danger'] if guard else COLORS['text'])
+    
+    def _refresh_transactions(self):
+        recent = data_manager.bankroll['transactions'][-len(self.tx_labels):][::-1]
+        for i, label in enumerate(self.tx_labels):
+            if i >= len(recent):
+                label.text = ''
+                continue
+            t, amt = recent[i].get('type', ''), recent[i].get('amount', 0)
+            label.text = f"{self.TX_ICONS.get(t, '•')} {t.upper()}: {amt:+.2f}€"
+            label.color = get_color_from_hex(self.TX_COLORS.get(t, COLORS['text']))
+    
+    @frame_monitor.track('bankroll.deposit')
     def deposit(self, instance):
         try:
             amt = float(self.deposit_input.text)
             if amt <= 0: return
-            data_manager.bankroll['current_balance'] += amt
-            if data_manager.bankroll['initial_balance'] == 0:
-                data_manager.bankroll['initial_balance'] = amt
-            data_manager.bankroll['transactions'].append({
-                'type': 'deposit', 'amount': amt, 'timestamp': datetime.now().isoformat()
-            })
-            data_manager.save_bankroll()
-            self.manager.current = 'home'
-            self.manager.current = 'bankroll'
+            data_manager.dispatch('deposit', amount=amt)
+            data_manager.commit_state()
+            app_state.refresh()
         except: pass
     
+    @frame_monitor.track('bankroll.withdraw')
     def withdraw(self, instance):
         try:
             amt = float(self.withdraw_input.text)
             if amt <= 0 or amt > data_manager.bankroll['current_balance']: return
-            data_manager.bankroll['current_balance'] -= amt
-            data_manager.bankroll['transactions'].append({
-                'type': 'withdrawal', 'amount': -amt, 'timestamp': datetime.now().isoformat()
-            })
-            data_manager.save_bankroll()
-            self.manager.current = 'home'
-            self.manager.current = 'bankroll'
+            data_manager.dispatch('withdrawal', amount=amt)
+            data_manager.commit_state()
+            app_state.refresh()
         except: pass
 
+# =============================================================================
+# ÉCRAN HISTORIQUE COMPLET
+# =============================================================================
+class HistoryRow(Label):
+    """Ligne recyclée par le RecycleView (nombre de widgets constant)."""
+    pass
+
+class HistoryScreen(Screen):
+    """Navigateur virtualisé des transactions et de l'historique d'entraînement.
+    
+    Les données sont chargées par pages depuis DataManager.history_page dans une
+    fenêtre glissante de WINDOW_PAGES pages: le nombre de widgets comme la
+    taille de `rv.data` restent bornés quelle que soit la longueur de l'historique.
+    """
+    PAGE_SIZE = 200
+    WINDOW_PAGES = 3
+    
+    def __init__(self, **kwargs):
+        from kivy.uix.recycleview import RecycleView
+        from kivy.uix.recycleboxlayout import RecycleBoxLayout
+        super().__init__(**kwargs)
+        self.kind = 'transactions'
+        self.rows = None
+        self.back_screen = 'bankroll'
+        self.offset = 0
+        self.row_height = dp(28)
+        self._loading = False
+        layout = BoxLayout(orientation='vertical', padding=dp(15), spacing=dp(10))
+        
+        with layout.canvas.before:
+            Color(*get_color_from_hex(COLORS['dark']))
+            self.bg = RoundedRectangle(pos=layout.pos, size=layout.size)
+        
+        # Header
+        header = BoxLayout(size_hint_y=0.1)
+        back = Button(text='← Retour', font_size=dp(16), size_hint_x=0.3,
+                     background_normal='', background_color=get_color_from_hex(COLORS['darker']))
+        back.bind(on_press=lambda x: setattr(self.manager, 'current', self.back_screen))
+        header.add_widget(back)
+        header.add_widget(Label(text='📜 Historique', font_size=dp(20), bold=True,
+                               color=get_color_from_hex(COLORS['secondary'])))
+        layout.add_widget(header)
+        
+        # Sélection de la source
+        tabs = BoxLayout(spacing=dp(10), size_hint_y=0.08)
+        for text, kind in [('💰 Transactions', 'transactions'), ('🧠 Entraînement', 'history')]:
+            btn = Button(text=text, font_size=dp(14), background_normal='',
+                        background_color=get_color_from_hex(COLORS['darker']))
+            btn.bind(on_press=lambda x, k=kind: self.show(k))
+            tabs.add_widget(btn)
+        layout.add_widget(tabs)
+        
+        self.position_label = Label(text='', font_size=dp(12),
+                                    color=get_color_from_hex(COLORS['gray']), size_hint_y=0.05)
+        layout.add_widget(self.position_label)
+        
+        # Liste virtualisée
+        self.rv = RecycleView(size_hint_y=0.77, viewclass=HistoryRow)
+        rv_layout = RecycleBoxLayout(orientation='vertical', size_hint_y=None,
+                                     default_size=(None, self.row_height), default_size_hint=(1, None))
+        rv_layout.bind(minimum_height=rv_layout.setter('height'))
+        self.rv.add_widget(rv_layout)
+        self.rv.bind(scroll_y=self._on_scroll)
+        layout.add_widget(self.rv)
+        
+        self.add_widget(layout)
+    
+    def open(self, kind, rows=None, back='bankroll'):
+        self.kind, self.rows, self.back_screen = kind, rows, back
+        self.manager.current = self.name
+    
+    def on_enter(self):
+        self.show(self.kind, self.rows)
+    
+    def show(self, kind, rows=None):
+        """Affiche `kind`; `rows` limite l'affichage à un résultat de recherche."""
+        self.kind, self.rows, self.offset = kind, rows, 0
+        self.rv.data = self._load(0, self.PAGE_SIZE * self.WINDOW_PAGES)
+        self.rv.scroll_y = 1
+        self._update_position()
+    
+    def _load(self, offset, limit):
+        fmt = self._format_transaction if self.kind == 'transactions' else self._format_training
+        return [fmt(entry) for entry in data_manager.history_page(self.kind, offset, limit, self.rows)]
+    
+    @staticmethod
+    def _format_transaction(tx):
+        t, amt = tx.get('type', ''), tx.get('amount', 0)
+        date = tx.get('timestamp', '')[:16].replace('T', ' ')
+        return {'text': f"{BankrollScreen.TX_ICONS.get(t, '•')} {t.upper()}: {amt:+.2f}€   {date}",
+                'color': get_color_from_hex(BankrollScreen.TX_COLORS.get(t, COLORS['text'])),
+                'font_size': dp(12)}
+    
+    @staticmethod
+    def _format_training(entry):
+        win = entry.get('result') == 'win'
+        date = entry.get('timestamp', '')[:16].replace('T', ' ')
+        return {'text': f"{'🏆' if win else '❌'} {entry.get('match', '')}   {date}",
+                'color': get_color_from_hex(COLORS['success'] if win else COLORS['danger']),
+                'font_size': dp(12)}
+    
+    def _on_scroll(self, instance, scroll_y):
+        if self._loading or not self.rv.data: return
+        total = data_manager.history_count(self.kind, self.rows)
+        if scroll_y < 0.1 and self.offset + len(self.rv.data) < total:
+            self._slide(+1)
+        elif scroll_y > 0.9 and self.offset > 0:
+            self._slide(-1)
+    
+    def _slide(self, direction):
+        """Décale la fenêtre d'une page en gardant la ligne visible à l'écran."""
+        self._loading = True
+        data, page = list(self.rv.data), self.PAGE_SIZE
+        top_px = (1 - self.rv.scroll_y) * max(len(data) * self.row_height - self.rv.height, 0)
+        if direction > 0:
+            data += self._load(self.offset + len(data), page)
+            dropped = max(len(data) - page * self.WINDOW_PAGES, 0)
+            data = data[dropped:]
+            self.offset += dropped
+            top_px -= dropped * self.row_height
+        else:
+            added = self._load(max(self.offset - page, 0), min(page, self.offset))
+            self.offset -= len(added)
+            data = (added + data)[:page * self.WINDOW_PAGES]
+            top_px += len(added) * self.row_height
+        self.rv.data = data
+        
+        def restore(dt):
+            scrollable = max(len(data) * self.row_height - self.rv.height, 1)
+            self.rv.scroll_y = min(1, max(0, 1 - top_px / scrollable))
+            self._update_position()
+            self._loading = False
+        Clock.schedule_once(restore, 0)
+    
+    def _update_position(self):
+        total = data_manager.history_count(self.kind, self.rows)
+        shown = len(self.rv.data)
+        self.position_label.text = ((f"{self.offset + 1}–{self.offset + shown} / {total}"
+                                     + (' (filtré)' if self.rows is not None else ''))
+                                    if shown else 'Aucune entrée')
+
+# =============================================================================
+# ÉCRAN CLASSEMENT DES ÉQUIPES
+# =============================================================================
+class TeamsScreen(Screen):
+    """Classement par équipe lu directement dans brain['team_stats']."""
+    ROLES = [('Tous', None), ('Domicile', 'home'), ('Extérieur', 'away')]
+    SORTS = [('ROI', 'roi'), ('Précision', 'accuracy'), ('EV moyen', 'avg_ev'), ('Paris', 'bets')]
+    
+    def __init__(self, **kwargs):
+        from kivy.uix.recycleview import RecycleView
+        from kivy.uix.recycleboxlayout import RecycleBoxLayout
+        super().__init__(**kwargs)
+        self.role_index, self.sort_index = 0, 0
+        layout = BoxLayout(orientation='vertical', padding=dp(15), spacing=dp(10))
+        
+        with layout.canvas.before:
+            Color(*get_color_from_hex(COLORS['dark']))
+            self.bg = RoundedRectangle(pos=layout.pos, size=layout.size)
+        
+        # Header
+        header = BoxLayout(size_hint_y=0.1)
+        back = Button(text='← Retour', font_size=dp(16), size_hint_x=0.3,
+                     background_normal='', background_color=get_color_from_hex(COLORS['darker']))
+        back.bind(on_press=lambda x: setattr(self.manager, 'current', 'stats'))
+        header.add_widget(back)
+        header.add_widget(Label(text='🏅 Équipes', font_size=dp(20), bold=True,
+                               color=get_color_from_hex(COLORS['accent'])))
+        layout.add_widget(header)
+        
+        # Filtres
+        filters = BoxLayout(spacing=dp(10), size_hint_y=0.08)
+        self.role_btn = Button(font_size=dp(14), background_normal='',
+                              background_color=get_color_from_hex(COLORS['darker']))
+        self.role_btn.bind(on_press=lambda x: self._cycle('role_index', self.ROLES))
+        self.sort_btn = Button(font_size=dp(14), background_normal='',
+                              background_color=get_color_from_hex(COLORS['darker']))
+        self.sort_btn.bind(on_press=lambda x: self._cycle('sort_index', self.SORTS))
+        filters.add_widget(self.role_btn)
+        filters.add_widget(self.sort_btn)
+        layout.add_widget(filters)
+        
+        # Classement
+        self.rv = RecycleView(size_hint_y=0.82, viewclass=HistoryRow)
+        rv_layout = RecycleBoxLayout(orientation='vertical', size_hint_y=None,
+                                     default_size=(None, dp(28)), default_size_hint=(1, None))
+        rv_layout.bind(minimum_height=rv_layout.setter('height'))
+        self.rv.add_widget(rv_layout)
+        layout.add_widget(self.rv)
+        
+        self.add_widget(layout)
+        app_state.watch(self, total_cycles=lambda i, v: self.refresh())
+    
+    def _cycle(self, attr, options):
+        setattr(self, attr, (getattr(self, attr) + 1) % len(options))
+        self.refresh()
+    
+    def on_enter(self):
+        self.refresh()
+    
+    def refresh(self):
+        role_label, role = self.ROLES[self.role_index]
+        sort_label, sort_key = self.SORTS[self.sort_index]
+        self.role_btn.text = f'👥 {role_label}'
+        self.sort_btn.text = f'↕ {sort_label}'
+        brain = data_manager.brain
+        if 'team_stats' not in brain:
+            brain['team_stats'] = rebuild_team_stats(brain['history'])
+        rows = leaderboard(brain['team_stats'], sort_key, role)
+        self.rv.data = [{
+            'text': f"{rank}. {name}  •  {m['bets']} paris  •  {m['accuracy']*100:.0f}%  •  "
+                    f"ROI {m['roi']:+.1f}%  •  EV {m['avg_ev']*100:+.1f}%",
+            'color': get_color_from_hex(COLORS['success'] if m['roi'] >= 0 else COLORS['danger']),
+            'font_size': dp(12)
+        } for rank, (_, name, m) in enumerate(rows, 1)] or [{
+            'text': 'Aucun pari réglé', 'color': get_color_from_hex(COLORS['gray']), 'font_size': dp(14)
+        }]
+
 # =============================================================================
 # ÉCRAN APPRENTISSAGE
 # =============================================================================
+class BetRow(Button):
+    """Ligne recyclée du carnet de paris; l'appui bascule le résultat marqué."""
+    bet_id = NumericProperty(0)
+    owner = ObjectProperty(None, allownone=True)
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('font_size', dp(13))
+        super().__init__(background_normal='', **kwargs)
+    
+    def on_press(self):
+        if self.owner is not None: self.owner.toggle_outcome(self.bet_id)
+
 class LearningScreen(Screen):
+    FRAME_BUDGET = 0.008
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.layout = BoxLayout(orientation='vertical', padding=dp(15), spacing=dp(10))
@@ -537,118 +1711,203 @@ class LearningScreen(Screen):
                      background_normal='', background_color=get_color_from_hex(COLORS['darker']))
         back.bind(on_press=lambda x: setattr(self.manager, 'current', 'home'))
         header.add_widget(back)
-        header.add_widget(Label(text='🧠 Apprentissage', font_size=dp(20), bold=True,
+        header.add_widget(Label(text='🎟️ Paris ouverts', font_size=dp(20), bold=True,
                                color=get_color_from_hex(COLORS['primary'])))
         self.layout.add_widget(header)
         
         self.content = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=0.9)
         self.layout.add_widget(self.content)
         self.add_widget(self.layout)
+        
+        # File des résultats à appliquer
+        self.pending = deque()
+        self.bets_rv = None
+        self.import_report = ''
+        self.settled = 0
+        self.unsaved = 0
+        self.popup = None
+        self._drain_trigger = Clock.create_trigger(self._drain)
+        self._home_trigger = Clock.create_trigger(self._go_home, 2)
+    
+    OUTCOME_LABELS = {None: '⏳', True: '✅', False: '❌'}
     
+    @frame_monitor.track('learning.on_enter')
     def on_enter(self):
-        self.content.clear_widgets()
-        scanner = self.manager.get_screen('scanner')
-        
-        if not scanner.current_prediction:
-            self.content.add_widget(Label(
-                text='👆 Lancez d\'abord une analyse dans Scanner',
-                font_size=dp(16), color=get_color_from_hex(COLORS['gray'])
-            ))
-            return
-        
-        pred = scanner.current_prediction
-        
-        # Match info
-        self.content.add_widget(Label(
-            text=f"⚽ {pred['home']} vs {pred['away']}",
-            font_size=dp(22), bold=True, color=get_color_from_hex(COLORS['text']),
-            size_hint_y=0.2
-        ))
-        self.content.add_widget(Label(
-            text=f"Cote: {pred['odds']:.2f} • Prob: {pred['probability']*100:.1f}%",
-            font_size=dp(14), color=get_color_from_hex(COLORS['gray']), size_hint_y=0.1
-        ))
-        self.content.add_widget(Label(
-            text=f"Mise suggérée: {pred['stake']:.2f}€",
-            font_size=dp(16), color=get_color_from_hex(COLORS['accent']), size_hint_y=0.1
-        ))
-        
-        # Question
-        self.content.add_widget(Label(
-            text='Le pronostic était-il correct?',
-            font_size=dp(18), color=get_color_from_hex(COLORS['text']), size_hint_y=0.1
-        ))
-        
-        # Boutons
-        buttons = BoxLayout(spacing=dp(20), size_hint_y=0.2)
-        win = Button(text='✅ GAGNÉ', font_size=dp(20), bold=True,
-                    background_normal='', background_color=get_color_from_hex(COLORS['success']))
-        win.bind(on_press=lambda x: self._train(True))
-        buttons.add_widget(win)
-        
-        loss = Button(text='❌ PERDU', font_size=dp(20), bold=True,
-                     background_normal='', background_color=get_color_from_hex(COLORS['danger']))
-        loss.bind(on_press=lambda x: self._train(False))
-        buttons.add_widget(loss)
-        self.content.add_widget(buttons)
-        
-        # Stats
+        if self.bets_rv is None: self._build_book()
+        self.refresh()
+    
+    def _build_book(self):
+        """Liste des paris ouverts: un appui sur une ligne fait défiler ⏳ → ✅ → ❌."""
+        from kivy.uix.recycleview import RecycleView
+        from kivy.uix.recycleboxlayout import RecycleBoxLayout
+        from kivy.uix.textinput import TextInput
+        self.outcomes = {}
+        self.summary_label = Label(font_size=dp(14), color=get_color_from_hex(COLORS['gray']),
+                                   size_hint_y=0.08)
+        self.content.add_widget(self.summary_label)
+        
+        self.bets_rv = RecycleView(size_hint_y=0.62, viewclass=BetRow)
+        rv_layout = RecycleBoxLayout(orientation='vertical', size_hint_y=None, spacing=dp(4),
+                                     default_size=(None, dp(44)), default_size_hint=(1, None))
+        rv_layout.bind(minimum_height=rv_layout.setter('height'))
+        self.bets_rv.add_widget(rv_layout)
+        self.content.add_widget(self.bets_rv)
+        
+        # Marquage rapide puis règlement du lot
+        marks = BoxLayout(spacing=dp(10), size_hint_y=0.1)
+        for text, value, color in [('✅ Tous gagnés', True, COLORS['success']),
+                                   ('❌ Tous perdus', False, COLORS['danger']),
+                                   ('⏳ Effacer', None, COLORS['darker'])]:
+            btn = Button(text=text, font_size=dp(13), background_normal='',
+                        background_color=get_color_from_hex(color))
+            btn.bind(on_press=lambda x, v=value: self._mark_all(v))
+            marks.add_widget(btn)
+        self.content.add_widget(marks)
+        
+        self.settle_btn = Button(font_size=dp(18), bold=True, size_hint_y=0.12, background_normal='',
+                                background_color=get_color_from_hex(COLORS['primary']))
+        self.settle_btn.bind(on_press=lambda x: self._settle_marked())
+        self.content.add_widget(self.settle_btn)
+        
+        # Import de résultats (fichier CSV/JSON ou flux démo)
+        import_row = BoxLayout(spacing=dp(8), size_hint_y=0.08)
+        self.import_input = TextInput(text=os.path.join(data_manager.data_dir, 'results.csv'),
+                                      multiline=False, font_size=dp(12), size_hint_x=0.5)
+        import_row.add_widget(self.import_input)
+        for text, source in [('📥 Importer', 'file'), ('🛰️ Démo', 'stub')]:
+            btn = Button(text=text, font_size=dp(13), size_hint_x=0.25, background_normal='',
+                        background_color=get_color_from_hex(COLORS['secondary']))
+            btn.bind(on_press=lambda x, src=source: self._import_results(src))
+            import_row.add_widget(btn)
+        self.content.add_widget(import_row)
+    
+    def refresh(self):
+        book = data_manager.bets
+        open_ids = {bet['id'] for bet in book}
+        self.outcomes = {k: v for k, v in self.outcomes.items() if k in open_ids}
         brain = data_manager.brain
-        self.content.add_widget(Label(
-            text=f"📊 Cycles: {brain['total_cycles']} • Précision: {brain['accuracy']*100:.1f}%",
-            font_size=dp(14), color=get_color_from_hex(COLORS['gray']), size_hint_y=0.1
-        ))
-    
-    def _train(self, success):
-        scanner = self.manager.get_screen('scanner')
-        pred = scanner.current_prediction
-        if not pred: return
-        
+        self.summary_label.text = (f"🎟️ {len(book)} pari(s) ouvert(s) • {book.exposure():.2f}€ engagés\n"
+                                   f"📊 Cycles: {brain['total_cycles']} • Précision: {brain['accuracy']*100:.1f}%")
+        self.bets_rv.data = [{
+            'text': f"{self.OUTCOME_LABELS[self.outcomes.get(bet['id'])]}  #{bet['id']} "
+                    f"{bet['home']} vs {bet['away']}  •  @{bet['odds']:.2f}  •  {bet['stake']:.2f}€",
+            'bet_id': bet['id'], 'owner': self,
+            'background_color': get_color_from_hex(
+                {True: COLORS['success'], False: COLORS['danger']}.get(self.outcomes.get(bet['id']), COLORS['darker']))
+        } for bet in book] or [{
+            'text': '👆 Placez des paris depuis le Scanner', 'bet_id': 0, 'owner': None,
+            'background_color': get_color_from_hex(COLORS['dark'])
+        }]
+        marked = sum(1 for v in self.outcomes.values() if v is not None)
+        self.settle_btn.text = f'⚡ Régler {marked} pari(s)'
+        self.settle_btn.disabled = marked == 0
+    
+    def toggle_outcome(self, bet_id):
+        current = self.outcomes.get(bet_id)
+        self.outcomes[bet_id] = True if current is None else (False if current else None)
+        self.refresh()
+    
+    def _mark_all(self, value):
+        self.outcomes = {bet['id']: value for bet in data_manager.bets}
+        self.refresh()
+    
+    @frame_monitor.track('learning.settle')
+    def _settle_marked(self):
+        """Retire du carnet tous les paris marqués et les met en file: une seule sauvegarde pour le lot."""
+        outcomes = {k: v for k, v in self.outcomes.items() if v is not None}
+        if not outcomes: return
+        self.pending.append(outcomes)
+        self.outcomes, self.import_report = {}, ''
+        self.refresh()
+        self._drain_trigger()
+    
+    @frame_monitor.track('learning.import')
+    def _import_results(self, source):
+        """Règle d'un coup tous les paris ouverts trouvés dans la source de résultats."""
+        from results_import import read_results, stub_feed, match_results
+        book, invalid = data_manager.bets, []
+        if not len(book): return
+        try:
+            rows = stub_feed(book) if source == 'stub' else None
+            if rows is None: rows, invalid = read_results(self.import_input.text.strip())
+        except Exception as e:
+            self.summary_label.text = f"❌ Import impossible: {e}"
+            return
+        aliases = data_manager.settings.setdefault('team_aliases', {})
+        outcomes, unmatched, learned = match_results(book, rows, aliases)
+        if learned:
+            aliases.update(learned)
+            data_manager.commit(['settings'])
+        
+        report = f"📥 {len(outcomes)} pari(s) réglé(s) sur {len(rows)} ligne(s)"
+        if unmatched or invalid:
+            names = ', '.join(f"{h} vs {a}" for h, a, _ in unmatched[:5])
+            report += f"\n⚠️ {len(unmatched)} non appariée(s){': ' + names if names else ''}"
+            report += f" • {len(invalid)} illisible(s)" if invalid else ''
+            Logger.info(f"Import: lignes non appariées {unmatched}, illisibles {len(invalid)}")
+        self.import_report = report
+        if outcomes:
+            self.pending.append(outcomes)
+            self._drain_trigger()
+        else:
+            self._show_feedback(report)
+        self.refresh()
+    
+    @frame_monitor.track('learning.drain')
+    def _drain(self, dt):
+        """Applique les lots de résultats en attente (un événement 'settle' par lot), dans l'ordre."""
+        deadline = time.perf_counter() + self.FRAME_BUDGET
+        lr = data_manager.settings.get('learning_rate', 0.05)
+        while self.pending and time.perf_counter() < deadline:
+            outcomes = self.pending.popleft()
+            refs = {bet['id']: bet['placed_at'] for bet in data_manager.bets if bet['id'] in outcomes}
+            data_manager.dispatch('settle', outcomes=outcomes, lr=lr, refs=refs)
+            self.settled += len(outcomes)
         brain, bankroll = data_manager.brain, data_manager.bankroll
+        app_state.refresh()
+        if self.pending:
+            self._drain_trigger()
+            return
         
-        # Mise à jour IA
-        new_w, new_v = LearningEngine.update_weights(brain, success, pred['factors'].keys())
-        brain['weights'], brain['velocity'] = new_w, new_v
-        brain['total_cycles'] += 1
-        brain['history'].append({'match': f"{pred['home']} vs {pred['away']}",
-                                'result': 'win' if success else 'loss', 'timestamp': pred['timestamp']})
-        wins = sum(1 for h in brain['history'] if h['result'] == 'win')
-        brain['accuracy'] = wins / len(brain['history'])
-        
-        # Bankroll
-        if pred['stake'] > 0:
-            bankroll['total_bets'] += 1
-            bankroll['total_wagered'] += pred['stake']
-            if success:
-                gain = pred['stake'] * pred['odds']
-                bankroll['current_balance'] += gain - pred['stake']
-                bankroll['total_won'] += gain - pred['stake']
-                bankroll['transactions'].append({'type': 'win', 'amount': gain})
-            else:
-                bankroll['total_lost'] += pred['stake']
-                bankroll['transactions'].append({'type': 'loss', 'amount': -pred['stake']})
-            
-            if bankroll['total_wagered'] > 0:
-                bankroll['roi'] = (bankroll['total_won'] - bankroll['total_lost']) / bankroll['total_wagered'] * 100
-            w_tx = sum(1 for tx in bankroll['transactions'] if tx['type'] == 'win')
-            total_tx = w_tx + sum(1 for tx in bankroll['transactions'] if tx['type'] == 'loss')
-            if total_tx > 0: bankroll['win_rate'] = w_tx / total_tx * 100
-        
-        data_manager.save_brain()
-        data_manager.save_bankroll()
-        scanner.current_prediction = None
-        
-        Popup(title='🧠 IA Entraînée!', content=Label(
-            text=f"Précision: {brain['accuracy']*100:.1f}%\nROI: {bankroll['roi']:.1f}%",
-            font_size=dp(16)), size_hint=(0.8, 0.4)).open()
-        
-        Clock.schedule_once(lambda dt: setattr(self.manager, 'current', 'home'), 2)
+        self.unsaved += 1
+        data_manager.commit_state(on_done=self._on_committed)
+        self._show_feedback(f"Précision: {brain['accuracy']*100:.1f}%\nROI: {bankroll['roi']:.1f}%\n"
+                            f"{self.settled} résultat(s) • 💾 sauvegarde..."
+                            + (f"\n{self.import_report}" if self.import_report else ''))
+        if self.bets_rv is not None: self.refresh()
+        self._home_trigger.cancel()
+        if not len(data_manager.bets): self._home_trigger()
+    
+    def _on_committed(self, ok):
+        self.unsaved -= 1
+        if self.unsaved == 0 and self.popup is not None:
+            self.popup.title = '🧠 IA Entraînée!' if ok else '⚠️ Sauvegarde échouée'
+            self.popup.content.text = self.popup.content.text.replace(
+                '💾 sauvegarde...', '✅ sauvegardé' if ok else '❌ non sauvegardé')
+    
+    def _show_feedback(self, text):
+        """Un seul popup, mis à jour au fil des résultats au lieu d'en empiler plusieurs."""
+        from kivy.uix.popup import Popup
+        if self.popup is None:
+            self.popup = Popup(title='🧠 IA Entraînée!', content=Label(text=text, font_size=dp(16)),
+                               size_hint=(0.8, 0.4))
+            self.popup.bind(on_dismiss=lambda x: setattr(self, 'popup', None))
+            self.popup.open()
+        else:
+            self.popup.content.text = text
+    
+    def _go_home(self, dt):
+        self.settled, self.import_report = 0, ''
+        if self.popup is not None: self.popup.dismiss()
+        self.manager.current = 'home'
 
 # =============================================================================
 # ÉCRAN STATS
 # =============================================================================
 class StatsScreen(Screen):
     def __init__(self, **kwargs):
+        from kivy.uix.textinput import TextInput
+        from kivy.uix.progressbar import ProgressBar
         super().__init__(**kwargs)
         layout = BoxLayout(orientation='vertical', padding=dp(15), spacing=dp(10))
         
@@ -664,6 +1923,10 @@ class StatsScreen(Screen):
         header.add_widget(back)
         header.add_widget(Label(text='📊 Statistiques', font_size=dp(20), bold=True,
                                color=get_color_from_hex(COLORS['accent'])))
+        teams_btn = Button(text='🏅 Équipes', font_size=dp(14), size_hint_x=0.3,
+                          background_normal='', background_color=get_color_from_hex(COLORS['darker']))
+        teams_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'teams'))
+        header.add_widget(teams_btn)
         layout.add_widget(header)
         
         # Poids IA
@@ -671,51 +1934,270 @@ class StatsScreen(Screen):
                                color=get_color_from_hex(COLORS['gray']), size_hint_y=0.05))
         
         brain = data_manager.brain
-        weights_box = BoxLayout(orientation='vertical', spacing=dp(8), size_hint_y=0.5)
+        weights_box = BoxLayout(orientation='vertical', spacing=dp(8), size_hint_y=0.25)
         
+        self.weight_rows = {}
         for factor, weight in sorted(brain['weights'].items(), key=lambda x: x[1], reverse=True):
             row = BoxLayout(spacing=dp(5))
             row.add_widget(Label(text=factor, font_size=dp(14),
                                 color=get_color_from_hex(COLORS['text']), size_hint_x=0.3))
-            row.add_widget(ProgressBar(value=weight*100, max=100, size_hint_x=0.5))
-            row.add_widget(Label(text=f"{weight*100:.1f}%", font_size=dp(12),
-                                color=get_color_from_hex(COLORS['accent']), size_hint_x=0.2))
+            bar = ProgressBar(value=weight*100, max=100, size_hint_x=0.5)
+            row.add_widget(bar)
+            value = Label(text=f"{weight*100:.1f}%", font_size=dp(12),
+                          color=get_color_from_hex(COLORS['accent']), size_hint_x=0.2)
+            row.add_widget(value)
+            self.weight_rows[factor] = (bar, value)
             weights_box.add_widget(row)
         layout.add_widget(weights_box)
+        app_state.watch(self, weights=self._update_weights)
+        
+        # Graphiques: courbe du solde / évolution des poids
+        chart_box = BoxLayout(orientation='vertical', spacing=dp(5), size_hint_y=0.17)
+        self.chart_btn = Button(font_size=dp(12), size_hint_y=0.2, background_normal='',
+                               background_color=get_color_from_hex(COLORS['darker']))
+        self.chart_btn.bind(on_press=lambda x: self._set_chart_mode(
+            'weights' if self.chart_mode == 'equity' else 'equity'))
+        chart_box.add_widget(self.chart_btn)
+        self.chart = LineChart(size_hint_y=0.8)
+        chart_box.add_widget(self.chart)
+        layout.add_widget(chart_box)
+        self._set_chart_mode('equity')
+        app_state.watch(self, tx_count=lambda i, v: self._update_chart(),
+                        total_cycles=lambda i, v: self._update_chart())
         
         # Stats globales
         layout.add_widget(Label(text='─── Performances ───', font_size=dp(16),
                                color=get_color_from_hex(COLORS['gray']), size_hint_y=0.05))
         
         bankroll = data_manager.bankroll
-        global_stats = GridLayout(cols=2, spacing=dp(10), size_hint_y=0.2)
-        global_stats.add_widget(MetricCard('🎯 Cycles', str(brain['total_cycles'])))
-        global_stats.add_widget(MetricCard('📊 Précision', f"{brain['accuracy']*100:.1f}%"))
-        global_stats.add_widget(MetricCard('💰 Misé', f"{bankroll['total_wagered']:.2f}€"))
-        global_stats.add_widget(MetricCard('🏆 Gains', f"{bankroll['total_won']:.2f}€"))
+        global_stats = GridLayout(cols=2, spacing=dp(10), size_hint_y=0.15)
+        global_stats.add_widget(MetricCard('🎯 Cycles', str(brain['total_cycles']))
+                                .follow('total_cycles', str))
+        global_stats.add_widget(MetricCard('📊 Précision', f"{brain['accuracy']*100:.1f}%")
+                                .follow('accuracy', lambda v: f"{v*100:.1f}%"))
+        global_stats.add_widget(MetricCard('💰 Misé', f"{bankroll['total_wagered']:.2f}€")
+                                .follow('total_wagered', lambda v: f"{v:.2f}€"))
+        global_stats.add_widget(MetricCard('🏆 Gains', f"{bankroll['total_won']:.2f}€")
+                                .follow('total_won', lambda v: f"{v:.2f}€"))
         layout.add_widget(global_stats)
         
-        # Reset
-        reset = Button(text='🧨 Réinitialiser', font_size=dp(14), size_hint_y=0.1,
+        # Profilage
+        self.perf_label = Label(text=profiler.format_summary(), font_size=dp(10),
+                                color=get_color_from_hex(COLORS['gray']), size_hint_y=0.07)
+        layout.add_widget(self.perf_label)
+        
+        # Recherche dans l'historique
+        search = BoxLayout(spacing=dp(5), size_hint_y=0.06)
+        self.team_input = TextInput(hint_text='Équipe', multiline=False, font_size=dp(12), size_hint_x=0.35)
+        self.period_input = TextInput(hint_text='AAAA-MM', multiline=False, font_size=dp(12), size_hint_x=0.25)
+        self.result_btn = Button(text='Tous', font_size=dp(12), size_hint_x=0.2, background_normal='',
+                                background_color=get_color_from_hex(COLORS['darker']))
+        self.result_btn.bind(on_press=self._cycle_result_filter)
+        search_btn = Button(text='🔍', font_size=dp(14), size_hint_x=0.2, background_normal='',
+                           background_color=get_color_from_hex(COLORS['primary']))
+        search_btn.bind(on_press=self._search)
+        for widget in (self.team_input, self.period_input, self.result_btn, search_btn):
+            search.add_widget(widget)
+        layout.add_widget(search)
+        
+        # Actions
+        actions = BoxLayout(spacing=dp(10), size_hint_y=0.1)
+        reset = Button(text='🧨 Réinitialiser', font_size=dp(14),
                       background_normal='', background_color=get_color_from_hex(COLORS['danger']))
         reset.bind(on_press=self._reset)
-        layout.add_widget(reset)
+        actions.add_widget(reset)
+        export = Button(text='📤 Exporter perf', font_size=dp(14),
+                       background_normal='', background_color=get_color_from_hex(COLORS['primary']))
+        export.bind(on_press=self._export_perf)
+        actions.add_widget(export)
+        
+        data_export = Button(text='📊 Exporter données', font_size=dp(14),
+                            background_normal='', background_color=get_color_from_hex(COLORS['secondary']))
+        data_export.bind(on_press=self._choose_export)
+        actions.add_widget(data_export)
+        
+        bets_import = Button(text='📥 Importer paris', font_size=dp(14),
+                            background_normal='', background_color=get_color_from_hex(COLORS['accent']))
+        bets_import.bind(on_press=self._choose_import)
+        actions.add_widget(bets_import)
+        layout.add_widget(actions)
         
         self.add_widget(layout)
     
+    def on_enter(self):
+        self.perf_label.text = profiler.format_summary()
+    
+    CHART_COLORS = [COLORS['primary'], COLORS['secondary'], COLORS['accent'],
+                    COLORS['danger'], COLORS['success'], COLORS['light']]
+    
+    def _set_chart_mode(self, mode):
+        self.chart_mode = mode
+        self.chart_btn.text = '📈 Courbe du solde' if mode == 'equity' else '🧠 Évolution des poids'
+        self.chart.clear_series()
+        if mode == 'equity':
+            self.chart.add_series('balance', COLORS['accent'])
+        else:
+            for factor, color in zip(data_manager.brain['weights'], self.CHART_COLORS):
+                self.chart.add_series(factor, color)
+        self._consumed = 0
+        self._update_chart()
+    
+    def _update_chart(self):
+        """Ajoute aux séries uniquement les entrées apparues depuis le dernier appel."""
+        source = data_manager.log('transactions' if self.chart_mode == 'equity' else 'history')
+        if len(source) < self._consumed:
+            return self._set_chart_mode(self.chart_mode)
+        if len(source) == self._consumed: return
+        if self.chart_mode == 'equity':
+            won = None
+            if not self._consumed or 'balance' not in source[self._consumed - 1]:
+                # Lignes sans solde à rejouer: gains nets repris des écritures d'ouverture
+                won = -data_manager.ledger.opening_balance('winnings') / 100
+            self.chart.series['balance'][0].extend(equity_values(source, self._consumed, won))
+        else:
+            snapshots = [h['weights'] for h in source[self._consumed:] if 'weights' in h]
+            for factor, (data, _) in self.chart.series.items():
+                data.extend(w.get(factor, 0) for w in snapshots)
+        self._consumed = len(source)
+        self.chart.redraw()
+    
+    RESULT_FILTERS = [('Tous', None), ('Gagnés', 'win'), ('Perdus', 'loss')]
+    
+    def _cycle_result_filter(self, instance):
+        labels = [label for label, _ in self.RESULT_FILTERS]
+        instance.text = labels[(labels.index(instance.text) + 1) % len(labels)]
+    
+    def _search(self, instance):
+        result = dict(self.RESULT_FILTERS)[self.result_btn.text]
+        rows = data_manager.search_history(self.team_input.text.strip() or None,
+                                           self.period_input.text.strip() or None, result)
+        self.manager.get_screen('history').open('history', rows, back='stats')
+    
+    def _update_weights(self, instance, weights):
+        for factor, weight in weights.items():
+            if factor not in self.weight_rows: continue
+            bar, value = self.weight_rows[factor]
+            bar.value = weight * 100
+            value.text = f"{weight*100:.1f}%"
+    
+    def _export_perf(self, instance):
+        from kivy.uix.popup import Popup
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        trace_file = os.path.join(data_manager.data_dir, f'trace_{stamp}.json')
+        frames_file = os.path.join(data_manager.data_dir, f'frames_{stamp}.json')
+        try:
+            lines = [f"{profiler.export_chrome_trace(trace_file)} spans → {os.path.basename(trace_file)}"]
+            if frame_monitor.enabled:
+                lines.append(f"{frame_monitor.export_log(frames_file)} frames perdues → "
+                             f"{os.path.basename(frames_file)}")
+            text = '\n'.join(lines + [data_manager.data_dir])
+        except OSError: text = 'Export impossible'
+        Popup(title='📤 Export performances', content=Label(text=text, font_size=dp(12)),
+             size_hint=(0.9, 0.3)).open()
+    
+    def _choose_export(self, instance):
+        from kivy.uix.popup import Popup
+        import exporters
+        box = BoxLayout(orientation='vertical', spacing=dp(8), padding=dp(8))
+        popup = Popup(title='📊 Export des données', content=box, size_hint=(0.8, 0.45))
+        for text, fmt, full in [('CSV (nouveautés)', 'csv', False), ('Parquet (nouveautés)', 'parquet', False),
+                                ('CSV complet', 'csv', True)]:
+            btn = Button(text=text, font_size=dp(14), background_normal='',
+                        background_color=get_color_from_hex(COLORS['darker']),
+                        disabled=fmt == 'parquet' and not exporters.parquet_available())
+            btn.bind(on_press=lambda x, f=fmt, a=full: (popup.dismiss(), self._export_data(f, a)))
+            box.add_widget(btn)
+        popup.open()
+    
+    def _export_data(self, fmt, full):
+        """Export par blocs sur un thread de fond; le résultat revient sur le thread UI."""
+        from kivy.uix.popup import Popup
+        def run():
+            try:
+                results = data_manager.export_data(fmt, full)
+                text = '\n'.join(f"{source}: +{count} ligne(s)" for source, (count, _) in results.items())
+                text += f"\n{os.path.join(data_manager.data_dir, 'exports')}"
+            except Exception as e:
+                text = f"Export impossible: {e}"
+            Clock.schedule_once(lambda dt: Popup(
+                title='📊 Export terminé', content=Label(text=text, font_size=dp(12)),
+                size_hint=(0.9, 0.3)).open())
+        threading.Thread(target=run, daemon=True).start()
+    
+    IMPORT_SLICE = 2000
+    
+    def _choose_import(self, instance):
+        from kivy.uix.textinput import TextInput
+        from kivy.uix.popup import Popup
+        from kivy.uix.switch import Switch
+        box = BoxLayout(orientation='vertical', spacing=dp(8), padding=dp(8))
+        path_input = TextInput(text=os.path.join(data_manager.data_dir, 'import.csv'),
+                               multiline=False, font_size=dp(12))
+        box.add_widget(path_input)
+        replay_row = BoxLayout()
+        replay_row.add_widget(Label(text='🧠 Rejouer l\'apprentissage', font_size=dp(14)))
+        replay_switch = Switch(active=False)
+        replay_row.add_widget(replay_switch)
+        box.add_widget(replay_row)
+        go = Button(text='📥 Importer', font_size=dp(16), background_normal='',
+                   background_color=get_color_from_hex(COLORS['primary']))
+        box.add_widget(go)
+        popup = Popup(title='📥 Import de paris historiques', content=box, size_hint=(0.9, 0.4))
+        go.bind(on_press=lambda x: (popup.dismiss(), self._import_bets(path_input.text.strip(), replay_switch.active)))
+        popup.open()
+    
+    def _import_bets(self, path, learn):
+        """Lecture et validation sur un thread de fond, application par tranches sur le thread UI."""
+        existing = {(h.get('timestamp'), h.get('match')) for h in data_manager.log('history')}
+        def run():
+            import bulk_import  # numpy: importé sur le thread de fond
+            try:
+                with profiler.span('import.validate'):
+                    bets, rejected = bulk_import.validate(bulk_import.load_rows(path), existing)
+            except Exception as e:
+                error = f"Import impossible: {e}"
+                Clock.schedule_once(lambda dt: self._import_done(error))
+                return
+            Clock.schedule_once(lambda dt: self._apply_import(deque(bets), rejected, learn, 0))
+        threading.Thread(target=run, daemon=True).start()
+    
+    def _apply_import(self, queue, rejected, learn, done):
+        with profiler.span('import.apply'):
+            batch = [queue.popleft() for _ in range(min(self.IMPORT_SLICE, len(queue)))]
+            data_manager.dispatch('import', bets=batch, learn=learn,
+                                  lr=data_manager.settings.get('learning_rate', 0.05))
+            done += len(batch)
+        if queue:
+            Clock.schedule_once(lambda dt: self._apply_import(queue, rejected, learn, done))
+            return
+        app_state.refresh()
+        text = f"{done} pari(s) importé(s) • {len(rejected)} rejeté(s)"
+        if rejected:
+            text += '\n' + ', '.join(f"l.{i + 2}: {reason}" for i, reason in rejected[:5])
+        data_manager.commit_state(on_done=lambda ok: self._import_done(
+            text + ('\n✅ sauvegardé' if ok else '\n❌ non sauvegardé')))
+    
+    def _import_done(self, text):
+        from kivy.uix.popup import Popup
+        Popup(title='📥 Import terminé', content=Label(text=text, font_size=dp(12)),
+             size_hint=(0.9, 0.35)).open()
+    
+    @frame_monitor.track('stats.reset')
     def _reset(self, instance):
-        data_manager.brain = data_manager._load_brain()
-        data_manager.bankroll = data_manager._load_bankroll()
-        data_manager.save_brain()
-        data_manager.save_bankroll()
-        self.manager.current = 'home'
-        self.manager.current = 'stats'
+        # Valeurs par défaut (et non relecture du disque); l'historique reste dans le journal
+        data_manager.dispatch('reset')
+        data_manager.commit_state()
+        app_state.refresh()
 
 # =============================================================================
 # ÉCRAN PARAMÈTRES
 # =============================================================================
 class SettingsScreen(Screen):
     def __init__(self, **kwargs):
+        from kivy.uix.textinput import TextInput
+        from kivy.uix.popup import Popup
+        from kivy.uix.slider import Slider
+        from kivy.uix.switch import Switch
         super().__init__(**kwargs)
         layout = BoxLayout(orientation='vertical', padding=dp(15), spacing=dp(10))
         
@@ -768,12 +2250,88 @@ class SettingsScreen(Screen):
         kelly_slider.bind(value=lambda i, v: setattr(self.kelly_label, 'text', f"💰 Kelly Fraction: {v*100:.0f}%"))
         settings_box.add_widget(kelly_slider)
         
+        # Stop-loss: plafond de Kelly au-delà d'un drawdown (0 = désactivé)
+        stop_fmt = lambda dd, cap: (f"🛑 Stop-loss: Kelly ≤ {cap*100:.1f}% si drawdown ≥ {dd*100:.0f}%"
+                                    if dd > 0 else '🛑 Stop-loss: désactivé')
+        self.stop_label = Label(
+            text=stop_fmt(data_manager.settings.get('stop_loss_drawdown', 0.0),
+                          data_manager.settings.get('stop_loss_kelly_cap', 0.01)),
+            font_size=dp(14), color=get_color_from_hex(COLORS['text']), size_hint_y=0.08
+        )
+        settings_box.add_widget(self.stop_label)
+        
+        stop_row = BoxLayout(spacing=dp(10), size_hint_y=0.1)
+        stop_slider = Slider(min=0.0, max=0.5, step=0.05,
+                            value=data_manager.settings.get('stop_loss_drawdown', 0.0))
+        cap_slider = Slider(min=0.0025, max=0.05, step=0.0025,
+                           value=data_manager.settings.get('stop_loss_kelly_cap', 0.01))
+        update_stop = lambda *a: setattr(self.stop_label, 'text', stop_fmt(stop_slider.value, cap_slider.value))
+        stop_slider.bind(value=update_stop)
+        cap_slider.bind(value=update_stop)
+        stop_row.add_widget(stop_slider)
+        stop_row.add_widget(cap_slider)
+        settings_box.add_widget(stop_row)
+        
+        # Profilage
+        profiling_row = BoxLayout(size_hint_y=0.08)
+        profiling_row.add_widget(Label(text='⏱️ Profilage', font_size=dp(14),
+                                      color=get_color_from_hex(COLORS['text'])))
+        profiling_switch = Switch(active=data_manager.settings.get('profiling', False))
+        profiling_row.add_widget(profiling_switch)
+        settings_box.add_widget(profiling_row)
+        
+        # Moniteur de frames
+        frames_row = BoxLayout(size_hint_y=0.08)
+        frames_row.add_widget(Label(text='🎞️ Moniteur de frames', font_size=dp(14),
+                                   color=get_color_from_hex(COLORS['text'])))
+        frames_switch = Switch(active=data_manager.settings.get('frame_monitor', False))
+        frames_row.add_widget(frames_switch)
+        settings_box.add_widget(frames_row)
+        
+        # Format des fichiers de données
+        codec_labels = {'json': 'Aucune (JSON lisible)', 'zlib': 'zlib', 'lzma': 'lzma (plus compact)'}
+        codec_row = BoxLayout(size_hint_y=0.08)
+        codec_row.add_widget(Label(text='🗜️ Compression', font_size=dp(14),
+                                   color=get_color_from_hex(COLORS['text'])))
+        codec_btn = Button(text=codec_labels[data_manager.codec], font_size=dp(13), background_normal='',
+                           background_color=get_color_from_hex(COLORS['darker']))
+        codec_btn.codec = data_manager.codec
+        def cycle_codec(instance):
+            instance.codec = CODECS[(CODECS.index(instance.codec) + 1) % len(CODECS)]
+            instance.text = codec_labels[instance.codec]
+        codec_btn.bind(on_press=cycle_codec)
+        codec_row.add_widget(codec_btn)
+        settings_box.add_widget(codec_row)
+        
+        # Synchronisation entre appareils (dossier partagé ou serveur local)
+        sync_row = BoxLayout(spacing=dp(8), size_hint_y=0.08)
+        self.sync_input = TextInput(text=data_manager.settings.get('sync_target', ''), multiline=False,
+                                    hint_text='Dossier partagé ou http://hôte:8765', font_size=dp(12))
+        sync_row.add_widget(self.sync_input)
+        sync_btn = Button(text='🔄 Synchroniser', font_size=dp(13), size_hint_x=0.4, background_normal='',
+                          background_color=get_color_from_hex(COLORS['secondary']))
+        sync_btn.bind(on_press=lambda x: self._sync(self.sync_input.text.strip()))
+        sync_row.add_widget(sync_btn)
+        settings_box.add_widget(sync_row)
+        
         # Save button
         def save(instance):
             data_manager.settings['api_key'] = self.api_input.text
+            data_manager.settings['sync_target'] = self.sync_input.text.strip()
             data_manager.settings['learning_rate'] = lr_slider.value
             data_manager.settings['kelly_fraction'] = kelly_slider.value
+            data_manager.settings['stop_loss_drawdown'] = stop_slider.value
+            data_manager.settings['stop_loss_kelly_cap'] = cap_slider.value
+            data_manager.settings['profiling'] = profiling_switch.active
+            if profiling_switch.active: profiler.enable()
+            else: profiler.disable()
+            data_manager.settings['frame_monitor'] = frames_switch.active
+            if frames_switch.active: frame_monitor.start(lambda: self.manager.current)
+            else: frame_monitor.stop()
+            migrate = codec_btn.codec != data_manager.codec
+            data_manager.settings['store_codec'] = codec_btn.codec
             data_manager.save_settings()
+            if migrate: data_manager.commit_state()  # réécrit les stores dans le nouveau format
             Popup(title='✅ Sauvegardé', content=Label(text='Paramètres enregistrés'),
                  size_hint=(0.6, 0.2)).open()
         
@@ -788,6 +2346,94 @@ class SettingsScreen(Screen):
         
         layout.add_widget(settings_box)
         self.add_widget(layout)
+    
+    def _sync(self, target):
+        """Échange des deltas sur un thread de fond, fusion sur le thread UI."""
+        from kivy.uix.popup import Popup
+        import sync
+        if not target: return
+        data_manager.settings['sync_target'] = target
+        def done(text):
+            Popup(title='🔄 Synchronisation', content=Label(text=text, font_size=dp(12)),
+                  size_hint=(0.9, 0.3)).open()
+        def merge(sent, events):
+            received = data_manager.merge_remote(events)
+            app_state.refresh()
+            done(f"{sent} événement(s) envoyé(s)\n{received} événement(s) reçu(s)")
+        def run():
+            try:
+                sent, events = data_manager.exchange(sync.transport_for(target))
+                Clock.schedule_once(lambda dt: merge(sent, events))
+            except Exception as e:
+                Clock.schedule_once(lambda dt: done(f"Synchronisation impossible: {e}"))
+        threading.Thread(target=run, daemon=True).start()
+
+# =============================================================================
+# GESTIONNAIRE D'ÉCRANS PARESSEUX
+# =============================================================================
+class LazyScreenManager(ScreenManager):
+    """ScreenManager qui construit chaque écran à sa première navigation."""
+    
+    # Écrans probablement visités ensuite, préchauffés pendant les temps morts
+    LIKELY_NEXT = {'home': ['scanner'], 'scanner': ['learning'], 'learning': ['home']}
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.factories = {}
+        self.classes = {}
+        self.build_times = {}
+        self.prewarm = False
+        self.bind(current=self._on_navigate)
+    
+    def register(self, name, factory):
+        self.factories[name] = self.classes[name] = factory
+    
+    def reset_screens(self):
+        """Oublie les écrans construits (sauf l'écran courant): reconstruits sur le profil actif.
+        
+        Leurs liaisons à app_state sont retirées: un écran oublié n'est plus
+        recalculé à chaque événement et peut être libéré. Les widgets empruntés
+        aux pools y retournent pour l'écran reconstruit.
+        """
+        for screen in list(self.screens):
+            if screen.name != self.current:
+                app_state.release(screen)
+                if hasattr(screen, 'release_pooled'): screen.release_pooled()
+                self.remove_widget(screen)
+                self.factories[screen.name] = self.classes[screen.name]
+    
+    def ensure_screen(self, name):
+        factory = self.factories.pop(name, None)
+        if factory is None: return
+        start = time.perf_counter()
+        with profiler.span(f'build.{name}'):
+            screen = factory(name=name)
+        self.build_times[name] = round((time.perf_counter() - start) * 1000, 1)
+        self.add_widget(screen)
+    
+    def get_screen(self, name):
+        self.ensure_screen(name)
+        return super().get_screen(name)
+    
+    def has_screen(self, name):
+        return name in self.factories or super().has_screen(name)
+    
+    def _on_navigate(self, instance, name):
+        frame_monitor.mark(f'switch.{name}')
+        if data_manager.refresh(): app_state.refresh()  # écritures d'un autre processus
+        if not self.prewarm: return
+        pending = [n for n in self.LIKELY_NEXT.get(name, []) if n in self.factories]
+        if pending:
+            # Un écran par callback pour ne jamais construire deux écrans dans la même frame
+            Clock.schedule_once(lambda dt: self._prewarm_next(pending), 0.5)
+    
+    def _prewarm_next(self, pending):
+        while pending and pending[0] not in self.factories:
+            pending.pop(0)
+        if not pending: return
+        self.ensure_screen(pending.pop(0))
+        if pending:
+            Clock.schedule_once(lambda dt: self._prewarm_next(pending), 0)
 
 # =============================================================================
 # APPLICATION PRINCIPALE
@@ -795,13 +2441,16 @@ class SettingsScreen(Screen):
 class EliteNeuralApp(App):
     def build(self):
         Window.clearcolor = get_color_from_hex(COLORS['dark'])
-        sm = ScreenManager(transition=FadeTransition(duration=0.2))
-        sm.add_widget(HomeScreen(name='home'))
-        sm.add_widget(ScannerScreen(name='scanner'))
-        sm.add_widget(BankrollScreen(name='bankroll'))
-        sm.add_widget(LearningScreen(name='learning'))
-        sm.add_widget(StatsScreen(name='stats'))
-        sm.add_widget(SettingsScreen(name='settings'))
+        sm = LazyScreenManager(transition=FadeTransition(duration=0.2))
+        for name, screen_cls in [
+            ('home', HomeScreen), ('scanner', ScannerScreen), ('bankroll', BankrollScreen),
+            ('learning', LearningScreen), ('stats', StatsScreen), ('settings', SettingsScreen),
+            ('history', HistoryScreen), ('teams', TeamsScreen)
+        ]:
+            sm.register(name, screen_cls)
+        sm.current = 'home'
+        sm.prewarm = data_manager.settings.get('prewarm_screens', True)
+        mark_startup('build')
         return sm
     
     def on_start(self):
@@ -810,11 +2459,42 @@ class EliteNeuralApp(App):
             request_permission(Permission.WRITE_EXTERNAL_STORAGE)
             request_permission(Permission.READ_EXTERNAL_STORAGE)
         except: pass
+        if data_manager.settings.get('frame_monitor'):
+            frame_monitor.start(lambda: self.root.current)
+        Clock.schedule_once(self._report_startup, 0)
+    
+    def _report_startup(self, dt):
+        mark_startup('first_frame')
+        import_timer.uninstall()
+        marks = list(STARTUP_TIMINGS.items())
+        stages = {name: round(ms - (marks[i - 1][1] if i else 0), 1) for i, (name, ms) in enumerate(marks)}
+        imports = import_timer.tree()
+        report = {'timings_ms': dict(STARTUP_TIMINGS), 'stages_ms': stages,
+                  'screen_builds_ms': dict(self.root.build_times), 'imports_ms': imports}
+        Logger.info(f"Startup: {stages} imports: {[(i['module'], i['ms']) for i in imports[:5]]}")
+        data_manager._save_json(os.path.join(data_manager.data_dir, 'startup_report.json'), report)
+        if self.root.prewarm:
+            self.root._on_navigate(self.root, self.root.current)
+        if data_manager.journal.last_checkpoint is None or data_manager.needs_migration():
+            data_manager.commit_state()  # snapshot de genèse / réécriture au format configuré
+        issues = data_manager.reconcile()
+        if issues:
+            Logger.warning(f"Ledger: écarts de rapprochement {issues}")
+    
+    def on_resume(self):
+        if data_manager.refresh(): app_state.refresh()
     
     def on_stop(self):
+        if provider_cache.dirty:
+            data_manager.committer.submit(provider_cache.path, provider_cache.serialize())
+        data_manager.committer.flush(timeout=5)
         data_manager.save_brain()
         data_manager.save_bankroll()
         data_manager.save_settings()
+        data_manager.save_ledger()
+        data_manager.journal.close()
+
+mark_startup('module')
 
 if __name__ == '__main__':
     EliteNeuralApp().run()
@@ -0,0 +1,203 @@
+"""
+Écriture durable des stores hors du thread UI.
+
+Le thread UI sérialise et dépose le contenu; un thread d'arrière-plan l'écrit
+de façon atomique (fichier temporaire + fsync + os.replace). Les demandes sur
+un même fichier sont fusionnées: seule la plus récente est écrite, et tous
+les acquittements en attente sont notifiés après cette écriture.
+
+Format des stores JSON: texte indenté ('json') ou JSON compact compressé
+('zlib', 'lzma'). Le format est reconnu à la lecture par ses premiers
+octets: un store existant est relu tel quel puis réécrit dans le format
+configuré à la sauvegarde suivante.
+
+Plusieurs processus (application, script en ligne de commande) peuvent
+partager le dossier de données: FileLock sérialise leurs accès (verrou
+consultatif fcntl, sans effet là où fcntl n'existe pas). Les fichiers soumis
+ensemble (batch()) sont écrits sous une seule prise du verrou: un lecteur ne
+voit jamais des stores issus de commits différents.
+"""
+
+import json
+import lzma
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+CODECS = ('json', 'zlib', 'lzma')
+_LZMA_MAGIC = b'\xfd7zXZ\x00'
+_ZLIB_HEADERS = (b'\x78\x01', b'\x78\x5e', b'\x78\x9c', b'\x78\xda')
+
+
+class FileLock:
+    """Verrou exclusif inter-processus, réentrant et partagé par les threads du processus."""
+
+    def __init__(self, path):
+        self.path = path
+        self._rlock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self):
+        self._rlock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._rlock.release()
+
+    def close(self):
+        with self._rlock:
+            if self._fd is not None and self._depth == 0:
+                os.close(self._fd)
+                self._fd = None
+
+
+def file_stamp(filepath):
+    """(mtime_ns, taille) d'un fichier, None s'il n'existe pas: détection de modification sans relecture."""
+    try:
+        st = os.stat(filepath)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def compress(raw, codec):
+    return zlib.compress(raw, 6) if codec == 'zlib' else lzma.compress(raw, preset=6)
+
+
+class Compressed:
+    """JSON compact compressé à la première demande, sur le thread du committer."""
+
+    def __init__(self, raw, codec):
+        self.raw, self.codec, self._data = raw, codec, None
+
+    def __call__(self):
+        if self._data is None:
+            self._data, self.raw = compress(self.raw, self.codec), None
+        return self._data
+
+
+def encode_store(data, codec='json'):
+    """Contenu d'un store: str (JSON indenté) ou Compressed (à appeler pour les octets)."""
+    if codec not in CODECS[1:]:
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    return Compressed(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), codec)
+
+
+def detect_codec(payload):
+    if payload.startswith(_LZMA_MAGIC): return 'lzma'
+    if payload[:2] in _ZLIB_HEADERS: return 'zlib'
+    return 'json'
+
+
+def decode_store(payload):
+    """Objet d'un store lu en octets, quel que soit son format."""
+    codec = detect_codec(payload)
+    if codec == 'lzma': payload = lzma.decompress(payload)
+    elif codec == 'zlib': payload = zlib.decompress(payload)
+    return json.loads(payload.decode('utf-8-sig'))
+
+
+def read_store(filepath):
+    with open(filepath, 'rb') as f:
+        return decode_store(f.read())
+
+
+def atomic_write(filepath, payload):
+    """Écrit `payload` (str, bytes ou Compressed) sans jamais laisser un fichier tronqué."""
+    if callable(payload): payload = payload()
+    tmp = filepath + '.tmp'
+    mode = 'wb' if isinstance(payload, bytes) else 'w'
+    with open(tmp, mode, **({} if mode == 'wb' else {'encoding': 'utf-8'})) as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filepath)
+
+
+class BackgroundCommitter:
+    """Thread unique d'écriture avec fusion des demandes par fichier."""
+
+    def __init__(self, dispatch=None, lock=None, on_written=None):
+        # dispatch(callback) renvoie l'acquittement sur le thread UI
+        self.dispatch = dispatch or (lambda callback: callback())
+        # Écriture sous `lock` (FileLock); on_written(filepath) appelé sous ce verrou
+        self.lock = lock or threading.RLock()
+        self.on_written = on_written
+        self._pending = {}
+        self._order = []
+        self._cond = threading.Condition()
+        self._busy = False
+        self._grouping = 0
+        self._thread = None
+
+    @contextmanager
+    def batch(self):
+        """Les submit() du bloc forment un lot: écrits ensemble, sous une seule prise du verrou."""
+        with self._cond:
+            self._grouping += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._grouping -= 1
+                self._cond.notify_all()
+
+    def submit(self, filepath, payload, on_done=None):
+        with self._cond:
+            _, callbacks = self._pending.get(filepath, (None, []))
+            if on_done: callbacks.append(on_done)
+            if filepath not in self._pending: self._order.append(filepath)
+            self._pending[filepath] = (payload, callbacks)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='committer', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self, timeout=None):
+        """Bloque jusqu'à ce que toutes les écritures soumises soient faites."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._order and not self._busy, timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._order and not self._grouping)
+                # Toutes les demandes en attente, écrites sous une seule prise du verrou:
+                # un autre processus ne voit jamais un lot (batch()) à moitié écrit
+                batch = [(filepath,) + self._pending.pop(filepath) for filepath in self._order]
+                self._order = []
+                self._busy = True
+            results = []
+            try:
+                payloads = [payload() if callable(payload) else payload  # compression hors verrou
+                            for _, payload, _ in batch]
+                with self.lock:
+                    for (filepath, _, callbacks), payload in zip(batch, payloads):
+                        try:
+                            atomic_write(filepath, payload)
+                            if self.on_written: self.on_written(filepath)
+                            results.append((callbacks, True))
+                        except OSError:
+                            results.append((callbacks, False))
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+            for callbacks, ok in results:
+                for callback in callbacks:
+                    self.dispatch(lambda cb=callback, ok=ok: cb(ok))
@@ -0,0 +1,182 @@
+"""
+Instrumentation légère des chemins chauds (spans de timing).
+
+Désactivé, chaque span coûte un test booléen et renvoie un context manager
+partagé. Activé, les spans sont conservés dans un buffer circulaire en
+mémoire, résumés en p50/p95/p99 et exportables au format Chrome Trace
+(chrome://tracing, Perfetto).
+
+ImportTimer mesure l'arbre des imports du démarrage (équivalent de
+`python -X importtime`, mais lisible depuis l'application sur l'appareil).
+"""
+
+import builtins
+import functools
+import json
+import importlib.util
+import math
+import sys
+import threading
+import time
+from collections import deque
+
+
+class _NullSpan:
+    """Span inerte renvoyé quand le profilage est désactivé."""
+    __slots__ = ()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class Profiler:
+    """Collecteur de spans avec buffer circulaire borné."""
+
+    def __init__(self, capacity=4096):
+        self.enabled = False
+        self.spans = deque(maxlen=capacity)
+        self.origin = time.perf_counter_ns()
+
+    def enable(self): self.enabled = True
+    def disable(self): self.enabled = False
+    def clear(self): self.spans.clear()
+
+    def span(self, name):
+        """Context manager mesurant le bloc `name` (no-op si désactivé)."""
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def timed(self, name=None):
+        """Décorateur: mesure chaque appel de la fonction décorée."""
+        def decorator(func):
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(label, start, time.perf_counter_ns())
+            return wrapper
+        return decorator
+
+    def record(self, name, start_ns, end_ns):
+        self.spans.append((name, start_ns, end_ns, threading.get_ident()))
+
+    def summary(self):
+        """Statistiques par span: {nom: {count, total, p50, p95, p99}} en ms."""
+        durations = {}
+        for name, start, end, _ in list(self.spans):
+            durations.setdefault(name, []).append((end - start) / 1e6)
+        result = {}
+        for name, values in durations.items():
+            values.sort()
+            result[name] = {
+                'count': len(values), 'total': sum(values),
+                'p50': _percentile(values, 50), 'p95': _percentile(values, 95),
+                'p99': _percentile(values, 99)
+            }
+        return result
+
+    def format_summary(self, limit=6):
+        """Résumé texte des spans les plus coûteux (temps total décroissant)."""
+        rows = sorted(self.summary().items(), key=lambda x: x[1]['total'], reverse=True)
+        if not rows:
+            return 'Aucune mesure' if self.enabled else 'Profilage désactivé'
+        return '\n'.join(
+            f"{name}  n={s['count']}  p50 {s['p50']:.2f}  p95 {s['p95']:.2f}  p99 {s['p99']:.2f} ms"
+            for name, s in rows[:limit]
+        )
+
+    def export_chrome_trace(self, filepath):
+        """Écrit les spans au format Chrome Trace Event (événements complets 'X')."""
+        events = [{
+            'name': name, 'cat': name.split('.', 1)[0], 'ph': 'X', 'pid': 1, 'tid': tid,
+            'ts': (start - self.origin) / 1e3, 'dur': (end - start) / 1e3
+        } for name, start, end, tid in list(self.spans)]
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+def _percentile(sorted_values, pct):
+    """Percentile par rang le plus proche sur une liste déjà triée."""
+    if not sorted_values: return 0.0
+    rank = min(len(sorted_values), max(1, math.ceil(pct / 100 * len(sorted_values)))) - 1
+    return sorted_values[rank]
+
+
+class ImportTimer:
+    """Arbre des temps d'import: chaque module importé pour la première fois est chronométré.
+
+    Enveloppe builtins.__import__ (instructions `import`) sur le thread qui
+    l'installe; les imports déjà en cache ne sont pas mesurés.
+    """
+
+    def __init__(self):
+        self.root = ['', 0.0, []]
+        self._stack = [self.root]
+        self._original = None
+        self._thread = None
+
+    def install(self):
+        if self._original is not None: return
+        self._original, self._thread = builtins.__import__, threading.get_ident()
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is None: return
+        builtins.__import__, self._original = self._original, None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original, key = self._original or builtins.__import__, name
+        if level:
+            try: key = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+            except (ImportError, ValueError): key = None
+        if key is None or key in sys.modules or threading.get_ident() != self._thread:
+            return original(name, globals, locals, fromlist, level)
+        node = [key, 0.0, []]
+        self._stack[-1][2].append(node)
+        self._stack.append(node)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            node[1] = (time.perf_counter() - start) * 1000
+            self._stack.pop()
+
+    def tree(self, min_ms=1.0, nodes=None):
+        """[{module, ms, self_ms, children}] des imports d'au moins `min_ms`, plus coûteux d'abord."""
+        result = []
+        for name, ms, children in sorted(self.root[2] if nodes is None else nodes, key=lambda n: -n[1]):
+            if ms < min_ms: continue
+            result.append({'module': name, 'ms': round(ms, 1),
+                           'self_ms': round(ms - sum(c[1] for c in children), 1),
+                           'children': self.tree(min_ms, children)})
+        return result
+
+
+# Instances globales
+profiler = Profiler()
+import_timer = ImportTimer()
@@ -0,0 +1,64 @@
+"""
+Profils: bankrolls isolées (une par ligue ou par stratégie).
+
+Chaque profil a son propre dossier de données (stores, journal, archives,
+exports, réglages). Le profil 'default' utilise la racine, ce qui conserve
+les données existantes; les autres vivent dans <racine>/profiles/<id>/.
+Le registre <racine>/profiles.json liste les profils et le profil actif.
+"""
+
+import json
+import os
+
+from history_index import normalize_team
+
+DEFAULT = 'default'
+
+
+class Profiles:
+    def __init__(self, root):
+        self.root = root
+        self.file = os.path.join(root, 'profiles.json')
+        try:
+            with open(self.file, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+        self.data.setdefault('active', DEFAULT)
+        self.data.setdefault('profiles', {DEFAULT: 'Principal'})
+
+    @property
+    def active(self):
+        active = self.data['active']
+        return active if active in self.data['profiles'] else DEFAULT
+
+    def names(self):
+        """[(id, libellé)] dans l'ordre de création."""
+        return list(self.data['profiles'].items())
+
+    def label(self, slug):
+        return self.data['profiles'].get(slug, slug)
+
+    def directory(self, slug):
+        return self.root if slug == DEFAULT else os.path.join(self.root, 'profiles', slug)
+
+    def create(self, label):
+        """Ajoute un profil et renvoie son identifiant (dérivé du libellé, unique)."""
+        base = normalize_team(label) or 'profil'
+        slug, i = base, 2
+        while slug in self.data['profiles']:
+            slug, i = f'{base}-{i}', i + 1
+        self.data['profiles'][slug] = label.strip() or slug
+        self._save()
+        return slug
+
+    def activate(self, slug):
+        if slug not in self.data['profiles']:
+            raise KeyError(slug)
+        self.data['active'] = slug
+        self._save()
+
+    def _save(self):
+        from persistence import atomic_write
+        os.makedirs(self.root, exist_ok=True)
+        atomic_write(self.file, json.dumps(self.data, indent=2, ensure_ascii=False))
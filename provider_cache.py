@@ -0,0 +1,63 @@
+"""
+Cache partagé des données du fournisseur, commun à tous les profils.
+
+- caractéristiques d'équipe précalculées, par identifiant normalisé et rôle
+  (domicile / extérieur)
+- confrontations directes, par paire d'équipes
+
+Chaque entrée est horodatée et expire après `ttl` secondes. Le cache est
+persisté en JSON compact (<racine>/shared/provider_cache.json): changer de
+profil ou relancer l'application ne refait pas les requêtes. Le fichier
+n'est lu qu'à la première analyse (hors du démarrage).
+"""
+
+import json
+import os
+import time
+
+from history_index import normalize_team
+
+
+class ProviderCache:
+    def __init__(self, path, ttl=6 * 3600):
+        self.path, self.ttl = path, ttl
+        self.dirty = False
+        self.hits = self.misses = 0
+        self._entries = None
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key, fetch):
+        """Valeur en cache pour `key`, sinon fetch() (mémorisé)."""
+        entry, now = self.entries.get(key), time.time()
+        if entry is not None and now - entry[0] < self.ttl:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = fetch()
+        self.entries[key] = [now, value]
+        self.dirty = True
+        return value
+
+    def team(self, name, role, fetch):
+        """Caractéristiques de l'équipe `name` dans le rôle 'home' ou 'away' (fetch(role))."""
+        return self.get(f'team:{normalize_team(name)}:{role}', lambda: fetch(role))
+
+    def h2h(self, home, away, fetch):
+        return self.get(f'h2h:{normalize_team(home)}:{normalize_team(away)}', fetch)
+
+    def serialize(self):
+        """Contenu à écrire (entrées expirées retirées); remet `dirty` à faux."""
+        now = time.time()
+        self._entries = {k: v for k, v in self.entries.items() if now - v[0] < self.ttl}
+        self.dirty = False
+        return json.dumps(self.entries, ensure_ascii=False, separators=(',', ':'))
@@ -0,0 +1,143 @@
+"""
+Import de résultats pour régler automatiquement les paris ouverts.
+
+Sources: fichier CSV, fichier JSON (liste d'objets ou {'results': [...]}) ou
+flux local simulé. Chaque ligne est ramenée à (domicile, extérieur, issue)
+avec issue 'H' (victoire domicile), 'D' (nul) ou 'A' (victoire extérieur).
+
+Les noms d'équipes sont résolus vers les équipes des paris ouverts: identifiant
+normalisé, puis table d'alias apprise, puis rapprochement approché (difflib).
+Un pari porte sur la victoire de l'équipe à domicile.
+"""
+
+import csv
+import difflib
+import io
+import json
+import os
+import random
+
+from history_index import normalize_team
+
+FUZZY_CUTOFF = 0.8
+
+# Noms de colonnes acceptés (en minuscules)
+_HOME = ('home', 'home_team', 'hometeam', 'domicile')
+_AWAY = ('away', 'away_team', 'awayteam', 'exterieur', 'extérieur')
+_HOME_GOALS = ('home_goals', 'fthg', 'hg', 'buts_domicile')
+_AWAY_GOALS = ('away_goals', 'ftag', 'ag', 'buts_exterieur')
+_RESULT = ('result', 'ftr', 'resultat', 'résultat')
+_SCORE = ('score',)
+_OUTCOMES = {'h': 'H', '1': 'H', 'home': 'H', 'win': 'H', 'd': 'D', 'x': 'D', 'draw': 'D', 'nul': 'D',
+             'a': 'A', '2': 'A', 'away': 'A', 'loss': 'A'}
+
+
+def _pick(row, names):
+    for name in names:
+        value = row.get(name)
+        if value not in (None, ''): return str(value).strip()
+    return None
+
+
+def parse_row(row):
+    """(domicile, extérieur, issue) depuis un dict de colonnes, ou None si illisible."""
+    row = {str(k).strip().lower(): v for k, v in row.items()}
+    home, away = _pick(row, _HOME), _pick(row, _AWAY)
+    if not home or not away: return None
+    result = _pick(row, _RESULT)
+    if result and result.lower() in _OUTCOMES:
+        return home, away, _OUTCOMES[result.lower()]
+    goals = (_pick(row, _HOME_GOALS), _pick(row, _AWAY_GOALS))
+    score = _pick(row, _SCORE)
+    if score and None in goals:
+        parts = score.replace(':', '-').split('-')
+        if len(parts) == 2: goals = parts
+    try:
+        hg, ag = int(goals[0]), int(goals[1])
+    except (TypeError, ValueError):
+        return None
+    return home, away, 'H' if hg > ag else ('A' if ag > hg else 'D')
+
+
+def read_results(path):
+    """Lit un fichier CSV ou JSON; renvoie (lignes lues, lignes illisibles)."""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        text = f.read()
+    return parse_text(text, json_hint=os.path.splitext(path)[1].lower() == '.json')
+
+
+def parse_text(text, json_hint=False):
+    stripped = text.lstrip()
+    if json_hint or stripped[:1] in '[{':
+        data = json.loads(text)
+        raw = data.get('results', []) if isinstance(data, dict) else data
+    else:
+        sample = stripped[:2048]
+        try: dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error: dialect = csv.excel
+        raw = list(csv.DictReader(io.StringIO(stripped), dialect=dialect))
+    rows, invalid = [], []
+    for item in raw:
+        parsed = parse_row(item) if isinstance(item, dict) else None
+        (rows if parsed else invalid).append(parsed or item)
+    return rows, invalid
+
+
+def stub_feed(bets, seed=None):
+    """Flux local simulé: un résultat aléatoire par match des paris ouverts."""
+    rng = random.Random(seed)
+    seen, rows = set(), []
+    for bet in bets:
+        key = (bet['home'], bet['away'])
+        if key in seen: continue
+        seen.add(key)
+        rows.append((bet['home'], bet['away'], rng.choice('HHDA')))
+    return rows
+
+
+class TeamResolver:
+    """Résout un nom d'équipe vers un identifiant connu (exact, alias, approché)."""
+
+    def __init__(self, known_ids, aliases=None):
+        self.known = set(known_ids)
+        self.aliases = aliases if aliases is not None else {}
+        self.learned = {}
+        self._choices = sorted(self.known)
+
+    def resolve(self, name):
+        team_id = normalize_team(name)
+        if not team_id or team_id in self.known: return team_id or None
+        alias = self.aliases.get(team_id)
+        if alias in self.known: return alias
+        close = difflib.get_close_matches(team_id, self._choices, n=1, cutoff=FUZZY_CUTOFF)
+        if not close:
+            # Nom abrégé ou complété ("marseille" / "olympique-de-marseille")
+            close = [t for t in self._choices if t in team_id or team_id in t]
+            if len(close) != 1: return None
+        self.learned[team_id] = close[0]
+        return close[0]
+
+
+def match_results(book, rows, aliases=None):
+    """Apparie des lignes (domicile, extérieur, issue) aux paris ouverts de `book`.
+
+    Les équipes inversées (extérieur listé en premier) sont reconnues et
+    l'issue retournée. Renvoie (outcomes {bet_id: succès}, lignes non
+    appariées, alias approchés des lignes appariées {alias: team_id}) —
+    ces alias sont à conserver par l'appelant pour les imports suivants.
+    """
+    index = book.by_match()
+    resolver = TeamResolver({team for key in index for team in key}, aliases)
+    matched, unmatched, used = [], [], set()
+    for home, away, outcome in rows:
+        home_id, away_id = resolver.resolve(home), resolver.resolve(away)
+        if (home_id, away_id) in index:
+            matched.append((home_id, away_id, outcome == 'H'))
+        elif (away_id, home_id) in index:
+            matched.append((away_id, home_id, outcome == 'A'))
+        else:
+            unmatched.append((home, away, outcome))
+            continue
+        used.update((normalize_team(home), normalize_team(away)))
+    outcomes, _ = book.match(matched)
+    return outcomes, unmatched, {k: v for k, v in resolver.learned.items() if k in used}
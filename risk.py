@@ -0,0 +1,83 @@
+"""
+Indicateurs de risque calculés en flux (O(1) par pari réglé).
+
+Structure persistée dans bankroll['risk']:
+    equity        capital engagé + disponible (solde + mises ouvertes)
+    peak          plus haut historique de l'equity
+    max_drawdown  plus forte baisse relative depuis un pic (0..1)
+    n, mean, m2   moyenne / variance de Welford des rendements par pari
+    streak        série de pertes en cours
+    longest_losing_streak
+
+Les dépôts et retraits décalent equity et pic du même montant: seul le
+résultat des paris crée un drawdown.
+"""
+
+import math
+
+
+def empty_risk(equity=0.0):
+    return {'equity': equity, 'peak': equity, 'max_drawdown': 0.0,
+            'n': 0, 'mean': 0.0, 'm2': 0.0, 'streak': 0, 'longest_losing_streak': 0}
+
+
+def record(risk, stake, profit, win):
+    """Ajoute un pari réglé: equity, pic, drawdown, Welford et séries."""
+    risk['equity'] += profit
+    risk['peak'] = max(risk['peak'], risk['equity'])
+    risk['max_drawdown'] = max(risk['max_drawdown'], drawdown(risk))
+    if stake > 0:
+        ret = profit / stake
+        risk['n'] += 1
+        delta = ret - risk['mean']
+        risk['mean'] += delta / risk['n']
+        risk['m2'] += delta * (ret - risk['mean'])
+    risk['streak'] = 0 if win else risk['streak'] + 1
+    risk['longest_losing_streak'] = max(risk['longest_losing_streak'], risk['streak'])
+
+
+def shift(risk, amount):
+    """Dépôt (> 0) ou retrait (< 0): sans effet sur le drawdown."""
+    risk['equity'] += amount
+    risk['peak'] += amount
+
+
+def rebuild(history, equity):
+    """Rejoue brain['history'] pour reconstruire l'état; `equity` est l'equity actuelle."""
+    from aggregates import entry_profit
+    profits = [entry_profit(entry) for entry in history]
+    risk = empty_risk(equity - sum(profits))
+    for entry, profit in zip(history, profits):
+        if entry.get('stake', 0.0) > 0:
+            record(risk, entry['stake'], profit, entry.get('result') == 'win')
+    return risk
+
+
+def drawdown(risk):
+    """Drawdown courant relatif au pic (0..1)."""
+    return (risk['peak'] - risk['equity']) / risk['peak'] if risk['peak'] > 0 else 0.0
+
+
+def metrics(risk):
+    """Volatilité des rendements par pari, ratio de Sharpe (par pari) et drawdowns."""
+    n = risk['n']
+    volatility = math.sqrt(risk['m2'] / (n - 1)) if n > 1 else 0.0
+    return {
+        'mean_return': risk['mean'],
+        'volatility': volatility,
+        'sharpe': risk['mean'] / volatility if volatility > 0 else 0.0,
+        'drawdown': drawdown(risk),
+        'max_drawdown': risk['max_drawdown'],
+        'streak': risk['streak'],
+        'longest_losing_streak': risk['longest_losing_streak'],
+    }
+
+
+def cap_kelly(kelly, risk, threshold, cap):
+    """Plafonne la fraction de Kelly à `cap` quand le drawdown dépasse `threshold`.
+
+    Renvoie (fraction, plafonnée?). threshold <= 0 désactive le garde-fou.
+    """
+    if threshold > 0 and risk and drawdown(risk) >= threshold and kelly > cap:
+        return cap, True
+    return kelly, False
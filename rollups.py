@@ -0,0 +1,96 @@
+"""
+Agrégats temporels (jour / semaine ISO / mois) des paris réglés.
+
+Structure persistée dans bankroll['rollups']:
+    {'day': {'2025-03-14': bucket}, 'week': {'2025-W11': bucket}, 'month': {'2025-03': bucket}}
+bucket = {wagered, won, lost, bets, wins}, `won` et `lost` en gains nets
+comme bankroll['total_won'] / bankroll['total_lost'].
+
+Une requête sur une plage de dates est couverte de façon gloutonne par les
+plus gros buckets possibles (mois, puis semaines, puis jours): « les 30
+derniers jours » lit au plus quelques dizaines de buckets.
+"""
+
+from datetime import date, datetime, timedelta
+
+FIELDS = ('wagered', 'won', 'lost', 'bets', 'wins')
+
+
+def _keys(day):
+    iso = day.isocalendar()
+    return {'day': day.isoformat(), 'week': f'{iso[0]}-W{iso[1]:02d}', 'month': day.strftime('%Y-%m')}
+
+
+def _to_date(value):
+    if isinstance(value, datetime): return value.date()
+    if isinstance(value, date): return value
+    return datetime.fromisoformat(value).date()
+
+
+def empty_rollups():
+    return {'day': {}, 'week': {}, 'month': {}}
+
+
+def record(rollups, when, stake, profit, win):
+    """Ajoute un pari réglé aux trois granularités (O(1))."""
+    for granularity, key in _keys(_to_date(when)).items():
+        bucket = rollups[granularity].setdefault(key, dict.fromkeys(FIELDS, 0))
+        bucket['wagered'] += stake
+        bucket['won'] += max(profit, 0)
+        bucket['lost'] += max(-profit, 0)
+        bucket['bets'] += 1
+        bucket['wins'] += 1 if win else 0
+
+
+def rebuild(history):
+    """Reconstruit les rollups depuis brain['history'] (date de règlement, sinon du pronostic)."""
+    from aggregates import entry_profit
+    rollups = empty_rollups()
+    for entry in history:
+        when = entry.get('settled_at') or entry.get('timestamp')
+        if not when: continue
+        record(rollups, when, entry.get('stake', 0.0), entry_profit(entry), entry.get('result') == 'win')
+    return rollups
+
+
+def _month_after(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _cover(start, end):
+    """Découpe [start, end] (dates incluses) en (granularité, clé), plus gros buckets d'abord."""
+    day = start
+    while day <= end:
+        next_month = _month_after(day)
+        if day.day == 1 and next_month - timedelta(days=1) <= end:
+            yield 'month', day.strftime('%Y-%m')
+            day = next_month
+        elif day.weekday() == 0 and day + timedelta(days=6) <= end and (
+                day + timedelta(days=6) < next_month or _month_after(next_month) - timedelta(days=1) > end):
+            # Une semaine à cheval sur deux mois n'est prise que si le mois suivant n'est pas couvert entier
+            yield 'week', _keys(day)['week']
+            day += timedelta(days=7)
+        else:
+            yield 'day', day.isoformat()
+            day += timedelta(days=1)
+
+
+def query(rollups, start, end):
+    """Totaux sur [start, end] avec ROI (%) et précision; 'buckets' = nombre de buckets lus."""
+    totals = dict.fromkeys(FIELDS, 0)
+    read = 0
+    for granularity, key in _cover(_to_date(start), _to_date(end)):
+        read += 1
+        bucket = rollups[granularity].get(key)
+        if bucket:
+            for field in FIELDS: totals[field] += bucket[field]
+    totals['roi'] = (totals['won'] - totals['lost']) / totals['wagered'] * 100 if totals['wagered'] else 0.0
+    totals['accuracy'] = totals['wins'] / totals['bets'] if totals['bets'] else 0.0
+    totals['buckets'] = read
+    return totals
+
+
+def last_days(rollups, days, today=None):
+    """Totaux des `days` derniers jours, aujourd'hui inclus."""
+    today = _to_date(today or date.today())
+    return query(rollups, today - timedelta(days=days - 1), today)
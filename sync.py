@@ -0,0 +1,187 @@
+"""
+Synchronisation des journaux d'événements entre appareils.
+
+Chaque appareil a un identifiant (data_dir/sync.json). Ses propres
+événements sont numérotés par leur séquence locale: (appareil, n) identifie
+un événement partout. L'état connu d'un pair se résume à un vecteur
+{appareil: plus grand n reçu} (brain['sync_vector']): une synchronisation
+n'échange que les événements au-delà de ce vecteur, par lots JSON
+compressés (gzip).
+
+Transports:
+    FolderTransport  dossier partagé (carte SD, dossier synchronisé...):
+                     <racine>/<appareil>/<premier n>-<dernier n>.jsonl.gz
+    HttpTransport    serveur local minimal (`python sync.py serve <dossier>`)
+                     qui stocke les lots dans un FolderTransport. Il n'écoute
+                     que sur 127.0.0.1: l'ouverture au réseau local (sans
+                     authentification) se demande explicitement par --lan.
+
+Conflits: les événements sont ordonnés de façon déterministe par
+(horodatage, appareil, n). Si des événements reçus précèdent des événements
+locaux dans cet ordre, l'état est reconstruit depuis le dernier point de
+contrôle en rejouant l'union triée: poids et compteurs convergent sur tous
+les appareils. Un événement antérieur à ce point de contrôle est appliqué
+à sa suite.
+"""
+
+import gzip
+import json
+import os
+import sys
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_SUFFIX = '.jsonl.gz'
+
+
+def origin(event, device):
+    """(appareil, n) d'un événement; un événement local n'a que sa séquence."""
+    return (event['dev'], event['n']) if 'dev' in event else (device, event['seq'])
+
+
+def canonical_key(event, device):
+    return (event['ts'],) + origin(event, device)
+
+
+def encode_batch(events):
+    lines = ''.join(json.dumps(e, ensure_ascii=False, separators=(',', ':')) + '\n' for e in events)
+    return gzip.compress(lines.encode('utf-8'))
+
+
+def decode_batch(data):
+    return [json.loads(line) for line in gzip.decompress(data).decode('utf-8').splitlines() if line]
+
+
+def outgoing(journal, device, since):
+    """Événements créés sur cet appareil après le n `since`, au format d'échange."""
+    return [{'dev': device, 'n': e['seq'], 'ts': e['ts'], 'type': e['type'], 'data': e['data']}
+            for e in journal.events(after=since) if 'dev' not in e]
+
+
+class FolderTransport:
+    """Lots d'événements déposés dans un dossier partagé, un sous-dossier par appareil."""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _batches(self, device):
+        path = os.path.join(self.root, device)
+        if not os.path.isdir(path): return []
+        batches = []
+        for name in os.listdir(path):
+            if not name.endswith(_SUFFIX): continue
+            first, _, last = name[:-len(_SUFFIX)].partition('-')
+            batches.append((int(first), int(last), os.path.join(path, name)))
+        return sorted(batches)
+
+    def devices(self):
+        return [d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d))]
+
+    def vector(self):
+        """{appareil: plus grand n déposé}, lu sur les noms de fichiers."""
+        vector = {}
+        for device in self.devices():
+            batches = self._batches(device)
+            if batches: vector[device] = batches[-1][1]
+        return vector
+
+    def push(self, device, events):
+        if not events: return 0
+        from persistence import atomic_write
+        path = os.path.join(self.root, device)
+        os.makedirs(path, exist_ok=True)
+        name = f"{events[0]['n']:010d}-{events[-1]['n']:010d}{_SUFFIX}"
+        atomic_write(os.path.join(path, name), encode_batch(events))
+        return len(events)
+
+    def pull(self, vector, device):
+        """Événements des autres appareils au-delà de `vector`."""
+        events = []
+        for other in self.devices():
+            if other == device: continue
+            since = vector.get(other, 0)
+            for _, last, path in self._batches(other):
+                if last <= since: continue
+                with open(path, 'rb') as f:
+                    events += [e for e in decode_batch(f.read()) if e['n'] > since]
+        return events
+
+
+class HttpTransport:
+    """Client du serveur de synchronisation local (même interface que FolderTransport)."""
+
+    def __init__(self, url, timeout=15):
+        self.url, self.timeout = url.rstrip('/'), timeout
+
+    def _request(self, path, data=None, **params):
+        url = f'{self.url}/{path}' + (f'?{urllib.parse.urlencode(params)}' if params else '')
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=self.timeout) as r:
+            return r.read()
+
+    def vector(self):
+        return json.loads(self._request('vector'))
+
+    def push(self, device, events):
+        if not events: return 0
+        return json.loads(self._request('push', encode_batch(events), device=device))['count']
+
+    def pull(self, vector, device):
+        return decode_batch(self._request('pull', device=device, vector=json.dumps(vector)))
+
+
+def transport_for(target):
+    """Transport selon la cible: URL http(s) ou chemin de dossier."""
+    return HttpTransport(target) if target.startswith(('http://', 'https://')) else FolderTransport(target)
+
+
+def make_server(root, host='127.0.0.1', port=8765):
+    """Serveur HTTP minimal: GET /vector, POST /push?device=, GET /pull?device=&vector=.
+
+    Local par défaut; host='0.0.0.0' l'expose à tout le réseau, sans authentification.
+    """
+    store = FolderTransport(root)
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, body, kind='application/json'):
+            self.send_response(200)
+            self.send_header('Content-Type', kind)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            query = dict(urllib.parse.parse_qsl(url.query))
+            if url.path == '/vector':
+                self._reply(json.dumps(store.vector()).encode('utf-8'))
+            elif url.path == '/pull':
+                events = store.pull(json.loads(query.get('vector', '{}')), query.get('device', ''))
+                self._reply(encode_batch(events), 'application/gzip')
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            url = urllib.parse.urlsplit(self.path)
+            device = dict(urllib.parse.parse_qsl(url.query)).get('device', '')
+            if url.path != '/push' or not device.isalnum():
+                return self.send_error(400)
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            count = store.push(device, decode_batch(body))
+            self._reply(json.dumps({'count': count}).encode('utf-8'))
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+if __name__ == '__main__':
+    args = [a for a in sys.argv[1:] if a != '--lan']
+    if len(args) < 2 or args[0] != 'serve':
+        sys.exit('Usage: python sync.py serve <dossier> [port] [--lan]')
+    host = '0.0.0.0' if '--lan' in sys.argv else '127.0.0.1'
+    server = make_server(args[1], host, int(args[2]) if len(args) > 2 else 8765)
+    print(f'Synchronisation: http://{server.server_address[0]}:{server.server_address[1]}')
+    server.serve_forever()
@@ -0,0 +1,50 @@
+"""
+Configuration des tests: fenêtre Kivy hors écran (SDL offscreen) et dossier
+de données temporaire.
+
+main.py crée son DataManager global à l'import (dans ~/.elite_neural):
+HOME est redirigé avant tout import de main.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ['KIVY_NO_ARGS'] = '1'
+os.environ['SDL_VIDEODRIVER'] = 'offscreen'  # écrans construits sans affichage
+os.environ['HOME'] = tempfile.mkdtemp(prefix='elite-neural-tests-')
+sys.path.insert(0, ROOT)
+
+
+def env():
+    """Environnement d'un processus relancé (tests de reprise après arrêt)."""
+    return dict(os.environ, PYTHONPATH=ROOT)
+
+
+@pytest.fixture
+def dm(tmp_path):
+    import main
+    manager = main.DataManager(data_dir=str(tmp_path))
+    yield manager
+    close(manager)
+
+
+def close(manager):
+    manager.committer.flush(timeout=5)
+    manager.journal.close()
+    manager.lock.close()
+
+
+def reopen(manager):
+    """Ferme `manager` (écritures terminées) et relance un DataManager sur le même dossier."""
+    import main
+    close(manager)
+    return main.DataManager(data_dir=manager.data_dir)
+
+
+def pred(i, stake=10.0, odds=2.0):
+    return {'home': f'Home{i}', 'away': f'Away{i}', 'odds': odds, 'stake': stake,
+            'factors': {'Forme': 0.2, 'xG': 0.4}, 'timestamp': '2026-01-01T00:00:00', 'ev': 0.1}
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from aggregates import leaderboard, rebuild_team_stats
+
+TEAMS = ['Olympique Lyon', 'Paris SG', 'Lens', 'Nantes', 'Stade Rennais', 'AS Monaco']
+
+
+def test_incremental_team_stats_equal_rebuild(dm):
+    rng = random.Random(5)
+    dm.dispatch('deposit', amount=10000)
+    for i in range(120):
+        home, away = rng.sample(TEAMS, 2)
+        bet = {'home': home, 'away': away, 'odds': round(rng.uniform(1.3, 4.0), 2),
+               'stake': round(rng.uniform(1, 30), 2), 'ev': round(rng.uniform(-0.1, 0.2), 3),
+               'factors': {'Forme': 0.2}, 'timestamp': f'2025-01-01T00:{i // 60:02d}:{i % 60:02d}'}
+        if i % 5 == 0:
+            dm.dispatch('import', bets=[dict(bet, success=rng.random() < 0.5)])
+        else:
+            dm.dispatch('place', pred=bet)
+            if i % 3:
+                book = dm.bankroll['open_bets']
+                dm.dispatch('settle', outcomes={b['id']: rng.random() < 0.5 for b in book},
+                            refs={b['id']: b['placed_at'] for b in book})
+        assert dm.brain['team_stats'] == rebuild_team_stats(dm.brain['history'])
+    assert len(dm.brain['history']) > 80
+
+
+def _entry(home, away, win, stake=10.0, odds=2.0, ev=0.0):
+    return {'match': f'{home} vs {away}', 'result': 'win' if win else 'loss',
+            'stake': stake, 'odds': odds, 'ev': ev}
+
+
+def _stats():
+    return rebuild_team_stats([
+        # Le résultat du pari compte pour les deux équipes du match
+        _entry('Lyon', 'Lens', True, odds=3.0, ev=0.10),    # +20
+        _entry('Lyon', 'Nantes', False, ev=0.05),           # -10
+        _entry('Lens', 'Lyon', True, odds=1.8, ev=0.02),    # +8
+        _entry('Nantes', 'Lens', True, odds=2.0, ev=0.20),  # +10
+        _entry('Nantes', 'Lyon', False, ev=-0.05),          # -10
+    ])
+
+
+def _order(stats, sort_key, role=None, min_bets=1):
+    return [team_id for team_id, _, _ in leaderboard(stats, sort_key, role, min_bets)]
+
+
+def test_leaderboard_orders():
+    stats = _stats()
+    # Tous rôles: Lens 3/3 (+38 / 30), Lyon 2/4 (+8 / 40), Nantes 1/3 (-10 / 30)
+    assert _order(stats, 'roi') == ['lens', 'lyon', 'nantes']
+    assert _order(stats, 'accuracy') == ['lens', 'lyon', 'nantes']
+    assert _order(stats, 'bets')[0] == 'lyon'
+    assert _order(stats, 'avg_ev') == ['lens', 'nantes', 'lyon']
+    lyon = {t: m for t, _, m in leaderboard(stats)}['lyon']
+    assert (lyon['bets'], lyon['accuracy']) == (4, 0.5)
+    assert (lyon['roi'], lyon['avg_ev'], lyon['profit']) == pytest.approx((20.0, 0.03, 8.0))
+
+
+def test_leaderboard_role_filters():
+    stats = _stats()
+    # Domicile: Lens 1 (+8 / 10), Lyon 2 (+10 / 20), Nantes 2 (+0 / 20)
+    assert _order(stats, 'roi', 'home') == ['lens', 'lyon', 'nantes']
+    assert _order(stats, 'bets', 'home')[-1] == 'lens'
+    # Extérieur: Lens 2 (+30 / 20), Lyon 2 (-2 / 20), Nantes 1 (-10 / 10)
+    assert _order(stats, 'roi', 'away') == ['lens', 'lyon', 'nantes']
+    assert _order(stats, 'accuracy', 'away') == ['lens', 'lyon', 'nantes']
+    assert _order(stats, 'roi', 'away', min_bets=2) == ['lens', 'lyon']
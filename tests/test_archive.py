@@ -0,0 +1,85 @@
+import copy
+from datetime import datetime, timedelta
+
+from archive import SEGMENT_SIZE, WINDOW
+from conftest import close, reopen
+from history_index import normalize_team, team_ids
+
+TEAMS = ['Olympique Marseille', 'Olympique Lyon', 'Paris SG', 'Lens', 'Nantes', 'Rennes']
+TOTAL = 4500
+
+
+def _bets():
+    start = datetime(2024, 1, 1)
+    bets = []
+    for i in range(TOTAL):
+        home, away = TEAMS[i % 6], TEAMS[(i + 1 + i // 6) % 6]
+        if home == away: away = 'Brest'
+        if 1200 <= i < 1210: home = 'Lonely FC'  # équipe d'un seul segment archivé
+        bets.append({'home': home, 'away': away, 'odds': 2.0, 'stake': 10.0, 'ev': 0.05,
+                     'factors': {'Forme': 0.2}, 'success': i % 3 == 0,
+                     'timestamp': (start + timedelta(hours=6 * i)).isoformat()})
+    return bets
+
+
+def _brute(full, team=None, period=None, result=None):
+    key = normalize_team(team) if team else ''
+    return sorted(row for row, e in enumerate(full)
+                  if (not period or e['timestamp'].startswith(period))
+                  and (not result or e['result'] == result)
+                  and (not key or any(t.startswith(key) for t in team_ids(e))))
+
+
+def test_history_rolls_into_archives_through_dispatch(dm):
+    dm.dispatch('deposit', amount=100000)
+    for chunk in range(0, TOTAL, 900):
+        dm.dispatch('import', bets=_bets()[chunk:chunk + 900])
+    full = copy.deepcopy(dm.brain['history'])
+    dm.commit_state()
+
+    # Fenêtre résidente bornée, numéros de ligne globaux
+    offset = dm.brain['history_offset']
+    assert offset == 3 * SEGMENT_SIZE and len(dm.brain['history']) < WINDOW + SEGMENT_SIZE
+    assert dm.bankroll['transactions_offset'] > 0
+    view = dm.log('history')
+    assert len(view) == TOTAL
+    assert list(view[offset - 7:offset + 5]) == full[offset - 7:offset + 5]
+    assert list(view[SEGMENT_SIZE - 3:2 * SEGMENT_SIZE + 3:2]) == full[SEGMENT_SIZE - 3:2 * SEGMENT_SIZE + 3:2]
+    assert view[-1] == full[-1] and view[0] == full[0]
+    assert list(view) == full
+
+    # Recherche: mêmes lignes qu'un parcours complet
+    for query in [{'team': 'olympique'}, {'team': 'Lens', 'result': 'win'}, {'period': '2024-06'},
+                  {'team': 'nantes', 'period': '2025'}, {'result': 'loss'}]:
+        assert sorted(dm.search_history(**query)) == _brute(full, **query)
+
+    # Les segments sont écartés sur leur résumé, sans décompression
+    archive, reads = dm.archive('history'), []
+    real_read = archive.read
+    archive.read = lambda meta: reads.append(meta['first']) or real_read(meta)
+    assert sorted(dm.search_history(team='lonely')) == list(range(1200, 1210))
+    assert reads == [1000]
+    reads.clear()
+    last = full[-1]['timestamp'][:10]
+    assert dm.search_history(period=last) == _brute(full, period=last)[::-1]
+    assert reads == []
+    del archive.read
+
+    # Rechargement: même vue, livre cohérent
+    dm = reopen(dm)
+    try:
+        assert list(dm.log('history')) == full
+        assert dm.reconcile() == {}
+        # Réinitialisation: nouvelle époque, anciennes archives intactes
+        dm.dispatch('reset')
+        dm.dispatch('deposit', amount=50)
+        dm.commit_state()
+        dm = reopen(dm)
+        assert dm.brain['epoch'] == dm.bankroll['epoch'] == 1
+        assert len(dm.log('history')) == 0 and dm.brain.get('history_offset', 0) == 0
+        assert dm.bankroll['current_balance'] == 50
+        assert dm.reconcile() == {}
+        assert len(dm.archive('history').segments(10 ** 9)) == 0
+        assert dm.state_at(dm.journal.seq - 2).brain['history_offset'] == offset
+    finally:
+        close(dm)
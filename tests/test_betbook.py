@@ -0,0 +1,46 @@
+from betbook import BetBook
+from conftest import pred
+
+
+def test_place_debits_stake_and_posts_wager(dm):
+    dm.dispatch('deposit', amount=100)
+    dm.dispatch('place', pred=pred(1, stake=12.5))
+    dm.dispatch('place', pred=pred(2, stake=7.25))
+    assert dm.bankroll['current_balance'] == 80.25
+    assert dm.bankroll['total_wagered'] == 19.75
+    assert [bet['stake'] for bet in dm.bets] == [12.5, 7.25]
+    assert BetBook(dm.bankroll).exposure() == 19.75
+    assert dm.ledger.balance('wagers') == 1975 and dm.ledger.balance() == 8025
+    assert dm.reconcile() == {}
+
+
+def test_settle_batch_removes_exactly_the_marked_bets(dm):
+    dm.dispatch('deposit', amount=200)
+    for i in range(6):
+        dm.dispatch('place', pred=pred(i, stake=10))
+    ids = [bet['id'] for bet in dm.bets]
+    marked = {ids[1]: True, ids[3]: False, ids[4]: True, 999: True}  # 999: pari inconnu, ignoré
+    dm.dispatch('settle', outcomes=marked)
+    assert [bet['id'] for bet in dm.bets] == [ids[0], ids[2], ids[5]]
+    assert [h['match'] for h in dm.brain['history']] == ['Home1 vs Away1', 'Home3 vs Away3', 'Home4 vs Away4']
+    assert dm.bankroll['current_balance'] == 200 - 60 + 2 * 20
+    assert dm.ledger.balance('wagers') == 3000
+    assert dm.reconcile() == {}
+
+
+def test_match_pairs_by_normalized_team_id():
+    bankroll = {}
+    book = BetBook(bankroll)
+    psg = book.add({'home': 'Paris Saint-Germain', 'away': 'AS Saint-Étienne', 'stake': 5})
+    psg_again = book.add({'home': 'Paris Saint-Germain', 'away': 'AS Saint-Étienne', 'stake': 2})
+    om = book.add({'home': 'Olympique de Marseille', 'away': 'Lens', 'stake': 5})
+    outcomes, unmatched = book.match([
+        ('paris saint germain', 'AS SAINT ETIENNE', True),
+        ('Lens', 'Olympique de Marseille', False),  # domicile/extérieur inversés: pas d'appariement
+        ('Nantes', 'Rennes', True),
+    ])
+    assert outcomes == {psg['id']: True, psg_again['id']: True}
+    assert unmatched == [('Lens', 'Olympique de Marseille', False), ('Nantes', 'Rennes', True)]
+    outcomes, _ = book.match([('  Olympique-de-Marseille ', 'LENS', 0)])
+    assert outcomes == {om['id']: False}
+    assert [bet for bet, _ in book.take(outcomes)] == [om] and len(book) == 2
@@ -0,0 +1,21 @@
+import math
+
+import bulk_import
+
+
+def test_unparsable_cells_become_nan_without_dropping_the_column():
+    values = bulk_import._floats(['1,5', 'n/a', '', ' 2 ', '-3.', '1e3', '--4', '.5'])
+    expected = [1.5, None, None, 2.0, -3.0, 1000.0, None, 0.5]
+    for value, want in zip(values, expected):
+        assert math.isnan(value) if want is None else value == want
+
+
+def test_invalid_rows_are_rejected_by_mask():
+    rows = [{'date': '2025-03-01', 'match': 'Lyon vs Nice', 'odds': '2,1', 'stake': '10', 'result': 'W'},
+            {'date': '2025-03-02', 'match': 'Lens vs Brest', 'odds': 'n/a', 'stake': '5', 'result': 'L'},
+            {'date': '2025-02-01', 'match': 'Metz vs Reims', 'odds': '1.8', 'stake': 'x', 'result': 'gagné'},
+            {'date': '2025-01-15', 'match': 'Nantes vs Lille', 'odds': '3', 'stake': '4', 'result': 'perdu'}]
+    bets, rejected = bulk_import.validate(rows)
+    assert [b['home'] for b in bets] == ['Nantes', 'Lyon']
+    assert bets[1]['odds'] == 2.1
+    assert rejected == [(1, 'cote invalide'), (2, 'mise invalide')]
@@ -0,0 +1,69 @@
+import random
+
+from charts import DownsampledSeries, equity_values
+from ledger import Ledger
+
+
+def _walk(n, seed=7):
+    rng, value, values = random.Random(seed), 0.0, []
+    for _ in range(n):
+        value += rng.gauss(0, 1)
+        values.append(value)
+    return values
+
+
+def test_downsampling_keeps_global_peak_and_trough():
+    values = _walk(100_000)
+    series = DownsampledSeries(width=300)
+    series.extend(values)
+    points = series.points()
+    assert len(points) <= 2 * 301
+    assert [i for i, _ in points] == sorted(i for i, _ in points)
+    peak, trough = values.index(max(values)), values.index(min(values))
+    assert (peak, values[peak]) in points and (trough, values[trough]) in points
+    assert series.bounds() == (min(values), max(values))
+
+
+def test_incremental_appends_equal_from_scratch():
+    values, rng = _walk(100_000, seed=11), random.Random(3)
+    scratch = DownsampledSeries(width=257)
+    scratch.extend(values)
+    incremental, pos = DownsampledSeries(width=257), 0
+    while pos < len(values):
+        step = rng.choice([1, 2, 7, 300, 4096])
+        if step == 1: incremental.append(values[pos])
+        else: incremental.extend(values[pos:pos + step])
+        pos += step
+    assert incremental.points() == scratch.points()
+    assert incremental.bucket_size == scratch.bucket_size
+
+
+def _legacy_bankroll():
+    """Transactions au format d'origine: gain = retour brut, perte = -mise, pas de solde."""
+    txs, balance = [], 0.0
+    def row(kind, amount, delta):
+        nonlocal balance
+        balance += delta
+        txs.append({'type': kind, 'amount': amount})
+        return balance
+    expected = [row('deposit', 100.0, 100.0), row('win', 20.0, 10.0), row('loss', -10.0, -10.0),
+                row('win', 30.0, 20.0), row('withdrawal', -5.0, -5.0)]
+    bankroll = {'current_balance': balance, 'total_won': 30.0, 'total_lost': 10.0, 'total_wagered': 30.0}
+    return txs, expected, bankroll
+
+
+def test_equity_of_legacy_rows_uses_opening_winnings():
+    txs, expected, bankroll = _legacy_bankroll()
+    ledger = Ledger()
+    ledger.open_from(bankroll)
+    won = -ledger.opening_balance('winnings') / 100
+    assert won == 30.0
+    # Lignes récentes (avec solde) après la mise à jour
+    txs += [{'type': 'deposit', 'amount': 50.0, 'balance': 165.0},
+            {'type': 'win', 'amount': 18.0, 'balance': 174.0}]
+    expected += [165.0, 174.0]
+    assert list(equity_values(txs, won=won)) == expected
+    for start in range(len(txs)):
+        assert list(equity_values(txs, start, won)) == expected[start:]
+    # Sans totaux d'ouverture, le retour brut est compté
+    assert list(equity_values(txs[:2]))[-1] == 120.0
@@ -0,0 +1,62 @@
+import subprocess
+import sys
+
+from conftest import env
+
+WRITER = """
+import sys, main
+manager = main.DataManager(data_dir=sys.argv[1])
+for i in range(60):
+    manager.dispatch('deposit', amount=1.0)
+    if i % 20 == 19: manager.commit_state()
+manager.committer.flush(timeout=5)
+manager.journal.close()
+"""
+
+
+def test_two_processes_dispatch_into_one_directory(tmp_path):
+    data_dir = str(tmp_path / 'shared')
+    writers = [subprocess.Popen([sys.executable, '-c', WRITER, data_dir], env=env(), cwd=str(tmp_path),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for _ in range(2)]
+    assert [writer.wait(timeout=120) for writer in writers] == [0, 0]
+
+    import main
+    manager = main.DataManager(data_dir=data_dir)
+    try:
+        seqs = [event['seq'] for event in manager.journal.events()]
+        assert seqs == list(range(1, 121))
+        assert manager.bankroll['current_balance'] == 120.0
+        assert manager.reconcile() == {}
+    finally:
+        manager.committer.flush(timeout=5)
+        manager.journal.close()
+        manager.lock.close()
+
+
+def test_refresh_skips_unchanged_files(dm, tmp_path, monkeypatch):
+    import main
+    dm.dispatch('deposit', amount=10)
+    dm.save_settings()
+    dm.commit_state()
+    dm.committer.flush(timeout=5)
+    parsed = []
+    real = main.read_store
+    monkeypatch.setattr(main, 'read_store', lambda path: parsed.append(path) or real(path))
+    assert not dm.refresh()
+    assert parsed == []
+
+    other = main.DataManager(data_dir=dm.data_dir)
+    try:
+        other.settings['kelly_fraction'] = 0.5
+        other.save_settings()
+        other.dispatch('deposit', amount=5)
+    finally:
+        other.journal.close()
+        other.lock.close()
+    parsed.clear()
+    assert dm.refresh()
+    assert parsed == [dm.settings_file]  # stores inchangés: seul le journal est rejoué
+    assert dm.settings['kelly_fraction'] == 0.5
+    assert dm.bankroll['current_balance'] == 15.0
+    assert not dm.refresh()
+    assert parsed == [dm.settings_file]
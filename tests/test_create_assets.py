@@ -0,0 +1,52 @@
+import struct
+import zlib
+
+import pytest
+
+import create_assets
+
+
+def _chunks(data):
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    pos, chunks = 8, {}
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        assert struct.unpack('>I', data[pos + 8 + length:pos + 12 + length])[0] == zlib.crc32(kind + body)
+        chunks.setdefault(kind, body)
+        pos += 12 + length
+    return chunks
+
+
+@pytest.fixture
+def out_dir(tmp_path, monkeypatch):
+    out = tmp_path / 'assets'
+    monkeypatch.setattr(create_assets, 'OUT_DIR', str(out))
+    monkeypatch.setattr(create_assets, 'MANIFEST', str(out / '.manifest.json'))
+    monkeypatch.setattr(create_assets, 'backend', lambda: 'basic')
+    return out
+
+
+def test_second_run_regenerates_nothing(out_dir):
+    jobs = create_assets.jobs()
+    assert create_assets.create_assets(workers=2) == (len(jobs), 0)
+    assert create_assets.create_assets(workers=2) == (0, len(jobs))
+    for path, _, width, height in jobs:
+        with open(path, 'rb') as f:
+            ihdr = _chunks(f.read())[b'IHDR']
+        assert struct.unpack('>II', ihdr[:8]) == (width, height)
+    # Une sortie supprimée est la seule refaite
+    (out_dir / 'notification.png').unlink()
+    assert create_assets.create_assets(workers=2) == (1, len(jobs) - 1)
+
+
+def test_notification_icon_is_a_white_silhouette():
+    chunks = _chunks(create_assets.render_basic('notification', 48, 48))
+    palette = [tuple(chunks[b'PLTE'][i:i + 3]) for i in range(0, len(chunks[b'PLTE']), 3)]
+    alpha = list(chunks[b'tRNS']) + [255] * (len(palette) - len(chunks[b'tRNS']))
+    opaque = {color for color, a in zip(palette, alpha) if a}
+    assert opaque == {(255, 255, 255)}
+    pixels = zlib.decompress(chunks[b'IDAT'])
+    rows = [pixels[y * 49 + 1:(y + 1) * 49] for y in range(48)]
+    assert alpha[rows[0][0]] == 0 and alpha[rows[24][24]] == 0  # coin et centre transparents
+    assert any(alpha[i] for row in rows for i in row)
@@ -0,0 +1,31 @@
+import csv
+
+import exporters
+
+
+def _rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_incremental_export_appends_new_rows(tmp_path):
+    exporter = exporters.Exporter(str(tmp_path))
+    txs = [{'type': 'deposit', 'amount': float(i), 'timestamp': f'2026-01-0{i + 1}'} for i in range(3)]
+    args = (exporters.transaction_row, exporters.TRANSACTION_COLUMNS)
+    assert exporter.export('transactions', txs, *args)[0] == 3
+    txs.append({'type': 'withdrawal', 'amount': -1.0, 'timestamp': '2026-01-05'})
+    written, path = exporter.export('transactions', txs, *args)
+    assert written == 1
+    assert [r['type'] for r in _rows(path)] == ['deposit'] * 3 + ['withdrawal']
+
+
+def test_new_epoch_reexports_even_when_log_grew_past_cursor(tmp_path):
+    exporter = exporters.Exporter(str(tmp_path))
+    args = (exporters.transaction_row, exporters.TRANSACTION_COLUMNS)
+    old = [{'type': 'deposit', 'amount': 1.0, 'timestamp': '2025-01-01'}] * 2
+    exporter.export('transactions', old, *args, epoch=0)
+    # Réinitialisation puis plus de lignes qu'avant: le curseur (2) ne suffit pas à la détecter
+    new = [{'type': 'withdrawal', 'amount': -2.0, 'timestamp': '2026-01-01'}] * 3
+    written, path = exporters.Exporter(str(tmp_path)).export('transactions', new, *args, epoch=1)
+    assert written == 3
+    assert [r['type'] for r in _rows(path)] == ['withdrawal'] * 3
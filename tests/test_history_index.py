@@ -0,0 +1,49 @@
+from history_index import HistoryIndex, normalize_team, team_ids
+
+# Lignes dans l'ordre d'ajout, dates volontairement désordonnées (imports antidatés)
+ENTRIES = [
+    ('Olympique Marseille', 'Lens', '2025-03-20T20:00:00'),
+    ('Olympique Lyon', 'Nantes', '2025-01-05T18:00:00'),
+    ('Paris SG', 'Olympique Lyon', '2025-03-02T21:00:00'),
+    ('Olympique Lyon', 'Olympique Marseille', '2025-03-10T20:45:00'),
+    ('Olympiakos', 'Lens', '2024-12-01T19:00:00'),
+    ('Rennes', 'Olympique Marseille', '2025-04-01T15:00:00'),
+    ('Lens', 'Olympiakos', '2025-03-02T21:00:00'),
+]
+
+
+def _index():
+    history = [{'match': f'{home} vs {away}', 'home_id': normalize_team(home), 'away_id': normalize_team(away),
+                'timestamp': ts} for home, away, ts in ENTRIES]
+    index = HistoryIndex()
+    index.sync(history)
+    return history, index
+
+
+def _expected(history, keep, period=''):
+    rows = [row for row, e in enumerate(history) if keep(team_ids(e)) and e['timestamp'].startswith(period)]
+    return sorted(rows, key=lambda row: (history[row]['timestamp'], row), reverse=True)
+
+
+def test_exact_team_query():
+    history, index = _index()
+    assert index.search('Olympique Lyon') == _expected(history, lambda ids: 'olympique-lyon' in ids) == [3, 2, 1]
+    # Équipe connue: le nom complet n'est pas étendu aux autres équipes du préfixe
+    assert index.search('olympique', exact=True) == []
+
+
+def test_prefix_query_merges_teams_by_date():
+    history, index = _index()
+    rows = index.search('olymp')
+    assert rows == _expected(history, lambda ids: any(t.startswith('olymp') for t in ids))
+    assert rows == [5, 0, 3, 6, 2, 1, 4]
+    assert len(rows) == len(set(rows))  # Lyon - Marseille une seule fois
+
+
+def test_date_filtered_queries():
+    history, index = _index()
+    assert index.search('olymp', period='2025-03') == _expected(
+        history, lambda ids: any(t.startswith('olymp') for t in ids), '2025-03') == [0, 3, 6, 2]
+    assert index.search('Lens', period='2025') == [0, 6]
+    assert index.search(period='2025-03-02') == [6, 2]
+    assert index.search(period='2023') == []
@@ -0,0 +1,109 @@
+import copy
+import os
+import subprocess
+import sys
+
+from conftest import close, env, pred, reopen
+from journal import KEEP_SNAPSHOTS, Journal
+from persistence import atomic_write, encode_store
+
+CRASH = "import os, main; main.data_manager.dispatch('deposit', amount=42.0); os._exit(0)"
+RELAUNCH = "import main; print(main.data_manager.bankroll['current_balance'])"
+
+
+def test_relaunch_replays_events_dispatched_without_commit(tmp_path):
+    # Arrêt brutal juste après l'événement: aucun store réécrit, aucun sync() attendu
+    relaunch_env = dict(env(), HOME=str(tmp_path))
+    subprocess.run([sys.executable, '-c', CRASH], env=relaunch_env, cwd=str(tmp_path), check=True)
+    out = subprocess.run([sys.executable, '-c', RELAUNCH], env=relaunch_env, cwd=str(tmp_path),
+                         check=True, capture_output=True, text=True).stdout
+    assert float(out.strip().splitlines()[-1]) == 42.0
+
+
+def test_group_commit_syncs_in_background(tmp_path):
+    journal = Journal(str(tmp_path))
+    for i in range(50):
+        journal.append('deposit', {'amount': i})
+    assert journal.sync(timeout=5)
+    journal.close()
+    reopened = Journal(str(tmp_path))
+    assert reopened.seq == 50
+    assert [e['data']['amount'] for e in reopened.events()] == list(range(50))
+
+
+def _live(dm):
+    return copy.deepcopy(dm.brain), copy.deepcopy(dm.bankroll), dm.ledger.to_bytes()
+
+
+def _play(dm, count, recorded):
+    """Dépôts, placements et règlements mêlés; état vivant relevé après chaque événement."""
+    for i in range(count):
+        if i % 4 == 0:
+            event = dm.dispatch('deposit', amount=100 + i)
+        elif i % 4 == 1:
+            event = dm.dispatch('place', pred=pred(i, stake=5 + i % 7))
+        elif i % 4 == 2:
+            bet = dm.bankroll['open_bets'][0]
+            event = dm.dispatch('settle', outcomes={bet['id']: i % 3 == 0}, refs={bet['id']: bet['placed_at']})
+        else:
+            event = dm.dispatch('withdrawal', amount=3)
+        recorded[event['seq']] = _live(dm)
+
+
+def test_state_at_matches_live_state(dm):
+    recorded = {}
+    for _ in range(3):
+        _play(dm, 9, recorded)
+        dm.commit_state(checkpoint=True)
+    _play(dm, 5, recorded)
+    dm.committer.flush(timeout=5)
+    assert len(dm.journal.snapshots()) > 2
+    for seq, (brain, bankroll, ledger) in recorded.items():
+        state = dm.state_at(seq)
+        assert state.seq == seq
+        assert (state.brain, state.bankroll, state.ledger.to_bytes()) == (brain, bankroll, ledger)
+
+
+def test_mismatched_stores_fall_back_to_newest_valid_snapshot(dm):
+    recorded = {}
+    _play(dm, 6, recorded)
+    dm.commit_state(checkpoint=True)
+    older = dm.ledger.seq
+    _play(dm, 6, recorded)
+    dm.commit_state(checkpoint=True)
+    newest = dm.ledger.seq
+    _play(dm, 6, recorded)
+    dm.commit_state()
+    stale = recorded[older][1]
+    expected = _live(dm)
+    close(dm)
+    # Bankroll d'un commit antérieur: numéros de séquence incohérents entre les trois stores
+    atomic_write(dm.bankroll_file, encode_store(stale, dm.codec))
+    dm = reopen(dm)
+    try:
+        assert dm._latest_snapshot().seq == newest
+        assert _live(dm) == expected and dm.reconcile() == {}
+    finally:
+        close(dm)
+    # Snapshot le plus récent incomplet: reprise au précédent, même état final
+    atomic_write(dm.bankroll_file, encode_store(stale, dm.codec))
+    os.remove(os.path.join(dm.journal.snapshot_dir(newest), 'ledger.bin'))
+    dm = reopen(dm)
+    try:
+        assert dm._latest_snapshot().seq == older
+        assert _live(dm) == expected and dm.reconcile() == {}
+    finally:
+        close(dm)
+
+
+def test_snapshot_pruning_keeps_genesis_and_latest(dm):
+    dm.commit_state()  # snapshot de genèse, comme au premier démarrage de l'application
+    genesis = dm.journal.snapshots()[0]
+    taken = []
+    for i in range(KEEP_SNAPSHOTS + 4):
+        dm.dispatch('deposit', amount=10)
+        dm.commit_state(checkpoint=True)
+        taken.append(dm.ledger.seq)
+    dm.committer.flush(timeout=5)
+    assert dm.journal.snapshots() == [genesis] + taken[-KEEP_SNAPSHOTS:]
+    assert dm.state_at(genesis).seq == genesis
@@ -0,0 +1,27 @@
+from ledger import Ledger
+
+
+def test_backdated_posts_keep_their_dates():
+    ledger = Ledger()
+    ledger.deposit(100, ts=2_000_000)
+    # Paris historiques importés après coup, antérieurs au dépôt
+    ledger.deposit(50, ts=1_000_000)
+    ledger.wager(10, ts=1_000_100)
+    ledger.settle(10, 10, True, ts=1_000_200)
+    assert ledger.balance_at(999_999) == 0
+    assert ledger.balance_at(1_000_000) == 5000
+    assert ledger.balance_at(1_000_100) == 4000
+    assert ledger.balance_at(1_500_000) == 6000
+    assert ledger.balance_at(2_000_000) == 16000
+    assert list(ledger.ts) == sorted(ledger.ts)
+    bankroll = {'current_balance': 160.0, 'total_won': 10.0, 'total_lost': 0.0, 'total_wagered': 10.0}
+    assert ledger.reconcile(bankroll) == {}
+
+
+def test_round_trip_after_backdated_posts():
+    ledger = Ledger()
+    ledger.deposit(100, ts=2_000_000)
+    ledger.deposit(50, ts=1_000_000)
+    restored = Ledger.from_bytes(ledger.to_bytes())
+    assert restored.balance_at(1_500_000) == 5000
+    assert list(restored.running) == [5000, 15000]
@@ -0,0 +1,54 @@
+import json
+import random
+
+from profiler import _NULL_SPAN, Profiler
+
+
+def test_disabled_spans_are_the_shared_noop():
+    profiler = Profiler()
+    assert profiler.span('a') is _NULL_SPAN and profiler.span('b') is _NULL_SPAN
+    with profiler.span('a'):
+        pass
+    calls = profiler.timed('f')(lambda x: x * 2)
+    assert calls(21) == 42
+    assert len(profiler.spans) == 0 and profiler.format_summary() == 'Profilage désactivé'
+    profiler.enable()
+    assert profiler.span('a') is not _NULL_SPAN
+
+
+def test_percentiles_on_known_distribution():
+    profiler = Profiler(capacity=1000)
+    durations = list(range(1, 101))
+    random.Random(2).shuffle(durations)
+    for ms in durations:
+        profiler.record('net.fetch', 0, ms * 1_000_000)
+    profiler.record('ui.frame', 0, 3_000_000)
+    stats = profiler.summary()
+    assert stats['net.fetch'] == {'count': 100, 'total': 5050.0, 'p50': 50.0, 'p95': 95.0, 'p99': 99.0}
+    assert stats['ui.frame']['p50'] == stats['ui.frame']['p99'] == 3.0
+    # Buffer circulaire: seules les dernières mesures restent
+    small = Profiler(capacity=10)
+    for ms in range(1, 21):
+        small.record('x', 0, ms * 1_000_000)
+    assert small.summary()['x']['count'] == 10 and small.summary()['x']['p50'] == 15.0
+
+
+def test_chrome_trace_is_valid_trace_event_json(tmp_path):
+    profiler = Profiler()
+    profiler.enable()
+    with profiler.span('journal.replay'):
+        with profiler.span('ledger.reconcile'):
+            pass
+    profiler.timed('commit.brain')(lambda: None)()
+    path = tmp_path / 'trace.json'
+    assert profiler.export_chrome_trace(str(path)) == 3
+    trace = json.loads(path.read_text(encoding='utf-8'))
+    events = trace['traceEvents']
+    assert {e['name'] for e in events} == {'journal.replay', 'ledger.reconcile', 'commit.brain'}
+    for event in events:
+        assert event['ph'] == 'X' and event['cat'] == event['name'].split('.')[0]
+        assert isinstance(event['ts'], float) and event['ts'] >= 0 and event['dur'] >= 0
+        assert isinstance(event['pid'], int) and isinstance(event['tid'], int)
+    outer, inner = sorted(events[:2], key=lambda e: e['ts'])
+    assert outer['name'] == 'journal.replay'
+    assert outer['ts'] + outer['dur'] >= inner['ts'] + inner['dur']  # span imbriqué contenu dans son parent
@@ -0,0 +1,88 @@
+import fcntl
+import os
+
+import pytest
+
+from provider_cache import ProviderCache
+
+
+@pytest.fixture
+def root_dm(tmp_path, monkeypatch):
+    """DataManager sur le profil actif d'une racine temporaire (comme au lancement de l'application)."""
+    import main
+    monkeypatch.setattr(main.DataManager, '_get_data_dir', lambda self: str(tmp_path))
+    manager = main.DataManager()
+    yield manager
+    manager.committer.flush(timeout=5)
+    manager.journal.close()
+    manager.lock.close()
+
+
+def _held(path):
+    """Vrai si le verrou de `path` est tenu (par une autre description de fichier)."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return False
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+
+
+def test_default_profile_uses_root(root_dm, tmp_path):
+    assert root_dm.profiles.active == 'default'
+    assert root_dm.data_dir == str(tmp_path)
+    assert os.path.dirname(root_dm.brain_file) == str(tmp_path)
+    assert root_dm.journal.dir == os.path.join(str(tmp_path), 'journal')
+
+
+def test_switch_isolates_stores_journal_and_lock(root_dm, tmp_path):
+    root_dm.dispatch('deposit', amount=100)
+    root_dm.commit_state()
+    old_lock = root_dm.lock
+    slug = root_dm.profiles.create('Ligue 1')
+    root_dm.switch_profile(slug)
+    assert old_lock._fd is None  # descripteur du profil précédent fermé
+    assert root_dm.data_dir == os.path.join(str(tmp_path), 'profiles', slug)
+    assert root_dm.lock.path == os.path.join(root_dm.data_dir, '.lock')
+    assert root_dm.bankroll['current_balance'] == 0 and root_dm.journal.seq == 0
+    root_dm.dispatch('deposit', amount=7)
+    with root_dm.lock:
+        assert _held(root_dm.lock.path) and not _held(old_lock.path)
+    assert not _held(root_dm.lock.path)
+    root_dm.switch_profile('default')
+    assert root_dm.data_dir == str(tmp_path)
+    assert root_dm.bankroll['current_balance'] == 100 and root_dm.journal.seq == 1
+    assert [e['data']['amount'] for e in root_dm.journal.events()] == [100]
+    with root_dm.lock:
+        assert _held(old_lock.path)
+    assert root_dm.reconcile() == {}
+
+
+def test_shared_provider_cache_survives_switch_and_expires(root_dm, tmp_path, monkeypatch):
+    import provider_cache
+    clock = [1_000_000.0]
+    monkeypatch.setattr(provider_cache.time, 'time', lambda: clock[0])
+    cache = ProviderCache(os.path.join(root_dm.root, 'shared', 'provider_cache.json'), ttl=60)
+    calls = []
+    fetch = lambda role: calls.append(role) or {'attack': 1.2, 'role': role}
+    assert cache.team('Lyon', 'home', fetch) == {'attack': 1.2, 'role': 'home'}
+    root_dm.switch_profile(root_dm.profiles.create('Coupe'))
+    clock[0] += 59
+    assert cache.team('LYON', 'home', fetch)['role'] == 'home' and calls == ['home']
+    # Persisté à la racine: relu par un autre processus / profil
+    root_dm.committer.submit(cache.path, cache.serialize())
+    root_dm.committer.flush(timeout=5)
+    assert os.path.dirname(cache.path) == os.path.join(str(tmp_path), 'shared')
+    reread = ProviderCache(cache.path, ttl=60)
+    reread.team('Lyon', 'home', fetch)
+    assert (reread.hits, calls) == (1, ['home'])
+    # Au-delà du TTL: nouvelle requête, entrée expirée retirée à la sérialisation
+    clock[0] += 2
+    reread.team('Lyon', 'home', fetch)
+    assert calls == ['home', 'home'] and reread.misses == 1
+    reread.h2h('Lyon', 'Lens', lambda: [])
+    clock[0] += 61
+    assert reread.serialize() == '{}'
@@ -0,0 +1,58 @@
+from betbook import BetBook
+from results_import import TeamResolver, match_results, parse_text
+
+KNOWN = ['paris-saint-germain', 'olympique-de-marseille', 'olympique-lyonnais', 'rc-lens']
+
+
+def test_resolver_exact_alias_fuzzy_and_substring():
+    resolver = TeamResolver(KNOWN, aliases={'psg': 'paris-saint-germain'})
+    assert resolver.resolve('Paris Saint-Germain') == 'paris-saint-germain'
+    assert resolver.resolve('PSG') == 'paris-saint-germain'
+    assert resolver.resolve('Olympique de Marseile') == 'olympique-de-marseille'  # difflib
+    assert resolver.resolve('Lens') == 'rc-lens'                                   # sous-chaîne
+    assert resolver.learned == {'olympique-de-marseile': 'olympique-de-marseille', 'lens': 'rc-lens'}
+
+
+def test_ambiguous_substring_does_not_match():
+    resolver = TeamResolver(KNOWN)
+    assert resolver.resolve('Olympique') is None  # Marseille et Lyon
+    assert resolver.resolve('Nantes') is None
+    assert resolver.resolve('') is None
+    assert resolver.learned == {}
+
+
+def _book():
+    book = BetBook({})
+    lyon = book.add({'home': 'Olympique Lyonnais', 'away': 'RC Lens', 'stake': 10})
+    psg = book.add({'home': 'Paris Saint-Germain', 'away': 'Olympique de Marseille', 'stake': 10})
+    return book, lyon['id'], psg['id']
+
+
+def test_swapped_row_flips_outcome():
+    book, lyon, psg = _book()
+    outcomes, unmatched, learned = match_results(book, [('RC Lens', 'Olympique Lyonnais', 'A'),
+                                                        ('Olympique de Marseille', 'Paris St-Germain', 'H')])
+    assert outcomes == {lyon: True, psg: False}
+    assert unmatched == [] and learned == {'paris-st-germain': 'paris-saint-germain'}
+    outcomes, _, _ = match_results(book, [('Lens', 'Lyonnais', 'H'), ('PSG', 'Marseille', 'D')],
+                                   aliases={'psg': 'paris-saint-germain'})
+    assert outcomes == {lyon: False, psg: False}
+
+
+def test_unmatched_and_ambiguous_rows_are_reported():
+    book, _, _ = _book()
+    rows = [('Olympique', 'RC Lens', 'H'), ('Nantes', 'Rennes', 'A')]
+    outcomes, unmatched, learned = match_results(book, rows)
+    assert outcomes == {} and unmatched == rows and learned == {}
+
+
+def test_csv_delimiter_sniffing_and_score_columns():
+    semicolon = 'HomeTeam;AwayTeam;FTHG;FTAG\nLyon;Lens;2;1\nPSG;OM;0;0\nNantes;Rennes;1;3\n'
+    assert parse_text(semicolon) == ([('Lyon', 'Lens', 'H'), ('PSG', 'OM', 'D'), ('Nantes', 'Rennes', 'A')], [])
+    tabs = 'home\taway\tscore\nLyon\tLens\t2-1\nPSG\tOM\t1:1\nNantes\tRennes\t0 - 2\nBrest\tLorient\t?\n'
+    rows, invalid = parse_text(tabs)
+    assert rows == [('Lyon', 'Lens', 'H'), ('PSG', 'OM', 'D'), ('Nantes', 'Rennes', 'A')]
+    assert [row['home'] for row in invalid] == ['Brest']
+    comma = 'Domicile,Extérieur,Résultat\nLyon,Lens,1\nPSG,OM,X\n'
+    assert parse_text(comma) == ([('Lyon', 'Lens', 'H'), ('PSG', 'OM', 'D')], [])
+    assert parse_text('[{"home": "Lyon", "away": "Lens", "FTR": "A"}]') == ([('Lyon', 'Lens', 'A')], [])
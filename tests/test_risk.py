@@ -0,0 +1,17 @@
+from conftest import pred
+
+
+def test_batch_settle_counts_open_stakes_in_initial_equity(dm):
+    import risk
+    dm.dispatch('deposit', amount=1000)
+    for i in range(50):
+        dm.dispatch('place', pred=pred(i))
+    bet_ids = [bet['id'] for bet in dm.bets]
+    dm.dispatch('settle', outcomes={bet_id: i == 0 for i, bet_id in enumerate(bet_ids)}, lr=0.05)
+
+    state = dm.bankroll['risk']
+    assert dm.bankroll['current_balance'] == 520.0
+    assert state['equity'] == 520.0
+    assert state['peak'] == 1010.0  # 1000 engagés puis le gain du premier pari
+    assert abs(risk.drawdown(state) - 490 / 1010) < 1e-9
+    assert state['max_drawdown'] < 0.5
@@ -0,0 +1,69 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import rollups
+from aggregates import entry_profit
+
+START = datetime(2024, 12, 1, 12)
+
+
+def _history(n=900, seed=9):
+    """Paris réglés sur ~14 mois: fins de mois, semaines ISO à cheval sur deux années."""
+    rng, history = random.Random(seed), []
+    for i in range(n):
+        when = (START + timedelta(hours=11 * i + rng.randint(0, 10))).isoformat()
+        history.append({'match': 'Lyon vs Lens', 'result': 'win' if rng.random() < 0.45 else 'loss',
+                        'stake': round(rng.uniform(1, 50), 2), 'odds': round(rng.uniform(1.2, 5), 2),
+                        'timestamp': when, 'settled_at': when})
+    return history
+
+
+def _brute(history, start, end):
+    totals = dict.fromkeys(rollups.FIELDS, 0)
+    for entry in history:
+        if start <= datetime.fromisoformat(entry['settled_at']).date() <= end:
+            profit = entry_profit(entry)
+            totals['wagered'] += entry['stake']
+            totals['won'] += max(profit, 0)
+            totals['lost'] += max(-profit, 0)
+            totals['bets'] += 1
+            totals['wins'] += entry['result'] == 'win'
+    return totals
+
+
+RANGES = [
+    (date(2024, 12, 30), date(2025, 1, 5)),   # 2025-W01, commencée en 2024
+    (date(2024, 12, 1), date(2025, 2, 28)),   # mois entiers
+    (date(2025, 1, 29), date(2025, 3, 2)),    # fin/début de mois, semaines partielles
+    (date(2025, 12, 22), date(2026, 1, 4)),   # 2025-W52 puis 2026-W01 (lundi 29 décembre)
+    (date(2024, 12, 17), date(2025, 12, 31)),
+    (date(2025, 6, 15), date(2025, 6, 15)),
+]
+
+
+def test_query_matches_brute_force_sum():
+    history = _history()
+    table = rollups.rebuild(history)
+    rng = random.Random(1)
+    ranges = RANGES + [tuple(sorted(START.date() + timedelta(days=rng.randint(0, 420)) for _ in range(2)))
+                       for _ in range(40)]
+    for start, end in ranges:
+        got, expected = rollups.query(table, start, end), _brute(history, start, end)
+        assert (got['bets'], got['wins']) == (expected['bets'], expected['wins'])
+        for field in ('wagered', 'won', 'lost'):
+            assert got[field] == pytest.approx(expected[field])
+    # Couverture gloutonne: une année presque entière tient en peu de buckets
+    assert rollups.query(table, *RANGES[4])['buckets'] == 6 + 1 + 2 + 12
+
+
+def test_incremental_rollups_equal_rebuild(dm):
+    history = _history(300, seed=4)
+    dm.dispatch('deposit', amount=20000)
+    for i in range(0, len(history), 25):
+        bets = [{'home': 'Lyon', 'away': 'Lens', 'stake': e['stake'], 'odds': e['odds'], 'factors': {},
+                 'timestamp': e['timestamp'], 'success': e['result'] == 'win'} for e in history[i:i + 25]]
+        dm.dispatch('import', bets=bets)
+        assert dm.bankroll['rollups'] == rollups.rebuild(dm.brain['history'])
+    assert len(dm.brain['history']) == len(history)
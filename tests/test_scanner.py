@@ -0,0 +1,62 @@
+import gc
+import os
+import tracemalloc
+
+from kivy.graphics.instructions import Instruction
+from kivy.uix.widget import Widget
+
+
+def _count(cls):
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, cls))
+
+
+def test_repeated_analyses_reuse_pooled_widgets():
+    import kivy
+    import main
+    screen = main.ScannerScreen(name='scanner')
+    analyze = lambda i: screen._perform_analysis(f'Home{i % 7}', f'Away{i % 5}', 1.5 + (i % 4) / 10)
+    analyze(0)
+    created = main.metric_card_pool.created, main.factor_row_pool.created
+    for i in range(40):  # cache du fournisseur rempli pour toutes les affiches
+        analyze(i)
+    assert (main.metric_card_pool.created, main.factor_row_pool.created) == created
+
+    gc.collect()
+    widgets, instructions = _count(Widget), _count(Instruction)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for i in range(100):
+            analyze(i)
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    assert (main.metric_card_pool.created, main.factor_row_pool.created) == created
+    assert (_count(Widget), _count(Instruction)) == (widgets, instructions)
+    # Allocations faites par Kivy (widgets, propriétés, canvas): rien ne s'accumule
+    kivy_only = [tracemalloc.Filter(True, os.path.join(os.path.dirname(kivy.__file__), '*'))]
+    growth = after.filter_traces(kivy_only).compare_to(before.filter_traces(kivy_only), 'filename')
+    assert sum(stat.size_diff for stat in growth) < 1024
+
+
+def test_forgotten_scanner_returns_pooled_widgets():
+    import main
+    from kivy.uix.screenmanager import Screen
+    manager = main.LazyScreenManager()
+    manager.register('scanner', main.ScannerScreen)
+    manager.register('home', Screen)
+    manager.current = 'scanner'
+    manager.get_screen('scanner')._perform_analysis('Lyon', 'Lens', 2.1)
+    rows = len(manager.get_screen('scanner').factor_rows)
+    free = len(main.metric_card_pool.free), len(main.factor_row_pool.free)
+    manager.current = 'home'
+    manager.reset_screens()
+    assert 'scanner' in manager.factories
+    assert (len(main.metric_card_pool.free), len(main.factor_row_pool.free)) == (free[0] + 4, free[1] + rows)
+    assert all(card.parent is None for card in main.metric_card_pool.free)
+    # L'écran reconstruit reprend les widgets rendus
+    created = main.metric_card_pool.created, main.factor_row_pool.created
+    manager.current = 'scanner'
+    manager.get_screen('scanner')._perform_analysis('Lyon', 'Lens', 2.1)
+    assert (main.metric_card_pool.created, main.factor_row_pool.created) == created
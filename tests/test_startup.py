@@ -0,0 +1,56 @@
+import builtins
+import json
+import subprocess
+import sys
+
+import pytest
+
+from conftest import env
+from profiler import ImportTimer
+
+LAZY = ('numpy', 'sync', 'exporters', 'results_import')
+PROBE = f"""
+import builtins, json, sys
+original = builtins.__import__
+import main
+wrapped = builtins.__import__ is not original
+main.import_timer.uninstall()
+print(json.dumps({{'loaded': [m for m in {LAZY!r} if m in sys.modules], 'wrapped': wrapped,
+                  'restored': builtins.__import__ is original,
+                  'timed': [n['module'] for n in main.import_timer.tree(min_ms=0)]}}))
+"""
+
+
+def test_main_imports_without_optional_modules(tmp_path):
+    out = subprocess.run([sys.executable, '-c', PROBE], env=dict(env(), HOME=str(tmp_path)), cwd=str(tmp_path),
+                         check=True, capture_output=True, text=True).stdout
+    report = json.loads(out.strip().splitlines()[-1])
+    assert report['loaded'] == []
+    assert report['wrapped'] and report['restored']
+    assert 'kivy' in report['timed']
+
+
+def test_import_timer_restores_import_on_stop(tmp_path, monkeypatch):
+    (tmp_path / 'startup_probe_pkg').mkdir()
+    (tmp_path / 'startup_probe_pkg' / '__init__.py').write_text('import startup_probe_pkg.leaf\n')
+    (tmp_path / 'startup_probe_pkg' / 'leaf.py').write_text('VALUE = 1\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    original = builtins.__import__
+    timer = ImportTimer()
+    timer.install()
+    try:
+        timer.install()  # déjà installé: sans effet
+        assert builtins.__import__ == timer._import
+        import startup_probe_pkg
+        with pytest.raises(ImportError):
+            import startup_probe_missing
+    finally:
+        timer.uninstall()
+    assert builtins.__import__ is original
+    timer.uninstall()
+    assert builtins.__import__ is original
+    tree = timer.tree(min_ms=0)
+    probe = next(node for node in tree if node['module'] == 'startup_probe_pkg')
+    assert [child['module'] for child in probe['children']] == ['startup_probe_pkg.leaf']
+    assert startup_probe_pkg.leaf.VALUE == 1
+    assert len(timer._stack) == 1  # pile dépilée après l'échec d'import
@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+from conftest import pred
+from sync import FolderTransport, HttpTransport, make_server
+
+
+@pytest.fixture
+def devices(tmp_path):
+    import main
+    managers = [main.DataManager(data_dir=str(tmp_path / name)) for name in 'abc']
+    yield managers
+    for manager in managers:
+        manager.committer.flush(timeout=5)
+        manager.journal.close()
+        manager.lock.close()
+
+
+def _settle_own(manager, success):
+    bet = list(manager.bets)[-1]
+    manager.dispatch('settle', outcomes={bet['id']: success}, lr=0.05, refs={bet['id']: bet['placed_at']})
+
+
+def _assert_converged(managers, transport):
+    vector = transport.vector()
+    for manager in managers:
+        assert manager.brain['sync_vector'] == {d: n for d, n in vector.items() if d != manager.device}
+        assert manager.reconcile() == {}
+    first = managers[0]
+    for other in managers[1:]:
+        assert other.brain['weights'] == first.brain['weights']
+        assert other.bankroll['current_balance'] == first.bankroll['current_balance']
+        assert other.bankroll['total_bets'] == first.bankroll['total_bets']
+
+
+def test_three_devices_converge_with_a_late_device(devices, tmp_path):
+    a, b, late = devices
+    transport = FolderTransport(str(tmp_path / 'shared'))
+    for manager, amount in zip(devices, (1000, 500, 200)):
+        manager.dispatch('deposit', amount=amount)
+    # Horodatages entrelacés; `late` ne se synchronise qu'à la fin
+    for i in range(3):
+        for j, manager in enumerate(devices):
+            manager.dispatch('place', pred=pred(3 * i + j, odds=1.5 + j))
+        for j, manager in enumerate(devices):
+            _settle_own(manager, (i + j) % 2 == 0)
+        a.sync_with(transport)
+        b.sync_with(transport)
+        a.sync_with(transport)
+    for _ in range(2):
+        for manager in devices:
+            manager.sync_with(transport)
+    _assert_converged(devices, transport)
+    assert a.bankroll['total_bets'] == 9
+    # Un nouvel événement après la convergence est propagé sans reconstruction
+    late.dispatch('deposit', amount=50)
+    for manager in (late, a, b):
+        manager.sync_with(transport)
+    _assert_converged(devices, transport)
+
+
+def test_http_transport_against_local_server(devices, tmp_path):
+    server = make_server(str(tmp_path / 'served'), port=0)
+    assert server.server_address[0] == '127.0.0.1'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        transport = HttpTransport(f'http://127.0.0.1:{server.server_address[1]}')
+        a, b, _ = devices
+        a.dispatch('deposit', amount=100)
+        b.dispatch('deposit', amount=30)
+        assert a.sync_with(transport) == (1, 0)
+        assert b.sync_with(transport) == (1, 1)
+        assert a.sync_with(transport) == (0, 1)
+        assert a.bankroll['current_balance'] == b.bankroll['current_balance'] == 130
+        assert transport.vector() == {a.device: 1, b.device: 1}
+    finally:
+        server.shutdown()
+        server.server_close()